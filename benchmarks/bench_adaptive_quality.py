@@ -0,0 +1,95 @@
+"""Adaptive quality under a CPU hog: tick rate, lateness and underruns
+
+Plays three noise layers with breathing and random pan through the null
+output, then starts busy threads competing for the interpreter for a
+while and stops them again. Prints, per phase, the quality level, the
+control ticks and GUI callbacks per second, mean tick lateness and
+output underruns, with adaptation off and on.
+
+Usage: python benchmarks/bench_adaptive_quality.py [phase_seconds] [hog_threads]
+"""
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from adaptive_quality import AdaptiveQuality  # noqa: E402
+from audio_player import AudioPlayer  # noqa: E402
+from engine_backend import EngineBackend  # noqa: E402
+
+SOUNDS = ('noise:pink', 'noise:brown', 'noise:white')
+
+
+def hog(stop: threading.Event):
+    """Spin in pure Python, holding the interpreter as much as it can"""
+    while not stop.is_set():
+        sum(i * i for i in range(2000))
+
+
+def run(adaptive: bool, phase_seconds: float, hogs: int) -> list:
+    """Idle, loaded and recovery phases; returns per-phase measurements"""
+    player = AudioPlayer(EngineBackend('null'))
+    gui_calls = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, sound in enumerate(SOUNDS):
+            player.play(sound)
+            player.start_breathing(sound)
+            player.start_random_pan(sound, seed=index)
+            player.playing_sounds[sound]['gui_callback'] = lambda volume: gui_calls.append(volume)
+    quality = AdaptiveQuality(player)
+    if adaptive:
+        quality.start()
+
+    # (time, interval in effect) of every control tick
+    ticks = []
+    player.add_tick_hook(lambda now: ticks.append((now, player.control_interval)))
+    phases = []
+    for name, load in (('idle', 0), ('loaded', hogs), ('recovery', 0)):
+        stop = threading.Event()
+        threads = [threading.Thread(target=hog, args=(stop,), daemon=True) for _ in range(load)]
+        for thread in threads:
+            thread.start()
+        start_ticks, start_gui = len(ticks), len(gui_calls)
+        underruns = player.output_stats()['underruns']
+        time.sleep(phase_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        window = ticks[start_ticks:]
+        late = [max(0.0, b[0] - a[0] - b[1]) for a, b in zip(window, window[1:])]
+        lateness = sum(late) / max(1, len(late))
+        phases.append({
+            'phase': name,
+            'level': quality.name,
+            'ticks': len(window) / phase_seconds,
+            'gui': (len(gui_calls) - start_gui) / phase_seconds / len(SOUNDS),
+            'late_ms': lateness * 1000,
+            'underruns': player.output_stats()['underruns'] - underruns,
+        })
+    changes = len(quality.changes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.cleanup()
+    phases.append(changes)
+    return phases
+
+
+def main():
+    phase_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    hogs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    print(f"3 sounds with breathing and random pan, {hogs} hog threads, {phase_seconds:.0f} s phases")
+    print(f"{'adaptive':>8} {'phase':>9} {'level':>8} {'ticks/s':>8} {'gui/s':>6} {'late ms':>8} {'underruns':>9}")
+    for adaptive in (False, True):
+        *phases, changes = run(adaptive, phase_seconds, hogs)
+        for r in phases:
+            print(f"{'on' if adaptive else 'off':>8} {r['phase']:>9} {r['level']:>8} {r['ticks']:>8.1f} "
+                  f"{r['gui']:>6.1f} {r['late_ms']:>8.1f} {r['underruns']:>9}")
+        if adaptive:
+            print(f"{changes} quality changes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Concurrent awaitable fades: threads used and control-tick cost
+
+Starts N sounds on the virtual-clock FakeBackend, awaits a fade on every
+one of them at once through AsyncPlayer, cancels half midway and reports
+the thread count during the run, the real cost per control tick and how
+the awaits resolved.
+
+Usage: python benchmarks/bench_async.py [sounds]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from async_player import AsyncPlayer  # noqa: E402
+from audio_player import AudioPlayer  # noqa: E402
+from mixer_backend import FakeBackend  # noqa: E402
+
+
+async def run(count: int) -> dict:
+    """Fade count sounds concurrently, cancelling every other fade halfway"""
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.max_sounds = count
+    front = AsyncPlayer(player)
+    sounds = [f"sound{i}.wav" for i in range(count)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for sound in sounds:
+            player.play(sound)
+
+    threads_before = threading.active_count()
+    tasks = [asyncio.create_task(front.fade_to(sound, 0.0, 2.0)) for sound in sounds]
+    await asyncio.sleep(0)
+    threads_during = threading.active_count()
+
+    tick_time = 0.0
+    ticks = 0
+    for step in range(60):
+        if step == 20:
+            for task in tasks[::2]:
+                task.cancel()
+        start = time.perf_counter()
+        backend.advance(player.control_interval)
+        tick_time += time.perf_counter() - start
+        ticks += 1
+        # Let resolved futures run
+        await asyncio.sleep(0)
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    front.close()
+    return {
+        'threads_before': threads_before,
+        'threads_during': threads_during,
+        'tick_us': tick_time / ticks * 1e6,
+        'completed': sum(result is True for result in results),
+        'cancelled': sum(isinstance(result, asyncio.CancelledError) for result in results),
+        'frozen': sum(not player.playing_sounds[sound]['volume_ramp'].active for sound in sounds[::2]),
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    r = asyncio.run(run(count))
+    print(f"{count} concurrent fades")
+    print(f"threads: {r['threads_before']} before, {r['threads_during']} while awaiting")
+    print(f"control tick: {r['tick_us']:.0f} us ({r['tick_us'] / count:.2f} us per sound)")
+    print(f"completed {r['completed']}, cancelled {r['cancelled']} "
+          f"(ramps stopped in place: {r['frozen']})")
+
+
+if __name__ == "__main__":
+    main()
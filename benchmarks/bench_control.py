@@ -0,0 +1,58 @@
+"""Simulated control-rate cost of fades, breathing and random pan
+
+Runs AudioPlayer on the virtual-clock FakeBackend and reports how many
+simulated seconds are processed per real second.
+
+Usage: python benchmarks/bench_control.py [simulated_seconds]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_player import AudioPlayer  # noqa: E402
+from mixer_backend import FakeBackend  # noqa: E402
+
+
+def run(simulated: float, effects: str) -> float:
+    """Simulate a three-sound mix with the given effects, returns sim s per real s"""
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sounds = ['rain.wav', 'sea.wav', 'birds.wav']
+        for sound in sounds:
+            player.play(sound)
+        for index, sound in enumerate(sounds):
+            if 'breathing' in effects:
+                player.start_breathing(sound)
+            if 'random_pan' in effects:
+                player.start_random_pan(sound, seed=index)
+            if 'fades' in effects:
+                player.fade_volume(sound, 0.0, 1.0)
+
+    # Keep retargeting fades every simulated second
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < simulated:
+        if 'fades' in effects:
+            for sound in sounds:
+                player.set_pan(sound, (elapsed % 10) / 5 - 1)
+        backend.advance(1.0)
+        elapsed += 1.0
+    return simulated / (time.perf_counter() - start)
+
+
+def main():
+    simulated = float(sys.argv[1]) if len(sys.argv) > 1 else 3600.0
+    print(f"{simulated:.0f} simulated seconds, 3 sounds, 50 ms control tick")
+    for effects in ['fades', 'breathing', 'random_pan', 'fades+breathing+random_pan']:
+        rate = run(simulated, effects)
+        print(f"{effects:<28} {rate:>10.0f} sim s / real s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Cost per block of the master-bus dynamics at each latency profile
+
+Times the compressor, limiter and sidechain ducker on stereo blocks of
+three summed loud loops, then checks that the limited output of that mix
+stays under the ceiling.
+
+Usage: python benchmarks/bench_dynamics.py [channels]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dynamics import Compressor, Ducker, Limiter, MasterDynamics  # noqa: E402
+from mixer_backend import LATENCY_PROFILES  # noqa: E402
+
+
+def loud_mix(frames: int, channels: int, sample_rate: int) -> np.ndarray:
+    """Three loops near full scale, summed: peaks well above 0 dBFS"""
+    rng = np.random.default_rng(0)
+    t = np.arange(frames) / sample_rate
+    layers = [
+        0.8 * np.sin(2 * np.pi * 110 * t),
+        0.6 * np.sign(np.sin(2 * np.pi * 0.5 * t)) * rng.standard_normal(frames) * 0.5,
+        0.7 * np.sin(2 * np.pi * 220 * t + 1.0) * (0.5 + 0.5 * np.sin(2 * np.pi * 0.25 * t)),
+    ]
+    mono = np.sum(layers, axis=0).astype(np.float32)
+    return np.repeat(mono[:, None], channels, axis=1)
+
+
+def time_stage(process, blocks: list, repeats: int = 3) -> np.ndarray:
+    """Per-block timings of a stage over a sequence of blocks"""
+    for block in blocks[:20]:
+        process(block)
+    timings = []
+    for _ in range(repeats):
+        for block in blocks:
+            start = time.perf_counter()
+            process(block)
+            timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def main():
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    print(f"Master dynamics, {channels} channels")
+    print(f"{'profile':>9} {'block':>6} {'stage':>11} {'mean us':>8} {'p99 us':>8} {'budget':>7}")
+    for name, profile in LATENCY_PROFILES.items():
+        rate, size = profile['sample_rate'], profile['buffer_size']
+        signal = loud_mix(rate * 4, channels, rate)
+        blocks = [signal[i:i + size] for i in range(0, signal.shape[0] - size + 1, size)]
+        key = [np.abs(block[:, 0]) for block in blocks]
+        budget = size / rate
+
+        ducker = Ducker(rate)
+        key_iter = iter(key * 10)
+        dynamics = MasterDynamics(channels, rate)
+        dynamics.compressor.enabled = True
+        stages = [
+            ('compressor', Compressor(rate).process),
+            ('limiter', Limiter(channels, rate).process),
+            ('ducker', lambda block: ducker.gain(next(key_iter))),
+            ('all', dynamics.process),
+        ]
+        for stage, process in stages:
+            timings = time_stage(process, blocks)
+            print(f"{name:>9} {size:>6} {stage:>11} {timings.mean() * 1e6:>8.1f} "
+                  f"{np.percentile(timings, 99) * 1e6:>8.1f} {timings.mean() / budget * 100:>6.2f}%")
+
+        limiter = Limiter(channels, rate)
+        limited = np.concatenate([limiter.process(block) for block in blocks])
+        print(f"{'':>9} {'':>6} peak in {20 * np.log10(np.abs(signal).max()):+.1f} dBFS, "
+              f"limited {20 * np.log10(np.abs(limited).max()):+.2f} dBFS (ceiling {limiter.ceiling_db:+.1f})")
+
+
+if __name__ == "__main__":
+    main()
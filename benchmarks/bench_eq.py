@@ -0,0 +1,88 @@
+"""Render cost of per-sound EQ with three filtered sounds
+
+Mixes three noise layers through MixEngine and times render_block with
+no filters, with a static 3-band EQ on every sound, and with every sound
+sweeping its low-pass (cutoff retargeted each 50 ms control tick, as the
+player's sweep effect does). Prints per-block cost, coefficient rebuilds
+and the spread of cost across one-second windows to show CPU stays flat.
+
+Usage: python benchmarks/bench_eq.py [seconds] [block_size]
+"""
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from eq import FilterChain  # noqa: E402
+from mix_engine import MixEngine  # noqa: E402
+from noise import NoiseSource  # noqa: E402
+
+SAMPLE_RATE = 44100
+COLORS = ('white', 'pink', 'brown')
+
+
+def build(block_size: int, mode: str):
+    """Engine with three voices, filtered according to mode"""
+    engine = MixEngine('stereo', SAMPLE_RATE, block_size)
+    chains = []
+    for index, color in enumerate(COLORS):
+        chain = None
+        if mode != 'none':
+            chain = FilterChain(SAMPLE_RATE)
+            chain.set_band('highpass', 'highpass', 60)
+            chain.set_band('presence', 'peaking', 3000, gain_db=-4, q=1.2)
+            chain.set_band('lowpass', 'lowpass', 9000)
+            chains.append(chain)
+        engine.add_voice(color, NoiseSource(color, SAMPLE_RATE, seed=index), 0.5, index - 1.0,
+                         filters=chain)
+    return engine, chains
+
+
+def run(mode: str, seconds: float, block_size: int) -> dict:
+    """Render seconds of audio, timing every block"""
+    engine, chains = build(block_size, mode)
+    blocks = int(seconds * SAMPLE_RATE / block_size)
+    tick_blocks = max(1, int(0.05 * SAMPLE_RATE / block_size))
+    for _ in range(20):
+        engine.render_block()
+
+    timings = np.empty(blocks)
+    for index in range(blocks):
+        if mode == 'sweep' and index % tick_blocks == 0:
+            t = index * block_size / SAMPLE_RATE
+            for offset, chain in enumerate(chains):
+                position = 0.5 + 0.5 * math.cos(2 * math.pi * t / 30.0 + offset)
+                chain.set_band('lowpass', freq=400.0 * 30.0 ** position)
+        start = time.perf_counter()
+        engine.render_block()
+        timings[index] = time.perf_counter() - start
+
+    per_second = int(SAMPLE_RATE / block_size)
+    windows = timings[:len(timings) // per_second * per_second].reshape(-1, per_second).mean(axis=1)
+    budget = block_size / SAMPLE_RATE
+    return {
+        'mean_us': timings.mean() * 1e6,
+        'p99_us': np.percentile(timings, 99) * 1e6,
+        'load': timings.mean() / budget,
+        'window_spread': (windows.max() - windows.min()) / windows.mean() if len(windows) > 1 else 0.0,
+        'rebuilds': sum(chain.rebuilds for chain in chains),
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    print(f"3 sounds, {block_size}-frame blocks, {seconds:.0f} s")
+    print(f"{'filters':>8} {'mean us':>8} {'p99 us':>8} {'load':>6} {'1s spread':>10} {'rebuilds':>9}")
+    for mode in ('none', 'static', 'sweep'):
+        r = run(mode, seconds, block_size)
+        print(f"{mode:>8} {r['mean_us']:>8.1f} {r['p99_us']:>8.1f} {r['load'] * 100:>5.1f}% "
+              f"{r['window_spread'] * 100:>9.1f}% {r['rebuilds']:>9}")
+
+
+if __name__ == "__main__":
+    main()
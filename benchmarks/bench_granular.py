@@ -0,0 +1,65 @@
+"""Real-time headroom of the granular source on one core
+
+Renders a granular layer at several grain densities through the mix
+engine and reports grains per second, average overlapping grains, block
+cost and how many times faster than real time it runs.
+
+Usage: python benchmarks/bench_granular.py [seconds]
+"""
+import os
+import sys
+import time
+
+# Pin BLAS to one thread so the numbers reflect a single core
+for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(variable, '1')
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from granular import GranularSource  # noqa: E402
+from mix_engine import MixEngine  # noqa: E402
+
+
+def run(seconds: float, density: float, block_size: int = 512, sample_rate: int = 44100) -> dict:
+    """Render one granular layer, returns timing statistics"""
+    rng = np.random.default_rng(0)
+    # 10 s of int16 noise stands in for a rain recording
+    samples = (rng.standard_normal(sample_rate * 10) * 3000).astype(np.int16)
+    source = GranularSource(samples, sample_rate, density=density, seed=0)
+    engine = MixEngine('stereo', sample_rate, block_size)
+    engine.add_voice('rain', source, 0.8)
+
+    blocks = int(seconds * sample_rate / block_size)
+    overlap = 0
+    worst = 0.0
+    start = time.perf_counter()
+    for _ in range(blocks):
+        block_start = time.perf_counter()
+        engine.render_block()
+        worst = max(worst, time.perf_counter() - block_start)
+        overlap += source.active.size
+    elapsed = time.perf_counter() - start
+
+    return {
+        'overlap': overlap / blocks,
+        'block_ms': elapsed / blocks * 1000,
+        'worst_ms': worst * 1000,
+        'realtime': blocks * block_size / sample_rate / elapsed,
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    budget_ms = 512 / 44100 * 1000
+    print(f"{seconds:.0f} s per run, 512-frame blocks ({budget_ms:.1f} ms budget), one thread")
+    print(f"{'grains/s':>9} {'overlap':>8} {'block ms':>9} {'worst ms':>9} {'x realtime':>11}")
+    for density in [100, 300, 1000, 3000]:
+        result = run(seconds, density)
+        print(f"{density:>9} {result['overlap']:>8.1f} {result['block_ms']:>9.3f} "
+              f"{result['worst_ms']:>9.3f} {result['realtime']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""End-to-end control latency: slider event to audible gain change
+
+Plays a constant tone through the software-mixed output, injects
+timestamped volume changes through the same AudioPlayer.set_volume call
+the volume slider uses, and captures the rendered blocks with a loopback
+CaptureSink. Each block is stamped with its write time plus the sink's
+output latency, so the first changed sample gives the event's latency.
+
+The native pygame path mixes inside SDL and cannot be captured, so only
+the software-mixed outputs are measured. Auto-balance overrides slider
+volumes and is left off.
+
+Usage: python benchmarks/bench_latency.py [--events N] [--outputs null,wav,pygame]
+                                          [--profiles low,balanced,safe]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_io import write_wav  # noqa: E402
+from audio_player import AudioPlayer  # noqa: E402
+from engine_backend import EngineBackend  # noqa: E402
+from mixer_backend import LATENCY_PROFILES, get_profile  # noqa: E402
+from output_sinks import CaptureCallbackSink, CaptureSink  # noqa: E402
+
+
+class CaptureBackend(EngineBackend):
+    """EngineBackend whose sink is wrapped in a loopback capture"""
+
+    def _create_sink(self, channels: int, sample_rate: int, buffer_size: int):
+        target = super()._create_sink(channels, sample_rate, buffer_size)
+        capture_class = CaptureCallbackSink if hasattr(target, 'start') else CaptureSink
+        self.capture = capture_class(target)
+        return self.capture
+
+
+def measure(capture: CaptureSink, events, threshold: float = 0.1):
+    """Latency in seconds of every event, None where no change was found"""
+    samples = capture.samples()
+    level = np.sqrt(np.sum(samples.astype(np.float64) ** 2, axis=1))
+    rate = capture.sample_rate
+    block_frames = np.array([block.shape[0] for block in capture.blocks])
+    block_starts = np.concatenate([[0], np.cumsum(block_frames)[:-1]])
+    block_times = np.array(capture.times) + capture.output_latency
+
+    latencies = []
+    for index, (event_time, old_volume, new_volume) in enumerate(events):
+        # Blocks written before the event cannot carry it
+        first = int(np.searchsorted(capture.times, event_time))
+        if first == 0 or first >= len(capture.blocks):
+            latencies.append(None)
+            continue
+        old_level = level[block_starts[first] - 1]
+        step = old_level * (new_volume / old_volume - 1.0)
+
+        # Stop at the block written for the next event
+        end = len(level)
+        if index + 1 < len(events):
+            end = block_starts[min(len(capture.blocks) - 1, int(np.searchsorted(capture.times, events[index + 1][0])))]
+        moved = np.nonzero(np.abs(level[block_starts[first]:end] - old_level) >= abs(step) * threshold)[0]
+        if moved.size == 0:
+            latencies.append(None)
+            continue
+
+        frame = block_starts[first] + moved[0]
+        block = int(np.searchsorted(block_starts, frame, side='right')) - 1
+        heard = block_times[block] + (frame - block_starts[block]) / rate
+        latencies.append(heard - event_time)
+    return latencies
+
+
+def run(output: str, profile: str, event_count: int, tone_path: str, wav_path: str) -> dict:
+    """Inject volume events on one backend and profile, returns latency stats"""
+    backend = CaptureBackend(output, file_path=wav_path)
+    player = AudioPlayer(backend, profile)
+    rng = random.Random(0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.play(tone_path)
+        volume = player.base_volume
+        # Let the output settle before the first event
+        time.sleep(0.5)
+
+        events = []
+        for index in range(event_count):
+            new_volume = 0.8 if index % 2 == 0 else 0.3
+            event_time = time.monotonic()
+            player.set_volume(tone_path, new_volume)
+            events.append((event_time, volume, new_volume))
+            volume = new_volume
+            # Jitter so events do not lock to the control tick
+            time.sleep(rng.uniform(0.25, 0.35))
+
+        stats = player.output_stats()
+        player.cleanup()
+
+    latencies = measure(backend.capture, events)
+    found = np.array([value for value in latencies if value is not None]) * 1000
+    result = {'missed': latencies.count(None), 'underruns': stats.get('underruns')}
+    for name, q in (('p50', 50), ('p95', 95), ('p99', 99)):
+        result[name] = float(np.percentile(found, q)) if found.size else float('nan')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure control-to-audio latency")
+    parser.add_argument('--events', type=int, default=20)
+    parser.add_argument('--outputs', default='null,wav,pygame')
+    parser.add_argument('--profiles', default=','.join(LATENCY_PROFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        tone_path = os.path.join(directory, 'tone.wav')
+        wav_path = os.path.join(directory, 'capture.wav')
+        # A constant signal makes the gain directly readable from the samples
+        write_wav(tone_path, np.full((44100, 1), 0.5, dtype=np.float32), 44100)
+
+        print(f"{args.events} volume events per run, latency in ms")
+        print(f"{'output':<10} {'profile':<10} {'buffer':>7} {'p50':>7} {'p95':>7} {'p99':>7} "
+              f"{'missed':>7} {'underruns':>10}")
+        for output in args.outputs.split(','):
+            for profile in args.profiles.split(','):
+                settings = get_profile(profile)
+                buffer_ms = settings['buffer_size'] / settings['sample_rate'] * 1000
+                try:
+                    result = run(output, profile, args.events, tone_path, wav_path)
+                except Exception as e:
+                    print(f"{output:<10} {profile:<10} unavailable: {e}")
+                    continue
+                print(f"{output:<10} {profile:<10} {buffer_ms:>7.1f} {result['p50']:>7.1f} "
+                      f"{result['p95']:>7.1f} {result['p99']:>7.1f} {result['missed']:>7} "
+                      f"{result['underruns']:>10}")
+
+
+if __name__ == "__main__":
+    main()
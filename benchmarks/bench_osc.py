@@ -0,0 +1,122 @@
+"""OSC flood load test against a local UDP sender
+
+Starts the OSC listener on a software-mixed player with three noise
+sounds, then floods volume and pan faders from a sender thread as fast
+as the socket allows (or at a fixed rate). Reports received and
+coalesced messages, work per control tick, tick jitter and whether the
+final fader positions arrived.
+
+Usage: python benchmarks/bench_osc.py [seconds] [rate_per_fader_hz]
+"""
+import contextlib
+import io
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_player import AudioPlayer  # noqa: E402
+from engine_backend import EngineBackend  # noqa: E402
+from osc_control import OSCListener, build_message  # noqa: E402
+
+SOUNDS = ['noise:white', 'noise:pink', 'noise:brown']
+
+
+def flood(port: int, seconds: float, rate: float, last: dict) -> int:
+    """Send fader moves for every sound, returns messages sent"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    faders = [(sound, parameter) for sound in SOUNDS for parameter in ('volume', 'pan')]
+    period = 1.0 / rate if rate else 0.0
+    sent = 0
+    start = time.perf_counter()
+    next_send = start
+    while time.perf_counter() - start < seconds:
+        phase = (time.perf_counter() - start) * 0.7
+        for index, (sound, parameter) in enumerate(faders):
+            value = 0.5 + 0.45 * np.sin(phase + index)
+            if parameter == 'pan':
+                value = value * 2 - 1
+            value = float(np.float32(value))
+            sock.sendto(build_message(f"/mixer/{sound}/{parameter}", value), ('127.0.0.1', port))
+            last[(sound, parameter)] = value
+            sent += 1
+        if period:
+            next_send += period
+            time.sleep(max(0.0, next_send - time.perf_counter()))
+    sock.close()
+    return sent
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+
+    player = AudioPlayer(EngineBackend('null'))
+    listener = OSCListener(player, port=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        listener.start()
+
+    # Time the coalesced apply and the spacing of control ticks
+    apply_times, tick_times, batch_sizes = [], [], []
+    timed_apply = listener.apply_pending
+
+    def measured(now: float):
+        batch_sizes.append(len(listener.pending))
+        start = time.perf_counter()
+        timed_apply(now)
+        apply_times.append(time.perf_counter() - start)
+        tick_times.append(now)
+
+    player.remove_tick_hook(listener.apply_pending)
+    player.add_tick_hook(measured)
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for sound in SOUNDS:
+            sender.sendto(build_message(f"/mixer/{sound}/play", 1), ('127.0.0.1', listener.port))
+        time.sleep(0.3)
+
+    last = {}
+    sent = 0
+
+    def run_sender():
+        nonlocal sent
+        sent = flood(listener.port, seconds, rate, last)
+
+    thread = threading.Thread(target=run_sender)
+    with contextlib.redirect_stdout(io.StringIO()):
+        thread.start()
+        thread.join()
+        # Let the final values land
+        time.sleep(0.3)
+
+    stats = listener.stats()
+    intervals = np.diff(tick_times) * 1000
+    mismatched = 0
+    for (sound, parameter), value in last.items():
+        info = player.playing_sounds.get(sound)
+        actual = info['volume'] if parameter == 'volume' else info['pan_ramp'].target
+        if abs(actual - value) > 1e-6:
+            mismatched += 1
+
+    print(f"{seconds:.0f} s flood, 6 faders, {'max rate' if not rate else f'{rate:.0f} Hz per fader'}")
+    print(f"sent {sent} ({sent / seconds:.0f}/s), received {stats['received']}, "
+          f"kernel drops {sent + len(SOUNDS) - stats['received']}")
+    print(f"coalesced {stats['coalesced']}, applied {stats['applied']}, errors {stats['errors']}")
+    print(f"per tick: up to {max(batch_sizes)} parameter updates, "
+          f"apply p99 {np.percentile(apply_times, 99) * 1000:.3f} ms")
+    print(f"tick interval p50 {np.percentile(intervals, 50):.1f} ms, max {intervals.max():.1f} ms")
+    print(f"final fader values: {len(last) - mismatched}/{len(last)} match the last message")
+
+    listener.stop()
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.cleanup()
+
+
+if __name__ == "__main__":
+    main()
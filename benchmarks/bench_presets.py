@@ -0,0 +1,63 @@
+"""Preset library at scale: index load, search and opening one preset
+
+Saves N synthetic presets into a temporary library (bulk import, one
+index write), then times what the GUI does with it: loading the index
+on startup, text and tag searches, and reading a single preset body.
+
+Usage: python benchmarks/bench_presets.py [presets]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from preset_library import PresetLibrary  # noqa: E402
+
+SOUNDS = ('rain.wav', 'thunder.wav', 'sea.wav', 'birds.wav', 'keyboard.wav', 'grass.wav',
+          'forest.wav', 'noise:white', 'noise:pink', 'noise:brown')
+TAGS = ('sleep', 'focus', 'calm', 'storm', 'night', 'morning', 'work', 'nature')
+
+
+def best_of(function, repeats: int = 5) -> float:
+    """Fastest of several timed calls, in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def populate(directory: str, count: int, seed: int = 1):
+    """Bulk-save count random mixes"""
+    rng = random.Random(seed)
+    library = PresetLibrary(directory)
+    for i in range(count):
+        sounds = {sound: {'volume': round(rng.random(), 2), 'pan': round(rng.uniform(-1, 1), 2),
+                          'tone': 0.0, 'playing': True}
+                  for sound in rng.sample(SOUNDS, 3)}
+        library.save(f"mix {i:05d} {rng.choice(TAGS)}", sounds, rng.sample(TAGS, 2), write_index=False)
+    library.flush()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        populate(directory, count)
+        print(f"{count} presets saved in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        library = PresetLibrary(directory)
+        name = library.list()[count // 2]['name']
+        print(f"index load:        {best_of(lambda: PresetLibrary(directory)):8.2f} ms")
+        print(f"text search:       {best_of(lambda: library.search('storm')):8.2f} ms")
+        print(f"tag + text search: {best_of(lambda: library.search('mix 01', tags=['sleep'])):8.2f} ms")
+        print(f"sound filter:      {best_of(lambda: library.search('', sounds=['rain.wav', 'noise:pink'])):8.2f} ms")
+        print(f"open one preset:   {best_of(lambda: library.load(name)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Live mix recorder under disk stalls and over long sessions
+
+1. Records a real-time software mix (null sink) while the writer thread
+   is stalled: once for less than the ring buffer holds, once for longer.
+   Rendering must never miss a deadline; the long stall shows up only as
+   counted overruns.
+2. Streams a long recording (accelerated, default one hour of audio)
+   through the recorder and samples resident memory, which should stay
+   flat.
+
+Usage: python benchmarks/bench_recorder.py [minutes]
+"""
+import contextlib
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_player import AudioPlayer  # noqa: E402
+from engine_backend import EngineBackend  # noqa: E402
+from recorder import Recorder  # noqa: E402
+
+
+def resident_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def stalled(recorder: Recorder, seconds: float):
+    """Make the first write after one second hang for a while"""
+    write = recorder._write
+    state = {'stalled': False}
+
+    def slow_write(samples):
+        if not state['stalled'] and recorder.frames_written >= recorder.sample_rate:
+            state['stalled'] = True
+            time.sleep(seconds)
+        write(samples)
+    recorder._write = slow_write
+
+
+def stall_run(directory: str, stall: float, buffer_seconds: float, length: float = 6.0):
+    """Real-time recording with one writer stall"""
+    player = AudioPlayer(EngineBackend('null'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in ('noise:white', 'noise:pink', 'noise:brown'):
+            player.play(name)
+        driver = player.backend.driver
+        engine = player.backend.engine
+        recorder = Recorder(os.path.join(directory, f"stall_{stall:.0f}.wav"), engine.channels,
+                            engine.sample_rate, buffer_seconds=buffer_seconds, chunk_seconds=0.25)
+        stalled(recorder, stall)
+        recorder.start()
+        driver.taps.append(recorder.push)
+
+        # Time the tap on the render thread
+        push = recorder.push
+        push_times = []
+
+        def timed_push(block):
+            start = time.perf_counter()
+            push(block)
+            push_times.append(time.perf_counter() - start)
+        driver.taps[-1] = timed_push
+
+        late_before = driver.late_blocks
+        time.sleep(length)
+        driver.taps.remove(timed_push)
+        stats = recorder.stop()
+        late = driver.late_blocks - late_before
+        player.cleanup()
+
+    print(f"stall {stall:.0f} s, ring {buffer_seconds:.0f} s: recorded {stats['seconds']:.2f} s, "
+          f"overruns {stats['overruns']} ({stats['dropped_seconds']:.2f} s dropped), "
+          f"late render blocks {late}, tap p99 {np.percentile(push_times, 99) * 1e6:.0f} us, "
+          f"max fill {stats['max_fill'] * 100:.0f}%")
+
+
+def long_run(directory: str, minutes: float):
+    """Accelerated long recording, sampling memory"""
+    sample_rate, block_size = 44100, 512
+    recorder = Recorder(os.path.join(directory, "long.wav"), 2, sample_rate)
+    recorder.start()
+    rng = np.random.default_rng(0)
+    blocks = [rng.standard_normal((block_size, 2)).astype(np.float32) * 0.1 for _ in range(64)]
+    total = int(minutes * 60 * sample_rate / block_size)
+    report_every = total // 6
+
+    print(f"{minutes:.0f} min recording, ring {recorder.ring.data.nbytes / 1e6:.1f} MB")
+    print(f"{'audio min':>9} {'file MB':>8} {'RSS MB':>7}")
+    for index in range(total):
+        # Benchmark-only backpressure so the writer's throughput is measured
+        while recorder.ring.available() > recorder.ring.capacity // 2:
+            time.sleep(0.001)
+        recorder.push(blocks[index % len(blocks)])
+        if (index + 1) % report_every == 0:
+            print(f"{(index + 1) * block_size / sample_rate / 60:>9.1f} "
+                  f"{os.path.getsize(recorder.file_path) / 1e6:>8.0f} {resident_mb():>7.1f}")
+    stats = recorder.stop()
+    print(f"wrote {stats['seconds'] / 60:.1f} min in {stats['writes']} writes, "
+          f"average {stats['average_write_ms']:.2f} ms, worst {stats['worst_write_ms']:.1f} ms "
+          f"per {recorder.chunk_frames / sample_rate:.0f} s chunk, overruns {stats['overruns']}")
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    with tempfile.TemporaryDirectory() as directory:
+        stall_run(directory, stall=2.0, buffer_seconds=8.0)
+        stall_run(directory, stall=3.0, buffer_seconds=1.0)
+        long_run(directory, minutes)
+
+
+if __name__ == "__main__":
+    main()
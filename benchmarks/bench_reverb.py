@@ -0,0 +1,57 @@
+"""Cost per block of the partitioned convolution reverb
+
+Usage: python benchmarks/bench_reverb.py [ir_seconds]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from reverb import ConvolutionReverb, generate_room_impulse  # noqa: E402
+
+SAMPLE_RATE = 44100
+BLOCK_SIZES = [256, 512, 1024, 2048]
+
+
+def bench(ir_seconds: float, block_size: int, channels: int = 2, blocks: int = 400) -> dict:
+    """Time reverb processing for one block size"""
+    impulse = generate_room_impulse(ir_seconds, SAMPLE_RATE, channels)
+    reverb = ConvolutionReverb.from_impulse(impulse, channels, block_size)
+    block = np.random.default_rng(0).standard_normal((block_size, channels)).astype(np.float32) * 0.1
+
+    # Warm up FFT plans and caches
+    for _ in range(20):
+        reverb.process(block)
+
+    timings = np.empty(blocks)
+    for i in range(blocks):
+        start = time.perf_counter()
+        reverb.process(block)
+        timings[i] = time.perf_counter() - start
+
+    budget = block_size / SAMPLE_RATE
+    return {
+        'block': block_size,
+        'partitions': reverb.partitions,
+        'mean_ms': timings.mean() * 1000,
+        'p99_ms': np.percentile(timings, 99) * 1000,
+        'budget_ms': budget * 1000,
+        'load': timings.mean() / budget,
+    }
+
+
+def main():
+    ir_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    print(f"Convolution reverb, {ir_seconds:.1f} s stereo IR at {SAMPLE_RATE} Hz")
+    print(f"{'block':>6} {'parts':>6} {'mean ms':>8} {'p99 ms':>8} {'budget':>8} {'load':>6}")
+    for block_size in BLOCK_SIZES:
+        r = bench(ir_seconds, block_size)
+        print(f"{r['block']:>6} {r['partitions']:>6} {r['mean_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['budget_ms']:>8.2f} {r['load'] * 100:>5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
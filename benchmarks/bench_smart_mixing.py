@@ -0,0 +1,69 @@
+"""Cost of smart mixing: one-off analysis versus per-change corrections
+
+Writes a synthetic 60-second stereo loop, times its band analysis (done
+once per asset, then read from the profile cache), times a cached lookup
+and the correction math run when the active set changes, and prints the
+corrections for a few noise layers playing together.
+
+Usage: python benchmarks/bench_smart_mixing.py [seconds]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_io import write_wav  # noqa: E402
+from spectral_profile import ProfileCache, smart_corrections  # noqa: E402
+
+SAMPLE_RATE = 44100
+LAYERS = (('noise:pink', 0.5), ('noise:brown', 0.5), ('noise:white', 0.3))
+
+
+def best_of(function, repeats: int) -> float:
+    """Fastest of several timed calls, in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    loop = 0.3 * np.sin(2 * np.pi * 220 * t)[:, None] + 0.05 * rng.standard_normal((t.shape[0], 2))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'loop.wav')
+        write_wav(path, loop.astype(np.float32), SAMPLE_RATE)
+        cache_file = os.path.join(directory, 'profiles.json')
+        cache = ProfileCache(cache_file)
+        analyse = best_of(lambda: cache.compute(path), 3)
+        cache.save()
+        reloaded = ProfileCache(cache_file)
+        lookup = best_of(lambda: reloaded.get(path), 1000)
+
+    cache = ProfileCache()
+    cache.prepare([name for name, _ in LAYERS])
+    profiles = [cache.get(name) for name, _ in LAYERS]
+    bands = [profile['bands'] for profile in profiles]
+    levels = [profile['rms'] * volume for profile, (_, volume) in zip(profiles, LAYERS)]
+    correct = best_of(lambda: smart_corrections(bands, levels), 1000)
+
+    print(f"analysis of a {seconds:.0f} s stereo loop: {analyse * 1000:.1f} ms (once per asset)")
+    print(f"cached profile lookup: {lookup * 1e6:.1f} us")
+    print(f"corrections for {len(LAYERS)} sounds: {correct * 1e6:.1f} us (per active-set change)")
+    gain_db, tilt_db = smart_corrections(bands, levels)
+    print(f"{'sound':>12} {'volume':>7} {'gain dB':>8} {'tilt dB':>8}")
+    for (name, volume), gain, tilt in zip(LAYERS, gain_db, tilt_db):
+        print(f"{name:>12} {volume:>7.2f} {gain:>+8.2f} {tilt:>+8.2f}")
+
+
+if __name__ == "__main__":
+    main()
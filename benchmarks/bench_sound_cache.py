@@ -0,0 +1,80 @@
+"""Memory plateau of the sound cache while browsing a large library
+
+Writes a library of short WAV files, then plays and stops them in a
+skewed random order (a few favourites, a long tail) on the software
+mixer with a small cache budget. Prints cache size, resident memory and
+hit/miss/eviction counters as the session goes on, plus replay cost for
+cache hits and misses.
+
+Usage: python benchmarks/bench_sound_cache.py [sounds] [budget_mb]
+"""
+import contextlib
+import io
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_io import write_wav  # noqa: E402
+from audio_player import AudioPlayer  # noqa: E402
+from engine_backend import EngineBackend  # noqa: E402
+
+
+def resident_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    budget_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 32.0
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(count):
+            path = os.path.join(directory, f"sound_{index:03d}.wav")
+            # 6 s of stereo noise: about 1 MB as int16
+            write_wav(path, rng.standard_normal((44100 * 6, 2)) * 0.1, 44100)
+            paths.append(path)
+        library_mb = sum(os.path.getsize(path) for path in paths) / 1e6
+
+        player = AudioPlayer(EngineBackend('null'))
+        player.sound_cache.set_budget(int(budget_mb * 1e6))
+        # Zipf-like popularity: low indices are replayed often
+        weights = 1.0 / np.arange(1, count + 1)
+        order = random.Random(0).choices(paths, weights=weights, k=count * 4)
+
+        print(f"{count} sounds ({library_mb:.0f} MB on disk), budget {budget_mb:.0f} MB")
+        print(f"{'plays':>6} {'cache MB':>9} {'RSS MB':>8} {'hits':>6} {'misses':>7} {'evicted':>8}")
+        hit_times, miss_times = [], []
+        for step, path in enumerate(order, 1):
+            hit = path in player.sound_cache
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                player.play(path)
+                elapsed = time.perf_counter() - start
+                player.stop_sound(path)
+            (hit_times if hit else miss_times).append(elapsed)
+            if step % (len(order) // 6) == 0:
+                stats = player.cache_stats()
+                print(f"{step:>6} {stats['bytes'] / 1e6:>9.1f} {resident_mb():>8.1f} {stats['hits']:>6} "
+                      f"{stats['misses']:>7} {stats['evictions']:>8}")
+
+        player.cleanup()
+        print(f"play on hit  {np.median(hit_times) * 1000:.2f} ms (median)")
+        print(f"play on miss {np.median(miss_times) * 1000:.2f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Sound library search: index build and filter-as-you-type latency
+
+Indexes N synthetic assets (file name, display name, tags, duration and
+loudness), then types each query one key at a time and times the search
+after every keystroke, as the search box does. A linear scan over the
+same text is shown for comparison.
+
+Usage: python benchmarks/bench_sound_index.py [assets]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from sound_index import SoundIndex  # noqa: E402
+
+WORDS = ('rain', 'thunder', 'sea', 'waves', 'birds', 'keyboard', 'typing', 'grass', 'footsteps',
+         'forest', 'wind', 'fire', 'cafe', 'train', 'river', 'night', 'city', 'cave', 'storm', 'drip')
+TAGS = ('night', 'focus', 'nature', 'urban', 'water', 'loop', 'field', 'calm')
+QUERIES = ('rain', 'forest night', 'tag:water storm', 'thunder dur>60', 'ca loud<-20', 'keyboard 004',
+           'xyzzy')
+BUDGET_MS = 10.0
+
+
+def library(count: int, seed: int = 1):
+    """(file, display name, tags, duration, loudness) of count made-up assets"""
+    rng = random.Random(seed)
+    assets = []
+    for i in range(count):
+        words = rng.sample(WORDS, 2)
+        assets.append((f"{words[0]}_{words[1]}_{i:05d}.wav", words[0].title(),
+                       rng.sample(TAGS, rng.randint(0, 3)),
+                       rng.uniform(5.0, 300.0), rng.uniform(-40.0, -6.0)))
+    return assets
+
+
+def linear_search(assets, query: str):
+    """Substring match of every word against every asset"""
+    words = query.lower().split()
+    return [asset[0] for asset in assets
+            if all(word in f"{asset[0]} {asset[1]} {' '.join(asset[2])}".lower() for word in words)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    assets = library(count)
+
+    start = time.perf_counter()
+    index = SoundIndex()
+    for file, name, tags, duration, loudness_db in assets:
+        index.add(file, [file, name], tags, duration=duration, loudness_db=loudness_db)
+    build = time.perf_counter() - start
+    print(f"{count} assets indexed in {build * 1000:.0f} ms")
+
+    worst = 0.0
+    print(f"{'query':<20} {'matches':>8} {'p50 ms':>8} {'max ms':>8} {'scan ms':>8}")
+    for query in QUERIES:
+        timings = []
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            matches = index.search(query[:end])
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        plain = ' '.join(word for word in query.split() if ':' not in word and '<' not in word
+                         and '>' not in word)
+        start = time.perf_counter()
+        linear_search(assets, plain)
+        scan = (time.perf_counter() - start) * 1000
+        worst = max(worst, timings[-1])
+        print(f"{query:<20} {len(matches):>8} {timings[len(timings) // 2]:>8.2f} {timings[-1]:>8.2f} "
+              f"{scan:>8.2f}")
+    print(f"slowest keystroke {worst:.2f} ms ({'within' if worst < BUDGET_MS else 'over'} "
+          f"the {BUDGET_MS:.0f} ms budget)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Waveform overviews: pyramid build, cached load and drawing at any width
+
+For a synthetic stereo asset of each length, times the one-off pyramid
+build (decode included), loading the cached pyramid as a restart would,
+and computing the columns for a card at several widths. The naive
+alternative, decoding and decimating the full PCM for every draw, is
+shown for comparison.
+
+Usage: python benchmarks/bench_waveform.py [minutes ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from audio_io import read_wav_int16, write_wav  # noqa: E402
+from waveform import WaveformCache  # noqa: E402
+
+SAMPLE_RATE = 44100
+WIDTHS = (160, 800, 4000)
+
+
+def best_of(function, repeats: int = 5) -> float:
+    """Fastest of several timed calls, in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def naive_columns(sound_path: str, width: int):
+    """Decode the whole file and take min/max per column"""
+    samples, _ = read_wav_int16(sound_path)
+    columns = np.array_split(samples, width)
+    return [column.min() for column in columns], [column.max() for column in columns]
+
+
+def main():
+    minutes = [float(arg) for arg in sys.argv[1:]] or [1.0, 10.0]
+    print(f"{'length':>7} {'build ms':>9} {'load ms':>8} {'file KB':>8} "
+          + ' '.join(f"{f'{w}px us':>9}" for w in WIDTHS) + f" {'naive 160px ms':>15}")
+    rng = np.random.default_rng(0)
+    for length in minutes:
+        frames = int(length * 60 * SAMPLE_RATE)
+        envelope = 0.5 + 0.4 * np.sin(2 * np.pi * np.arange(frames) / SAMPLE_RATE / 7.0)
+        audio = (envelope[:, None] * rng.uniform(-0.5, 0.5, (frames, 2))).astype(np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            sound_path = os.path.join(directory, 'asset.wav')
+            write_wav(sound_path, audio, SAMPLE_RATE)
+            del audio
+            cache_dir = os.path.join(directory, 'waveforms')
+            build = best_of(lambda: WaveformCache(cache_dir).build(sound_path), 3)
+            load = best_of(lambda: WaveformCache(cache_dir).get(sound_path))
+            size = os.path.getsize(WaveformCache(cache_dir).path(sound_path)) / 1024
+            waveform = WaveformCache(cache_dir).get(sound_path)
+            draws = [best_of(lambda: waveform.outline(width, 32), 20) for width in WIDTHS]
+            naive = best_of(lambda: naive_columns(sound_path, 160), 3)
+        print(f"{length:>5.0f} m {build * 1000:>9.1f} {load * 1000:>8.2f} {size:>8.1f} "
+              + ' '.join(f"{d * 1e6:>9.0f}" for d in draws) + f" {naive * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
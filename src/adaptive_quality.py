@@ -0,0 +1,134 @@
+import time
+from typing import Callable, List, Optional
+
+# Quality levels, full first: control tick and GUI refresh intervals in seconds
+QUALITY_LEVELS = (
+    {'name': 'full', 'control_interval': 0.05, 'gui_interval': 0.05},
+    {'name': 'reduced', 'control_interval': 0.08, 'gui_interval': 0.2},
+    {'name': 'low', 'control_interval': 0.12, 'gui_interval': 0.5},
+    {'name': 'minimal', 'control_interval': 0.2, 'gui_interval': 1.0},
+)
+# Ticks this many intervals late count as one stall, not an unbounded one
+MAX_LATENESS = 4.0
+
+
+class AdaptiveQuality:
+    """Trades control and GUI update rates for CPU headroom
+
+    A control tick hook measures how late each tick arrives and, once per
+    window, how much CPU the process used and whether the output
+    underran. Under pressure the quality drops one level per window; it
+    only comes back up, one level at a time, after recover_windows calm
+    windows in a row. Every change is logged and kept in `changes`.
+
+    Only control-rate work slows down: ramps and trajectories are
+    evaluated from the clock, so effects keep their timing with coarser
+    steps, and the audio path itself is never touched.
+    """
+
+    def __init__(self, player, levels=QUALITY_LEVELS, window: float = 2.0,
+                 late_high: float = 0.5, late_low: float = 0.1, cpu_high: float = 0.8,
+                 cpu_low: float = 0.5, recover_windows: int = 3,
+                 cpu_clock: Callable[[], float] = time.process_time):
+        self.player = player
+        self.levels = levels
+        self.window = window
+        self.late_high = late_high
+        self.late_low = late_low
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.recover_windows = recover_windows
+        self.cpu_clock = cpu_clock
+        self.level = 0
+        self.changes: List[dict] = []
+        self.lateness = 0.0
+        self.cpu = 0.0
+        self._last_tick: Optional[float] = None
+        self._window_start: Optional[float] = None
+        self._cpu_start = 0.0
+        self._underruns = 0
+        self._late_sum = 0.0
+        self._samples = 0
+        self._calm = 0
+
+    @property
+    def name(self) -> str:
+        """Name of the current level"""
+        return self.levels[self.level]['name']
+
+    def start(self):
+        """Begin measuring at full quality"""
+        self._apply(0)
+        self._last_tick = None
+        self._window_start = None
+        self.player.add_tick_hook(self._tick)
+
+    def stop(self):
+        """Stop adapting and restore full quality"""
+        self.player.remove_tick_hook(self._tick)
+        self._apply(0)
+
+    def _underrun_count(self) -> int:
+        """Output underruns so far, 0 when the backend does not report them"""
+        return self.player.output_stats().get('underruns') or 0
+
+    def _tick(self, now: float):
+        """Control tick hook: accumulate lateness, evaluate once per window"""
+        if self._last_tick is not None:
+            interval = self.player.control_interval
+            late = max(0.0, now - self._last_tick - interval) / interval
+            self._late_sum += min(late, MAX_LATENESS)
+            self._samples += 1
+        self._last_tick = now
+
+        if self._window_start is None:
+            self._start_window(now)
+            return
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+        self.lateness = self._late_sum / max(1, self._samples)
+        self.cpu = (self.cpu_clock() - self._cpu_start) / elapsed
+        underruns = self._underrun_count() - self._underruns
+        self._evaluate(underruns, now)
+        self._start_window(now)
+
+    def _start_window(self, now: float):
+        """Reset the per-window measurements"""
+        self._window_start = now
+        self._cpu_start = self.cpu_clock()
+        self._underruns = self._underrun_count()
+        self._late_sum = 0.0
+        self._samples = 0
+
+    def _evaluate(self, underruns: int, now: float):
+        """Step down under pressure, step up after enough calm windows"""
+        pressure = self.lateness > self.late_high or self.cpu > self.cpu_high or underruns > 0
+        calm = self.lateness < self.late_low and self.cpu < self.cpu_low and underruns == 0
+        if pressure:
+            self._calm = 0
+            if self.level < len(self.levels) - 1:
+                self._change(self.level + 1, underruns, now)
+        elif calm:
+            self._calm += 1
+            if self._calm >= self.recover_windows and self.level > 0:
+                self._calm = 0
+                self._change(self.level - 1, underruns, now)
+        else:
+            self._calm = 0
+
+    def _change(self, level: int, underruns: int, now: float):
+        """Switch level and log why"""
+        old = self.name
+        self._apply(level)
+        self.changes.append({'time': now, 'from': old, 'to': self.name, 'lateness': self.lateness,
+                             'cpu': self.cpu, 'underruns': underruns})
+        print(f"Quality {old} -> {self.name} (late {self.lateness:.0%}, cpu {self.cpu:.0%}, "
+              f"underruns {underruns})")
+
+    def _apply(self, level: int):
+        """Set the player's update rates for a level"""
+        self.level = level
+        settings = self.levels[level]
+        self.player.gui_interval = settings['gui_interval']
+        self.player.set_control_interval(settings['control_interval'])
@@ -0,0 +1,142 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# inotify event mask for files appearing, disappearing or being rewritten
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# File types loaded as sounds, matched case-insensitively
+SOUND_EXTENSIONS = ('.wav',)
+
+
+def is_sound_file(name: str, extensions: Tuple[str, ...] = SOUND_EXTENSIONS) -> bool:
+    """Whether a file name is a loadable sound (RAIN.WAV counts as much as rain.wav)"""
+    return name.lower().endswith(tuple(ext.lower() for ext in extensions))
+
+
+class _Inotify:
+    """Minimal inotify wrapper used as a change hint on Linux"""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def pending(self) -> bool:
+        """Drain queued events, returns True if there were any"""
+        readable, _, _ = select.select([self.fd], [], [], 0)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        """Release the inotify descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class AssetsWatcher:
+    """Track added, removed and changed sound files in a directory
+
+    A stat snapshot from os.scandir is diffed against the previous one.
+    While the directory is idle a poll costs one stat of the directory (or
+    one non-blocking inotify check on Linux); a full rescan still runs every
+    full_scan_every polls to catch in-place rewrites on other platforms.
+    """
+
+    def __init__(self, directory: str, extensions: Tuple[str, ...] = SOUND_EXTENSIONS,
+                 interval: float = 1.0, full_scan_every: int = 10, use_inotify: bool = True):
+        self.directory = directory
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.interval = interval
+        self.full_scan_every = full_scan_every
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self.dir_mtime: Optional[int] = None
+        self.polls = 0
+        self.scans = 0
+
+        self.inotify: Optional[_Inotify] = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self.inotify = _Inotify(directory)
+            except Exception as e:
+                print(f"inotify unavailable, polling assets instead: {e}")
+
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every sound file in the directory"""
+        self.scans += 1
+        entries = {}
+        try:
+            self.dir_mtime = os.stat(self.directory).st_mtime_ns
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not is_sound_file(entry.name, self.extensions):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            self.dir_mtime = None
+        return entries
+
+    def names(self) -> List[str]:
+        """Sound files currently known"""
+        return list(self.snapshot)
+
+    def _needs_scan(self) -> bool:
+        """Cheap check whether anything may have changed"""
+        self.polls += 1
+        if self.inotify is not None:
+            return self.inotify.pending()
+        if self.full_scan_every and self.polls % self.full_scan_every == 0:
+            return True
+        try:
+            return os.stat(self.directory).st_mtime_ns != self.dir_mtime
+        except FileNotFoundError:
+            return self.dir_mtime is not None
+
+    def poll(self) -> Tuple[List[str], List[str], List[str]]:
+        """Return (added, removed, changed) file names since the last poll"""
+        if not self._needs_scan():
+            return [], [], []
+
+        current = self._scan()
+        previous = self.snapshot
+        added = [name for name in current if name not in previous]
+        removed = [name for name in previous if name not in current]
+        changed = [name for name in current
+                   if name in previous and current[name] != previous[name]]
+        self.snapshot = current
+        return added, removed, changed
+
+    def close(self):
+        """Stop watching"""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
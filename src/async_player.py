@@ -0,0 +1,210 @@
+import asyncio
+import contextlib
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+# Event types published by AsyncPlayer.events()
+EVENT_TYPES = ('started', 'stopped', 'paused', 'resumed', 'volume', 'pan')
+
+
+class AsyncPlayer:
+    """asyncio front end for an AudioPlayer
+
+    Fades are the player's own ramps, advanced by its shared control tick;
+    each awaiting coroutine only holds a future that the ramp's completion
+    callback resolves through call_soon_threadsafe, so no thread or timer
+    is created per operation. One tick hook notices ramps that were
+    retargeted or stopped by someone else (the future resolves False) and
+    diffs the player's state into the event stream. Cancelling an awaiting
+    task stops its ramp where it is.
+    """
+
+    def __init__(self, player, queue_size: int = 256):
+        self.player = player
+        self.queue_size = queue_size
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # (future, sound_path, ramp name, completion callback)
+        self._waiters: List[tuple] = []
+        self._subscribers: List[asyncio.Queue] = []
+        self._lock = threading.Lock()
+        self._state = self._snapshot()
+        player.add_tick_hook(self._tick)
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """Event loop that futures and events are delivered to"""
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        return self.loop
+
+    async def _ramp(self, sound_path: str, ramp_name: str, start: Callable[[Callable], None]) -> bool:
+        """Start a ramp through start(callback) and wait for it to finish"""
+        loop = self._bind()
+        future = loop.create_future()
+
+        def done():
+            self._resolve(waiter, True)
+
+        waiter = (future, sound_path, ramp_name, done)
+        # Registered together, so the tick never sees one without the other
+        with self._lock:
+            self._waiters.append(waiter)
+            start(done)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._cancel(waiter)
+            raise
+
+    def _resolve(self, waiter: tuple, result: bool):
+        """Finish a waiter from any thread"""
+        with self._lock:
+            if waiter not in self._waiters:
+                return
+            self._waiters.remove(waiter)
+        future = waiter[0]
+        future.get_loop().call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+
+    def _cancel(self, waiter: tuple):
+        """Stop a cancelled waiter's ramp if it still belongs to it"""
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        _, sound_path, ramp_name, done = waiter
+        sound_info = self.player.playing_sounds.get(sound_path)
+        if sound_info and sound_info[ramp_name].callback is done:
+            ramp = sound_info[ramp_name]
+            ramp.cancel()
+            if ramp_name == 'volume_ramp':
+                # The level it stopped at is the new requested volume
+                sound_info['volume'] = ramp.value
+
+    async def fade_to(self, sound_path: str, volume: float, duration: Optional[float] = None) -> bool:
+        """Fade a playing sound to volume; True once it gets there, False if superseded"""
+        sound_info = self.player.playing_sounds.get(sound_path)
+        if not sound_info:
+            return False
+
+        def start(callback):
+            sound_info['volume'] = volume
+            self.player.fade_volume(sound_path, sound_info['volume_ramp'].value, volume, callback, duration)
+
+        return await self._ramp(sound_path, 'volume_ramp', start)
+
+    async def pan_to(self, sound_path: str, pan: float, duration: Optional[float] = None) -> bool:
+        """Move a playing sound to pan; True once it gets there, False if superseded"""
+        sound_info = self.player.playing_sounds.get(sound_path)
+        if not sound_info:
+            return False
+
+        def start(callback):
+            self.player.fade_pan(sound_path, sound_info['pan'], pan, callback, duration)
+
+        return await self._ramp(sound_path, 'pan_ramp', start)
+
+    async def play(self, sound_path: str, volume: Optional[float] = None,
+                   duration: Optional[float] = None) -> bool:
+        """Start (or resume) a sound and fade it in"""
+        volume = self.player.base_volume if volume is None else volume
+        sound_info = self.player.playing_sounds.get(sound_path)
+        if sound_info and sound_info.get('paused'):
+            self.player.unpause_sound(sound_path)
+        elif sound_info is None:
+            if not self.player.play(sound_path):
+                return False
+            self.player.fade_volume(sound_path, 0.0, 0.0)
+        return await self.fade_to(sound_path, volume, duration)
+
+    async def stop(self, sound_path: str, duration: Optional[float] = None) -> bool:
+        """Fade a sound out and stop it; False if the fade was superseded"""
+        if not await self.fade_to(sound_path, 0.0, duration):
+            return False
+        return self.player.stop_sound(sound_path)
+
+    @contextlib.asynccontextmanager
+    async def scene(self, volumes: Dict[str, float], duration: Optional[float] = None):
+        """Bring sounds to the given volumes for the body, then restore the previous mix
+
+        Sounds the scene started are faded out and stopped on exit, the
+        others fade back to the volume they had before. Cancellation while
+        fading in or inside the body still restores the mix.
+        """
+        previous = {path: self.player.playing_sounds[path]['volume']
+                    for path in volumes if path in self.player.playing_sounds}
+        try:
+            await asyncio.gather(*(self.play(path, volume, duration) for path, volume in volumes.items()))
+            yield self
+        finally:
+            await asyncio.gather(*(self.fade_to(path, previous[path], duration) if path in previous
+                                   else self.stop(path, duration) for path in volumes))
+
+    async def events(self) -> AsyncIterator[dict]:
+        """Player state changes: started, stopped, paused, resumed, volume and pan
+
+        Changes are sampled once per control tick, so a burst of slider
+        moves arrives as its final value. A slow consumer loses the oldest
+        events rather than holding the player back.
+        """
+        self._bind()
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    def _snapshot(self) -> Dict[str, tuple]:
+        """(paused, requested volume, pan target) of every playing sound"""
+        return {path: (bool(info.get('paused')), info['volume'], info['pan_ramp'].target)
+                for path, info in list(self.player.playing_sounds.items())
+                if info.get('channel') and (info.get('paused') or info['channel'].get_busy())}
+
+    def _tick(self, now: float):
+        """Control tick hook: settle superseded waiters and publish state changes"""
+        with self._lock:
+            waiters = list(self._waiters)
+        for waiter in waiters:
+            _, sound_path, ramp_name, done = waiter
+            sound_info = self.player.playing_sounds.get(sound_path)
+            # Retargeted, cancelled or stopped by another caller
+            if not sound_info or sound_info[ramp_name].callback is not done:
+                self._resolve(waiter, False)
+
+        state = self._snapshot()
+        events = []
+        for path, (paused, volume, pan) in state.items():
+            old = self._state.get(path)
+            if old is None:
+                events.append({'type': 'started', 'sound': path, 'volume': volume, 'pan': pan})
+                continue
+            if paused != old[0]:
+                events.append({'type': 'paused' if paused else 'resumed', 'sound': path})
+            if volume != old[1]:
+                events.append({'type': 'volume', 'sound': path, 'value': volume})
+            if pan != old[2]:
+                events.append({'type': 'pan', 'sound': path, 'value': pan})
+        for path in self._state:
+            if path not in state:
+                events.append({'type': 'stopped', 'sound': path})
+        self._state = state
+
+        if events and self._subscribers and self.loop is not None:
+            for event in events:
+                event['time'] = now
+            self.loop.call_soon_threadsafe(self._publish, events)
+
+    def _publish(self, events: List[dict]):
+        """Deliver a tick's events to every subscriber (event loop thread)"""
+        for queue in list(self._subscribers):
+            for event in events:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(event)
+
+    def close(self):
+        """Detach from the player; pending fades resolve False"""
+        self.player.remove_tick_hook(self._tick)
+        with self._lock:
+            waiters = list(self._waiters)
+        for waiter in waiters:
+            self._resolve(waiter, False)
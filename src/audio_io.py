@@ -0,0 +1,73 @@
+import wave
+from typing import Tuple
+
+import numpy as np
+
+
+def _read_frames(file_path: str) -> Tuple[bytes, int, int, int]:
+    """Raw PCM bytes, channel count, sample width and rate of a WAV file"""
+    with wave.open(file_path, 'rb') as wav:
+        return wav.readframes(wav.getnframes()), wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+
+
+def read_wav(file_path: str) -> Tuple[np.ndarray, int]:
+    """Read a PCM WAV file as float32 (frames, channels) in [-1, 1]"""
+    raw, channels, width, rate = _read_frames(file_path)
+    return _decode(raw, channels, width), rate
+
+
+def read_wav_int16(file_path: str) -> Tuple[np.ndarray, int]:
+    """Read a PCM WAV file as int16 (frames, channels) at its own channel count"""
+    raw, channels, width, rate = _read_frames(file_path)
+    if width == 2:
+        # Already 16-bit: reuse the file bytes without a float round trip
+        return np.frombuffer(raw, dtype='<i2').reshape(-1, channels), rate
+    return to_int16(_decode(raw, channels, width)), rate
+
+
+def _decode(raw: bytes, channels: int, width: int) -> np.ndarray:
+    """Decode PCM bytes to float32 (frames, channels)"""
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif width == 3:
+        # Expand packed 24-bit samples to 32-bit before scaling
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        wide = np.zeros((packed.shape[0], 4), dtype=np.uint8)
+        wide[:, 1:] = packed
+        data = wide.view('<i4').reshape(-1).astype(np.float32) / 2147483648.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    return data.reshape(-1, channels)
+
+
+def to_int16(block: np.ndarray) -> np.ndarray:
+    """Convert float samples to clipped int16"""
+    return (np.clip(block, -1.0, 1.0) * 32767.0).astype('<i2')
+
+
+def write_wav(file_path: str, data: np.ndarray, rate: int):
+    """Write float (frames, channels) data as a 16-bit WAV file"""
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, None]
+    with wave.open(file_path, 'wb') as wav:
+        wav.setnchannels(data.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(to_int16(data).tobytes())
+
+
+def resample(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Linear resampling of (frames, channels) data"""
+    if src_rate == dst_rate:
+        return data
+    frames = int(round(data.shape[0] * dst_rate / src_rate))
+    src = np.arange(data.shape[0]) / src_rate
+    dst = np.arange(frames) / dst_rate
+    return np.stack([np.interp(dst, src, data[:, c]) for c in range(data.shape[1])],
+                    axis=1).astype(np.float32)
@@ -1,31 +1,155 @@
-import os
-import pygame
-from typing import Dict, Optional
-import threading
+from typing import Callable, Dict, List, Optional
 import math
-import time
-import random
+from mixer_backend import DEFAULT_PROFILE, MixerBackend, PygameBackend, get_profile
+from noise_catalog import is_noise
+from pan_trajectory import RandomPanTrajectory
+from ramps import ParameterRamp
+from sound_cache import DEFAULT_BUDGET, SoundCache
+from startup_trace import trace
+# numpy-backed modules (eq, noise, spectral_profile) are imported where they
+# are first needed, so they stay off the startup path
+
 
 class AudioPlayer:
-    def __init__(self):
+    def __init__(self, backend: Optional[MixerBackend] = None, profile: str = DEFAULT_PROFILE):
         """Initialize audio player"""
-        # Initialize pygame if needed
-        if not pygame.get_init():
-            pygame.init()
-        if not pygame.mixer.get_init():
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-            
+        # Output backend and clock (pygame unless a test backend is given)
+        self.backend: MixerBackend = backend or PygameBackend()
+
+        # Mixer output settings from the latency profile, opened on first use
+        self.profile = get_profile(profile)
+        self.frequency: int = self.profile['sample_rate']
+        self.buffer_size: int = self.profile['buffer_size']
+        self.mixer_ready: bool = False
+        self.panner = None
+
         # Basic parameters
         self.playing_sounds: Dict[str, dict] = {}
-        self.fade_steps: int = 30
-        self.fade_interval: int = 30
+        self.fade_time: float = 0.9
+        self.volume_smoothing: float = 0.05
         self.base_volume: float = 0.5
         self.max_sounds: int = 3
         self.smart_mixing: bool = True
         self.auto_balance: bool = False
-        
-        # Increase number of channels for effects
-        pygame.mixer.set_num_channels(self.max_sounds * 2)
+
+        # Pre-rendered loop variants (VariationCache), used when available
+        self.variations = None
+
+        # Smart mixing: band profiles of assets (opened on first use, kept in
+        # profiles_file when set) and the largest corrections
+        self.profiles_file: Optional[str] = None
+        self._profiles = None
+        self.smart_max_cut_db: float = 3.0
+        self.smart_max_tilt_db: float = 4.0
+
+        # Decoded sounds, kept after stopping until the budget is exceeded
+        self.sound_cache = SoundCache(DEFAULT_BUDGET)
+
+        # Random pan settings (range is the natural 80% pan limit)
+        self.random_pan_range: float = 0.8
+        self.random_pan_speed: float = 1.0
+        self.random_pan_seed: Optional[int] = None
+
+        # Breathing effect settings
+        self.breath_intensity: float = 0.2
+        self.breath_speed: float = 0.5
+
+        # Filter sweep settings (low-pass cutoff moves between these, log scale)
+        self.sweep_low: float = 400.0
+        self.sweep_high: float = 12000.0
+        self.sweep_period: float = 30.0
+
+        # Shared control tick for effects
+        self.control_interval: float = 0.05
+        # Card displays follow effects at most this often
+        self.gui_interval: float = 0.05
+        self._last_tick: Optional[float] = None
+        self._last_gui: Optional[float] = None
+        self._gui_due: bool = True
+        self._balance_pending: bool = False
+        self._smart_pending: bool = False
+        # Called with the tick time before effects advance (e.g. OSC input)
+        self.tick_hooks: List[Callable[[float], None]] = []
+
+    def _ensure_mixer(self):
+        """Open the backend output on first use"""
+        if self.mixer_ready:
+            return
+        with trace.phase('pygame init'):
+            # Extra channels for effects
+            self.backend.init(self.frequency, self.buffer_size, self.max_sounds * 2)
+            # Equal-power stereo pan table
+            from spatial import SpatialPanner
+            self.panner = SpatialPanner('stereo')
+        self.mixer_ready = True
+
+    def output_stats(self) -> Optional[dict]:
+        """Latency profile and buffer underrun statistics of the output"""
+        stats = {'profile': self.profile['name'], 'sample_rate': self.frequency,
+                 'buffer_size': self.buffer_size}
+        backend_stats = getattr(self.backend, 'output_stats', None)
+        if backend_stats:
+            stats.update(backend_stats() or {'underruns': None})
+        return stats
+
+    def start_recording(self, file_path: str) -> bool:
+        """Record what is played to a WAV or FLAC file"""
+        try:
+            self._ensure_mixer()
+            self.backend.start_recording(file_path)
+            print(f"Recording to {file_path}")
+            return True
+        except Exception as e:
+            print(f"Error starting recording: {e}")
+            return False
+
+    def stop_recording(self) -> Optional[dict]:
+        """Finish the recording; returns length and overrun stats"""
+        try:
+            stats = self.backend.stop_recording()
+            if stats:
+                print(f"Recorded {stats['seconds']:.1f} s to {stats['file']} "
+                      f"({stats['overruns']} overruns)")
+            return stats
+        except Exception as e:
+            print(f"Error stopping recording: {e}")
+            return None
+
+    def memory_usage(self) -> dict:
+        """Sample memory in bytes per loaded sound and in total"""
+        sounds = self.sound_cache.usage()
+        return {'sounds': sounds, 'total': sum(sounds.values())}
+
+    def cache_stats(self) -> dict:
+        """Sound cache size, budget and hit/miss/eviction counters"""
+        return self.sound_cache.stats()
+
+    def _sound_bytes(self, sound) -> int:
+        """Memory held by a decoded sound, 0 if the backend cannot tell"""
+        try:
+            return self.backend.sound_bytes(sound)
+        except Exception as e:
+            print(f"Error measuring sound memory: {e}")
+            return 0
+
+    def _get_sound(self, sound_path: str, source=None, pinned: bool = False):
+        """Decoded sound from the cache, loading or generating it on a miss"""
+        sound = self.sound_cache.get(sound_path)
+        if sound is not None:
+            if pinned:
+                self.sound_cache.pin(sound_path)
+            return sound
+
+        if source is None and is_noise(sound_path):
+            from noise import NoiseSource
+            source = NoiseSource.from_name(sound_path, self.frequency)
+        if source is not None:
+            sound = self.backend.create_sound(sound_path, source)
+        else:
+            with trace.phase('asset decode'):
+                sound = self.backend.load_sound(self._source_path(sound_path))
+        self.sound_cache.put(sound_path, sound, self._sound_bytes(sound), pinned)
+        return sound
 
     def _create_sound_info(self, sound, channel) -> dict:
         """Create sound information structure"""
@@ -35,47 +159,70 @@ class AudioPlayer:
             'volume': self.base_volume,
             'pan': 0.0,
             'breathing_active': False,
-            'breath_timer': None,
+            'breath_origin': 0.0,
             'random_pan_active': False,
-            'pan_timer': None,
+            'pan_trajectory': None,
             'paused': False,
             'gui_callback': None,
             'pan_callback': None,
-            'fade_timer': None,
-            'pan_fade_timer': None,
-            'pan_target': None
+            'filters': None,
+            'tone': 0.0,
+            'sweep_active': False,
+            'sweep_origin': 0.0,
+            'profile_path': None,
+            'started_at': self.backend.now(),
+            'paused_at': None,
+            'paused_time': 0.0,
+            'smart_ramp': ParameterRamp(1.0, self.fade_time),
+            'volume_ramp': ParameterRamp(self.base_volume, self.volume_smoothing),
+            'pan_ramp': ParameterRamp(0.0, self.fade_time)
         }
 
     def _cancel_timers(self, sound_info: dict):
-        """Cancel all active timers"""
-        timers = ['breath_timer', 'pan_timer', 'fade_timer', 'pan_fade_timer']
-        for timer in timers:
-            if timer in sound_info and sound_info[timer]:
-                try:
-                    sound_info[timer].cancel()
-                    sound_info[timer] = None
-                except Exception as e:
-                    print(f"Error canceling {timer}: {e}")
+        """Cancel all active ramps and effects"""
+        for ramp in ('volume_ramp', 'pan_ramp', 'smart_ramp'):
+            if sound_info.get(ramp):
+                sound_info[ramp].cancel()
+        sound_info['breathing_active'] = False
+        sound_info['random_pan_active'] = False
+        sound_info['pan_trajectory'] = None
+        sound_info['sweep_active'] = False
+
+    def _source_path(self, sound_path: str) -> str:
+        """File to decode for a sound: a finished variant or the original"""
+        if self.variations is not None:
+            variant = self.variations.lookup(sound_path)
+            if variant:
+                return variant
+        return sound_path
 
     def load_sound(self, name: str, file_path: str) -> bool:
-        """Load sound file"""
+        """Decode a sound into the cache ahead of playing it"""
         try:
-            sound = pygame.mixer.Sound(file_path)
-            sound.set_volume(self.base_volume)
-            self.playing_sounds[name] = self._create_sound_info(sound, None)
+            self._ensure_mixer()
+            if name not in self.sound_cache:
+                with trace.phase('asset decode'):
+                    sound = self.backend.load_sound(self._source_path(file_path))
+                self.sound_cache.put(name, sound, self._sound_bytes(sound))
             print(f"Successfully loaded sound: {name}")
             return True
         except Exception as e:
             print(f"Error loading sound {name}: {str(e)}")
             return False
 
-    def play(self, sound_path):
-        """Play sound"""
+    def play(self, sound_path, source=None):
+        """Play sound
+
+        With a source (e.g. GranularSource) sound_path is only the sound's
+        name and the audio is generated instead of loaded from disk. Names
+        like "noise:pink" create a NoiseSource.
+        """
         try:
             print(f"Attempting to play: {sound_path}")
             
             # Check file existence
-            if not os.path.exists(sound_path):
+            generated = source is not None or is_noise(sound_path) or sound_path in self.sound_cache
+            if not generated and not self.backend.exists(sound_path):
                 print(f"File not found: {sound_path}")
                 return False
                 
@@ -87,16 +234,22 @@ class AudioPlayer:
                 return False
             
             if sound_path not in self.playing_sounds:
-                sound = pygame.mixer.Sound(sound_path)
-                channel = pygame.mixer.find_channel()
+                self._ensure_mixer()
+                sound = self._get_sound(sound_path, source, pinned=True)
+                channel = self.backend.find_channel()
                 if channel is None:
+                    self.sound_cache.unpin(sound_path)
                     print("No free channels available")
                     return False
                 
                 channel.play(sound, loops=-1)
+                # Audible once the output buffer has been consumed
+                trace.mark('first audible sample', self.buffer_size / self.frequency)
                 self.playing_sounds[sound_path] = self._create_sound_info(sound, channel)
                 # Apply initial volume
                 self._apply_volume_pan(sound_path, self.base_volume, 0.0)
+                self._mix_changed()
+                self._ensure_control_loop()
                 print(f"Successfully playing: {sound_path} (vol={self.base_volume:.2f}, pan={0.0:.2f})")
                 return True
             
@@ -106,64 +259,34 @@ class AudioPlayer:
             print(f"Error playing sound: {e}")
             return False
 
-    def fade_volume(self, sound_path, start_vol, target_vol, callback=None):
-        """Smooth volume transition"""
+    def fade_volume(self, sound_path, start_vol, target_vol, callback=None,
+                    duration: Optional[float] = None):
+        """Smooth volume transition (fade_time unless a duration is given)"""
         if sound_path not in self.playing_sounds:
             return
-            
-        sound = self.playing_sounds[sound_path]
-        steps = self.fade_steps
-        vol_step = (target_vol - start_vol) / steps
-        
-        def fade_step(current_step=0):
-            if current_step < steps and sound_path in self.playing_sounds:
-                current_vol = start_vol + (vol_step * current_step)
-                # Apply current volume considering pan
-                self._apply_volume_pan(sound_path, current_vol, sound['pan'])
-                # Schedule next step
-                sound['fade_timer'] = threading.Timer(
-                    self.fade_interval / 1000.0,
-                    lambda: fade_step(current_step + 1)
-                )
-                sound['fade_timer'].start()
-            elif callback:
-                callback()
-        
-        # Cancel previous fade if exists
-        if 'fade_timer' in sound and sound['fade_timer']:
-            sound['fade_timer'].cancel()
-        
-        fade_step()
 
-    def fade_pan(self, sound_path, start_pan, target_pan, callback=None):
-        """Smooth pan transition"""
+        sound_info = self.playing_sounds[sound_path]
+        ramp = sound_info['volume_ramp']
+        # An in-flight ramp is retargeted rather than restarted
+        if not ramp.active:
+            ramp.jump(start_vol)
+            # Start from the new level now, not on the next tick
+            self._apply_volume_pan(sound_path, start_vol, sound_info['pan'])
+        ramp.set_target(target_vol, self.fade_time if duration is None else duration, callback)
+        self._ensure_control_loop()
+
+    def fade_pan(self, sound_path, start_pan, target_pan, callback=None,
+                 duration: Optional[float] = None):
+        """Smooth pan transition (fade_time unless a duration is given)"""
         if sound_path not in self.playing_sounds:
             return
-            
-        sound = self.playing_sounds[sound_path]
-        steps = self.fade_steps
-        pan_step = (target_pan - start_pan) / steps
-        
-        def fade_step(current_step=0):
-            if current_step < steps and sound_path in self.playing_sounds:
-                current_pan = start_pan + (pan_step * current_step)
-                sound['pan'] = current_pan
-                # Apply current pan with current volume
-                self._apply_volume_pan(sound_path, sound['volume'], current_pan)
-                # Schedule next step
-                sound['pan_fade_timer'] = threading.Timer(
-                    self.fade_interval / 1000.0,
-                    lambda: fade_step(current_step + 1)
-                )
-                sound['pan_fade_timer'].start()
-            elif callback:
-                callback()
-        
-        # Cancel previous fade if exists
-        if 'pan_fade_timer' in sound and sound['pan_fade_timer']:
-            sound['pan_fade_timer'].cancel()
-        
-        fade_step()
+
+        ramp = self.playing_sounds[sound_path]['pan_ramp']
+        # An in-flight ramp is retargeted rather than restarted
+        if not ramp.active:
+            ramp.jump(start_pan)
+        ramp.set_target(target_pan, self.fade_time if duration is None else duration, callback)
+        self._ensure_control_loop()
 
     def pause_sound(self, sound_path):
         """Pause sound playback"""
@@ -173,6 +296,8 @@ class AudioPlayer:
                 if sound_info['channel'] and sound_info['channel'].get_busy():
                     sound_info['channel'].pause()
                     sound_info['paused'] = True
+                    sound_info['paused_at'] = self.backend.now()
+                    self._mix_changed()
                     print(f"Sound paused: {sound_path}")
                     return True
             return False
@@ -185,9 +310,18 @@ class AudioPlayer:
         try:
             if sound_path in self.playing_sounds:
                 sound_info = self.playing_sounds[sound_path]
+                if sound_info.get('stale'):
+                    # File changed while playing: restart from fresh audio
+                    self.unload_sound(sound_path)
+                    return False
                 if sound_info['channel'] and sound_info.get('paused', False):
                     sound_info['channel'].unpause()
                     sound_info['paused'] = False
+                    if sound_info['paused_at'] is not None:
+                        sound_info['paused_time'] += self.backend.now() - sound_info['paused_at']
+                        sound_info['paused_at'] = None
+                    self._mix_changed()
+                    self._ensure_control_loop()
                     print(f"Sound unpaused: {sound_path}")
                     return True
             return False
@@ -195,28 +329,90 @@ class AudioPlayer:
             print(f"Error unpausing sound: {e}")
             return False
 
+    def play_granular(self, name: str, source_path: str, **params) -> bool:
+        """Play an endless granular texture made from a WAV file"""
+        if name in self.playing_sounds:
+            return False
+        if name in self.sound_cache:
+            return self.play(name)
+        try:
+            from granular import GranularSource
+            source = GranularSource.from_file(source_path, self.frequency, **params)
+        except Exception as e:
+            print(f"Error creating granular source: {e}")
+            return False
+        if not self.play(name, source):
+            return False
+        # Grains keep the spectrum of the file they are cut from
+        self.playing_sounds[name]['profile_path'] = source_path
+        return True
+
     def stop_sound(self, sound_path):
-        """Stop sound playback"""
-        if sound_path in self.playing_sounds:
-            sound_info = self.playing_sounds[sound_path]
-            # Cancel all active effects
-            self._cancel_timers(sound_info)
-            
-            if sound_info['channel']:
-                sound_info['channel'].stop()
-            
-            print(f"Sound stopped: {sound_path}")
-            return True
-        return False
+        """Stop sound playback; the decoded audio stays cached until evicted"""
+        sound_info = self.playing_sounds.pop(sound_path, None)
+        if sound_info is None:
+            return False
+
+        # Cancel all active effects
+        self._cancel_timers(sound_info)
+
+        if sound_info['channel']:
+            sound_info['channel'].stop()
+
+        if sound_info.get('stale'):
+            # Changed on disk while playing: never replay the old audio
+            self.sound_cache.discard(sound_path)
+        else:
+            self.sound_cache.unpin(sound_path)
+        self._mix_changed()
+        print(f"Sound stopped: {sound_path}")
+        return True
+
+    def loop_position(self, sound_path: str):
+        """(seconds into the current pass, loop length) of a playing sound, from the clock"""
+        sound_info = self.playing_sounds.get(sound_path)
+        if not sound_info:
+            return None
+        try:
+            length = sound_info['sound'].get_length()
+        except Exception:
+            return None
+        if not length or math.isinf(length):
+            return None
+        now = sound_info['paused_at'] if sound_info['paused_at'] is not None else self.backend.now()
+        return (now - sound_info['started_at'] - sound_info['paused_time']) % length, length
+
+    def unload_sound(self, sound_path) -> bool:
+        """Stop a sound and free its decoded audio"""
+        stopped = self.stop_sound(sound_path)
+        return self.sound_cache.discard(sound_path) or stopped
+
+    def refresh_sound(self, sound_path) -> bool:
+        """Drop cached audio after the file changed on disk
+
+        A sound that is currently audible keeps playing and is reloaded the
+        next time it is started.
+        """
+        sound_info = self.playing_sounds.get(sound_path)
+        if sound_info is None:
+            return self.sound_cache.discard(sound_path)
+        channel = sound_info.get('channel')
+        if channel and channel.get_busy() and not sound_info.get('paused', False):
+            sound_info['stale'] = True
+            return False
+        return self.unload_sound(sound_path)
 
     def set_volume(self, sound_path, volume):
         """Set sound volume"""
         if sound_path in self.playing_sounds:
             sound_info = self.playing_sounds[sound_path]
             sound_info['volume'] = volume
-            self._apply_volume_pan(sound_path, volume, sound_info['pan'])
+            sound_info['volume_ramp'].set_target(volume, self.volume_smoothing)
+            # Rebalance once on the next control tick, not per event
             if self.auto_balance:
-                self._apply_auto_balance()
+                self._balance_pending = True
+            self._mix_changed()
+            self._ensure_control_loop()
 
     def _apply_volume_pan(self, sound_path, volume, pan):
         """Apply volume and panning"""
@@ -227,9 +423,13 @@ class AudioPlayer:
         if not sound_info['channel']:
             return
             
-        # Calculate left and right channel volumes
-        left_volume = volume * (1 - pan) if pan >= 0 else volume
-        right_volume = volume * (1 + pan) if pan <= 0 else volume
+        # Smart mixing trim on top of the requested volume
+        volume *= sound_info['smart_ramp'].value
+
+        # Calculate left and right channel volumes (equal-power law)
+        left_gain, right_gain = self.panner.pan_gains(pan)
+        left_volume = volume * left_gain
+        right_volume = volume * right_gain
         
         # Apply to pygame channel
         sound_info['channel'].set_volume(left_volume, right_volume)
@@ -237,9 +437,150 @@ class AudioPlayer:
     def set_pan(self, sound_path: str, pan: float):
         """Set sound panning with smooth transition"""
         if sound_path in self.playing_sounds:
-            sound_info = self.playing_sounds[sound_path]
-            current_pan = sound_info['pan']
-            self.fade_pan(sound_path, current_pan, pan)
+            self.playing_sounds[sound_path]['pan_ramp'].set_target(pan, self.fade_time)
+            self._ensure_control_loop()
+
+    def set_position(self, sound_path: str, x: float, y: float = 0.0):
+        """Place a sound in the room: x is the pan, y is front/back on surround outputs"""
+        if sound_path in self.playing_sounds:
+            channel = self.playing_sounds[sound_path]['channel']
+            if channel and hasattr(channel, 'set_depth'):
+                channel.set_depth(y)
+            self.set_pan(sound_path, x)
+
+    def set_reverb(self, ir_path: Optional[str], wet: float = 0.25) -> bool:
+        """Room reverb on the master bus from an impulse response WAV, None turns it off"""
+        try:
+            self._ensure_mixer()
+            self.backend.set_reverb(ir_path, wet)
+            print(f"Reverb: {ir_path} (wet {wet:.2f})" if ir_path else "Reverb off")
+            return True
+        except Exception as e:
+            print(f"Error setting reverb: {e}")
+            return False
+
+    def _dynamics(self):
+        """Master-bus dynamics of the output, None if the backend has none"""
+        self._ensure_mixer()
+        dynamics = self.backend.master_dynamics()
+        if dynamics is None:
+            print("Master dynamics need a software-mixed output")
+        return dynamics
+
+    def set_limiter(self, enabled: bool = True, ceiling_db: Optional[float] = None) -> bool:
+        """Switch the master limiter (on by default) and set its ceiling"""
+        dynamics = self._dynamics()
+        if dynamics is None:
+            return False
+        dynamics.limiter.enabled = enabled
+        if ceiling_db is not None:
+            dynamics.limiter.ceiling_db = ceiling_db
+        return True
+
+    def set_compressor(self, enabled: bool = True, threshold_db: Optional[float] = None,
+                       ratio: Optional[float] = None, makeup_db: Optional[float] = None) -> bool:
+        """Switch the master compressor and adjust its settings"""
+        dynamics = self._dynamics()
+        if dynamics is None:
+            return False
+        compressor = dynamics.compressor
+        compressor.enabled = enabled
+        if threshold_db is not None:
+            compressor.threshold_db = threshold_db
+        if ratio is not None:
+            compressor.ratio = max(1.0, ratio)
+        if makeup_db is not None:
+            compressor.makeup_db = makeup_db
+        return True
+
+    def set_ducking_key(self, sound_path: str, enabled: bool = True,
+                        depth_db: Optional[float] = None) -> bool:
+        """Let a sound (e.g. a voice or bell) duck every other sound while it is loud"""
+        sound_info = self.playing_sounds.get(sound_path)
+        if not sound_info or not hasattr(sound_info['channel'], 'set_key'):
+            print(f"Ducking needs a playing sound on a software-mixed output: {sound_path}")
+            return False
+        if depth_db is not None:
+            self.backend.master_dynamics().ducker.depth_db = depth_db
+        sound_info['channel'].set_key(enabled)
+        return True
+
+    def _filters(self, sound_path: str) -> Optional['FilterChain']:
+        """Filter chain of a playing sound, created on first use"""
+        sound_info = self.playing_sounds.get(sound_path)
+        if not sound_info:
+            return None
+        if sound_info['filters'] is None:
+            if not self.backend.supports_filters:
+                print("Per-sound filters need a software-mixed output")
+                return None
+            from eq import FilterChain
+            sound_info['filters'] = FilterChain(self.frequency)
+            sound_info['channel'].set_filters(sound_info['filters'])
+        return sound_info['filters']
+
+    def set_eq_band(self, sound_path: str, name: str, kind: Optional[str] = None,
+                    freq: Optional[float] = None, gain_db: Optional[float] = None,
+                    q: Optional[float] = None) -> bool:
+        """Add or change an EQ band (lowpass, highpass, lowshelf, highshelf, peaking)"""
+        filters = self._filters(sound_path)
+        if filters is None:
+            return False
+        try:
+            filters.set_band(name, kind, freq, gain_db, q)
+            return True
+        except Exception as e:
+            print(f"Error setting EQ band {name}: {e}")
+            return False
+
+    def remove_eq_band(self, sound_path: str, name: str) -> bool:
+        """Remove an EQ band"""
+        filters = self._filters(sound_path)
+        if filters is None:
+            return False
+        filters.remove_band(name)
+        return True
+
+    def set_tone(self, sound_path: str, tone: float) -> bool:
+        """Darker (-1, low-pass) to thinner (1, high-pass), 0 is flat"""
+        sound_info = self.playing_sounds.get(sound_path)
+        filters = self._filters(sound_path)
+        if filters is None:
+            return False
+        sound_info['tone'] = tone
+        from eq import tone_bands
+        bands = tone_bands(tone)
+        filters.set_band('highpass', 'highpass', bands['highpass'])
+        # A running sweep owns the low-pass cutoff
+        if not sound_info['sweep_active']:
+            filters.set_band('lowpass', 'lowpass', bands['lowpass'])
+        return True
+
+    def start_filter_sweep(self, sound_path: str) -> bool:
+        """Slowly sweep a low-pass filter up and down"""
+        sound_info = self.playing_sounds.get(sound_path)
+        if not sound_info or self._filters(sound_path) is None:
+            return False
+        if not sound_info['sweep_active']:
+            sound_info['sweep_origin'] = self.backend.now()
+            sound_info['sweep_active'] = True
+            self._ensure_control_loop()
+        return True
+
+    def stop_filter_sweep(self, sound_path: str) -> bool:
+        """Stop the sweep and return to the tone setting"""
+        sound_info = self.playing_sounds.get(sound_path)
+        if not sound_info or not sound_info['sweep_active']:
+            return False
+        sound_info['sweep_active'] = False
+        return self.set_tone(sound_path, sound_info['tone'])
+
+    def _sweep_cutoff(self, sound_info: dict, now: float) -> float:
+        """Low-pass cutoff of the sweep at time now"""
+        phase = 2 * math.pi * (now - sound_info['sweep_origin']) / self.sweep_period
+        # Start at the top so the sweep fades in from an open filter
+        position = 0.5 + 0.5 * math.cos(phase)
+        return self.sweep_low * (self.sweep_high / self.sweep_low) ** position
 
     def start_breathing(self, sound_path):
         """Start breathing effect"""
@@ -257,32 +598,18 @@ class AudioPlayer:
             return True
             
         print("Starting breathing effect")    
+        # Volume is modulated by the control tick
+        sound_info['breath_origin'] = self.backend.now()
         sound_info['breathing_active'] = True
-        base_volume = sound_info['volume']
-        
-        def breath_cycle():
-            if not sound_info['breathing_active']:
-                return
-                
-            # Calculate breath effect
-            t = time.time() * 0.5
-            breath_intensity = 0.2
-            current_volume = base_volume * (1 + breath_intensity * math.sin(t))
-            current_volume = max(0.0, min(1.0, current_volume))
-            
-            # Apply volume
-            if sound_path in self.playing_sounds:
-                self._apply_volume_pan(sound_path, current_volume, sound_info['pan'])
-                if sound_info.get('gui_callback'):
-                    sound_info['gui_callback'](current_volume)
-                
-                if sound_info['breathing_active']:
-                    sound_info['breath_timer'] = threading.Timer(0.05, breath_cycle)
-                    sound_info['breath_timer'].start()
-            
-        breath_cycle()
+        self._ensure_control_loop()
         return True
 
+    def _breath_volume(self, sound_info: dict, volume: float, now: float) -> float:
+        """Volume with the breathing modulation applied"""
+        t = (now - sound_info['breath_origin']) * self.breath_speed
+        current_volume = volume * (1 + self.breath_intensity * math.sin(t))
+        return max(0.0, min(1.0, current_volume))
+
     def stop_breathing(self, sound_path):
         """Stop breathing effect"""
         if sound_path not in self.playing_sounds:
@@ -296,12 +623,9 @@ class AudioPlayer:
             
         print("Stopping breathing effect")
         sound_info['breathing_active'] = False
-        if sound_info['breath_timer']:
-            sound_info['breath_timer'].cancel()
-            sound_info['breath_timer'] = None
             
         # Restore original volume
-        self._apply_volume_pan(sound_path, sound_info['volume'], sound_info['pan'])
+        self._apply_volume_pan(sound_path, sound_info['volume_ramp'].value, sound_info['pan'])
         if sound_info.get('gui_callback'):
             sound_info['gui_callback'](sound_info['volume'])
             
@@ -328,7 +652,183 @@ class AudioPlayer:
             if sound_info.get('channel') and sound_info['channel'].get_busy():
                 self._apply_volume_pan(sound_path, balanced_volume, sound_info['pan'])
 
-    def start_random_pan(self, sound_path):
+    @property
+    def profiles(self):
+        """Band profile cache (ProfileCache), opened on first use"""
+        if self._profiles is None:
+            from spectral_profile import ProfileCache
+            self._profiles = ProfileCache(self.profiles_file)
+        return self._profiles
+
+    @profiles.setter
+    def profiles(self, cache):
+        self._profiles = cache
+
+    def set_smart_mixing(self, enabled: bool = True):
+        """Turn masking-aware rebalancing on or off (off restores plain volumes)"""
+        self.smart_mixing = enabled
+        self._smart_pending = True
+        self._ensure_control_loop()
+
+    def _mix_changed(self):
+        """Recompute smart mixing on the next control tick"""
+        if self.smart_mixing:
+            self._smart_pending = True
+
+    def _apply_smart_mixing(self):
+        """Trim and tilt sounds that mask each other, from cached band profiles
+
+        Runs only when the active set or a volume changes. Sounds without a
+        profile yet are analysed in the background and the mix is
+        recomputed once they are ready.
+        """
+        active, bands, levels, missing = [], [], [], []
+        for sound_path, sound_info in self.playing_sounds.items():
+            channel = sound_info.get('channel')
+            if not self.smart_mixing or not channel or not channel.get_busy() or sound_info.get('paused'):
+                continue
+            profile_path = sound_info['profile_path'] or sound_path
+            profile = self.profiles.get(profile_path)
+            if profile is None:
+                missing.append(profile_path)
+                continue
+            active.append(sound_path)
+            bands.append(profile['bands'])
+            levels.append(profile['rms'] * sound_info['volume'])
+
+        corrections = {}
+        if len(active) > 1:
+            from spectral_profile import smart_corrections
+            gain_db, tilt_db = smart_corrections(bands, levels, self.smart_max_cut_db, self.smart_max_tilt_db)
+            corrections = {path: (float(gain), float(tilt)) for path, gain, tilt in zip(active, gain_db, tilt_db)}
+
+        for sound_path, sound_info in self.playing_sounds.items():
+            gain_db, tilt_db = corrections.get(sound_path, (0.0, 0.0))
+            gain = 10.0 ** (gain_db / 20.0)
+            # An unchanged trim would still re-apply the sound on the next tick
+            if gain != sound_info['smart_ramp'].target:
+                sound_info['smart_ramp'].set_target(gain, self.fade_time)
+            self._set_smart_tilt(sound_path, sound_info, tilt_db)
+
+        if missing:
+            self.prepare_profiles(missing)
+
+    def prepare_profiles(self, sound_paths: List[str], on_ready: Optional[Callable[[], None]] = None):
+        """Analyse sounds for smart mixing on a background thread, then call on_ready"""
+        self.profiles.prepare_in_background(sound_paths, lambda: self._profiles_ready(on_ready))
+
+    def _profiles_ready(self, on_ready: Optional[Callable[[], None]] = None):
+        """Background analysis finished: rebalance with the new profiles"""
+        if on_ready:
+            on_ready()
+        if self.playing_sounds:
+            self._mix_changed()
+            self._ensure_control_loop()
+
+    def _set_smart_tilt(self, sound_path: str, sound_info: dict, tilt_db: float):
+        """Shelve off the highs (positive) or lows (negative) of a sound"""
+        if abs(tilt_db) < 0.5:
+            # Not worth a filter; flatten the shelves if they were added
+            if sound_info['filters'] is None or sound_info['filters'].get_band('smart_high') is None:
+                return
+            tilt_db = 0.0
+        elif not self.backend.supports_filters:
+            return
+        filters = self._filters(sound_path)
+        filters.set_band('smart_low', 'lowshelf', 250.0, min(tilt_db, 0.0))
+        filters.set_band('smart_high', 'highshelf', 4000.0, min(-tilt_db, 0.0))
+
+    def _ensure_control_loop(self):
+        """Start the shared control tick if it is not running"""
+        if not self.backend.ticker_running():
+            self.backend.start_ticker(self.control_interval, self.control_tick)
+
+    def set_control_interval(self, interval: float):
+        """Change the control tick rate, restarting a running tick"""
+        if interval == self.control_interval:
+            return
+        self.control_interval = interval
+        if self.backend.ticker_running():
+            self.backend.stop_ticker()
+            self.backend.start_ticker(interval, self.control_tick)
+
+    def add_tick_hook(self, hook: Callable[[float], None]):
+        """Run hook(now) at the start of every control tick"""
+        self.tick_hooks.append(hook)
+        self._ensure_control_loop()
+
+    def remove_tick_hook(self, hook: Callable[[float], None]):
+        """Stop calling a tick hook"""
+        if hook in self.tick_hooks:
+            self.tick_hooks.remove(hook)
+
+    def control_tick(self, now: Optional[float] = None):
+        """Advance all control-rate effects by one tick"""
+        if now is None:
+            now = self.backend.now()
+        dt = 0.0 if self._last_tick is None else max(0.0, now - self._last_tick)
+        self._last_tick = now
+        # GUI callbacks can run less often than the effects they show
+        self._gui_due = self._last_gui is None or now - self._last_gui >= self.gui_interval - self.control_interval / 2
+        if self._gui_due:
+            self._last_gui = now
+
+        # Inputs first, so their changes are applied within this tick
+        for hook in list(self.tick_hooks):
+            try:
+                hook(now)
+            except Exception as e:
+                print(f"Error in control tick hook: {e}")
+
+        self.update_random_pan(now)
+
+        callbacks = []
+        for sound_path, sound_info in list(self.playing_sounds.items()):
+            volume_ramp = sound_info['volume_ramp']
+            pan_ramp = sound_info['pan_ramp']
+            volume_changed = volume_ramp.advance(dt)
+            pan_changed = pan_ramp.advance(dt)
+            smart_changed = sound_info['smart_ramp'].advance(dt)
+
+            # Apply each sound at most once per tick
+            breathing = sound_info['breathing_active']
+            if volume_changed or pan_changed or smart_changed or breathing:
+                volume = volume_ramp.value
+                if breathing:
+                    volume = self._breath_volume(sound_info, volume, now)
+                sound_info['pan'] = pan_ramp.value
+                self._apply_volume_pan(sound_path, volume, pan_ramp.value)
+                # Re-applying wrote the unbalanced volume; balance again
+                if (volume_changed or pan_changed or smart_changed) and self.auto_balance:
+                    self._balance_pending = True
+                if breathing and self._gui_due and sound_info.get('gui_callback'):
+                    sound_info['gui_callback'](volume)
+
+            if sound_info['sweep_active']:
+                # The chain smooths between ticks, so this is click free
+                sound_info['filters'].set_band('lowpass', 'lowpass', self._sweep_cutoff(sound_info, now))
+
+            for ramp in (volume_ramp, pan_ramp):
+                callback = ramp.pop_callback()
+                if callback:
+                    callbacks.append(callback)
+
+        if self._balance_pending:
+            self._balance_pending = False
+            if self.auto_balance:
+                self._apply_auto_balance()
+
+        if self._smart_pending:
+            self._smart_pending = False
+            self._apply_smart_mixing()
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in ramp callback: {e}")
+
+    def start_random_pan(self, sound_path, seed: Optional[int] = None):
         """Start random panning"""
         if sound_path not in self.playing_sounds:
             print("Sound not found for random pan")
@@ -344,28 +844,18 @@ class AudioPlayer:
             return True
             
         print("Starting random pan effect")
+        # Cancel a manual pan fade so it does not fight the trajectory
+        sound_info['pan_ramp'].cancel()
+
+        trajectory = RandomPanTrajectory(
+            pan_range=self.random_pan_range,
+            speed=self.random_pan_speed,
+            seed=seed if seed is not None else self.random_pan_seed
+        )
+        trajectory.start(self.backend.now(), sound_info['pan'])
+        sound_info['pan_trajectory'] = trajectory
         sound_info['random_pan_active'] = True
-        
-        def pan_cycle():
-            if not sound_info['random_pan_active'] or sound_path not in self.playing_sounds:
-                return
-                
-            target_pan = random.uniform(-0.8, 0.8)
-            current_pan = sound_info['pan']
-            print(f"Pan transition: {current_pan:.2f} -> {target_pan:.2f}")
-            
-            self.fade_pan(sound_path, current_pan, target_pan, schedule_next_pan)
-            if sound_info.get('pan_callback'):
-                sound_info['pan_callback'](target_pan)
-        
-        def schedule_next_pan():
-            if sound_info['random_pan_active'] and sound_path in self.playing_sounds:
-                interval = random.uniform(2.0, 5.0)
-                sound_info['pan_timer'] = threading.Timer(interval, pan_cycle)
-                sound_info['pan_timer'].start()
-                print(f"Next pan scheduled in {interval:.1f} seconds")
-            
-        pan_cycle()
+        self._ensure_control_loop()
         return True
 
     def stop_random_pan(self, sound_path):
@@ -381,46 +871,35 @@ class AudioPlayer:
             
         print("Stopping random pan effect")
         sound_info['random_pan_active'] = False
-        if sound_info['pan_timer']:
-            sound_info['pan_timer'].cancel()
-            sound_info['pan_timer'] = None
+        sound_info['pan_trajectory'] = None
             
         # Reset pan to center
-        self._apply_volume_pan(sound_path, sound_info['volume'], 0.0)
+        sound_info['pan_ramp'].jump(0.0)
+        self._apply_volume_pan(sound_path, sound_info['volume_ramp'].value, 0.0)
         sound_info['pan'] = 0.0
         if sound_info.get('pan_callback'):
             sound_info['pan_callback'](0.0)
             
         return True
 
-    def update_random_pan(self):
+    def update_random_pan(self, now: Optional[float] = None):
         """Update random pan effect"""
         try:
-            for sound_path, sound_info in self.playing_sounds.items():
-                if sound_info.get('random_pan_active', False):
-                    current_pan = sound_info.get('pan', 0)
-                    
-                    # Generate smoother pan transition
-                    # Max step is 10% of the remaining distance to target
-                    max_step = 0.1
-                    
-                    # If we don't have a target or reached it, generate new target
-                    if 'pan_target' not in sound_info or abs(current_pan - sound_info['pan_target']) < 0.01:
-                        # Generate new target between -0.8 and 0.8 (80%)
-                        sound_info['pan_target'] = random.uniform(-0.8, 0.8)
-                    
-                    # Calculate step towards target
-                    target = sound_info['pan_target']
-                    distance = target - current_pan
-                    step = max(min(distance * 0.1, max_step), -max_step)
-                    
-                    # Apply the pan change
-                    new_pan = current_pan + step
-                    self.set_pan(sound_path, new_pan)
-                    
-                    # Update GUI if callback exists
-                    if 'pan_callback' in sound_info and sound_info['pan_callback']:
-                        sound_info['pan_callback'](new_pan)
+            if now is None:
+                now = self.backend.now()
+            for sound_path, sound_info in list(self.playing_sounds.items()):
+                trajectory = sound_info.get('pan_trajectory')
+                if not sound_info.get('random_pan_active', False) or trajectory is None:
+                    continue
+
+                # Evaluate the precomputed path, the tick applies it
+                new_pan = trajectory.value_at(now)
+                sound_info['pan'] = new_pan
+                sound_info['pan_ramp'].jump(new_pan)
+
+                # Update GUI if callback exists
+                if self._gui_due and sound_info.get('pan_callback'):
+                    sound_info['pan_callback'](new_pan)
                         
         except Exception as e:
             print(f"Error in update_random_pan: {e}")
@@ -428,15 +907,21 @@ class AudioPlayer:
     def cleanup(self):
         """Clean up resources"""
         try:
+            # Stop the control tick
+            self.backend.stop_ticker()
+
             # Stop all sounds and cancel all timers
             for sound_path, sound_info in list(self.playing_sounds.items()):
                 self.stop_sound(sound_path)
             
-            # Clear the dictionary
+            # Clear the dictionary and free decoded audio
             self.playing_sounds.clear()
+            self.sound_cache.clear()
             
-            # Quit pygame mixer
-            pygame.mixer.quit()
+            # Close the output
+            if self.mixer_ready:
+                self.backend.quit()
+                self.mixer_ready = False
             
         except Exception as e:
             print(f"Error during cleanup: {e}")
@@ -0,0 +1,195 @@
+import numpy as np
+
+# Level floor for silent frames
+SILENCE_DB = -120.0
+
+
+def to_db(level: np.ndarray) -> np.ndarray:
+    """Linear amplitude to dB, floored at SILENCE_DB"""
+    return 20.0 * np.log10(np.maximum(level, 10.0 ** (SILENCE_DB / 20.0)))
+
+
+def release_envelope(level_db: np.ndarray, step: float, state: float):
+    """Peak follower: instant attack, release of step dB per frame
+
+    env[n] = max(level[n], env[n-1] - step) unrolls to a running maximum
+    of level[k] + k * step minus n * step, so a whole block is one
+    np.maximum.accumulate. Returns the envelope and the new state.
+    """
+    ramp = np.arange(level_db.shape[0], dtype=np.float64) * step
+    env = np.maximum.accumulate(level_db + ramp)
+    np.maximum(env, state - step, out=env)
+    env -= ramp
+    return env, float(env[-1])
+
+
+def sliding_max(values: np.ndarray, width: int) -> np.ndarray:
+    """Maximum of every window of width values (van Herk/Gil-Werman)"""
+    count = values.shape[0] - width + 1
+    pad = -values.shape[0] % width
+    segments = np.concatenate([values, np.full(pad, -np.inf)]).reshape(-1, width)
+    forward = np.maximum.accumulate(segments, axis=1).ravel()
+    backward = np.maximum.accumulate(segments[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(backward[:count], forward[width - 1:width - 1 + count])
+
+
+class BoxSmoother:
+    """Moving average over width frames, continuous across blocks"""
+
+    def __init__(self, width: int):
+        self.width = max(1, width)
+        self.history = np.zeros(self.width - 1)
+
+    def process(self, values: np.ndarray) -> np.ndarray:
+        if self.width == 1:
+            return values
+        joined = np.concatenate([self.history, values])
+        self.history = joined[-(self.width - 1):]
+        sums = np.cumsum(joined)
+        sums[self.width:] -= sums[:-self.width]
+        return sums[self.width - 1:] / self.width
+
+    def reset(self):
+        self.history.fill(0.0)
+
+
+class Compressor:
+    """Feed-forward peak compressor
+
+    Level is followed with an instant attack and a dB-linear release; the
+    gain reduction is then smoothed over attack_ms, which gives a linear
+    attack without a per-sample loop.
+    """
+
+    def __init__(self, sample_rate: int = 44100, threshold_db: float = -18.0, ratio: float = 3.0,
+                 attack_ms: float = 10.0, release_rate: float = 60.0, makeup_db: float = 0.0):
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.ratio = ratio
+        self.makeup_db = makeup_db
+        # Release in dB per second
+        self.release_step = release_rate / sample_rate
+        self.attack = BoxSmoother(int(attack_ms * sample_rate / 1000))
+        self.state = SILENCE_DB
+        self.enabled = True
+        self.reduction_db = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Compress a (frames, channels) block"""
+        if not self.enabled:
+            return block
+        level = to_db(np.max(np.abs(block), axis=1))
+        env, self.state = release_envelope(level, self.release_step, self.state)
+        reduction = self.attack.process(np.maximum(env - self.threshold_db, 0.0) * (1.0 - 1.0 / self.ratio))
+        self.reduction_db = float(reduction.max())
+        gain = 10.0 ** ((self.makeup_db - reduction) / 20.0)
+        return block * gain[:, None].astype(np.float32)
+
+
+class Limiter:
+    """Look-ahead brickwall limiter
+
+    The signal is delayed by lookahead_ms. Required gain reduction is held
+    over the look-ahead window (sliding maximum), released at release_rate
+    dB/s and averaged over the same window, so reduction ramps in before a
+    peak arrives and the output never exceeds ceiling_db.
+    """
+
+    def __init__(self, channels: int = 2, sample_rate: int = 44100, ceiling_db: float = -1.0,
+                 lookahead_ms: float = 5.0, release_rate: float = 40.0):
+        self.sample_rate = sample_rate
+        self.ceiling_db = ceiling_db
+        self.lookahead = max(1, int(lookahead_ms * sample_rate / 1000))
+        self.release_step = release_rate / sample_rate
+        self.delay = np.zeros((self.lookahead, channels), dtype=np.float32)
+        self.history = np.zeros(self.lookahead)
+        self.smoother = BoxSmoother(self.lookahead + 1)
+        self.state = 0.0
+        self.enabled = True
+        self.reduction_db = 0.0
+
+    @property
+    def latency(self) -> float:
+        """Seconds of delay added by the look-ahead"""
+        return self.lookahead / self.sample_rate
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Limit a (frames, channels) block"""
+        if not self.enabled:
+            return block
+        frames = block.shape[0]
+        required = np.maximum(to_db(np.max(np.abs(block), axis=1)) - self.ceiling_db, 0.0)
+        joined = np.concatenate([self.history, required])
+        self.history = joined[-self.lookahead:]
+        held = sliding_max(joined, self.lookahead + 1)
+        released, self.state = release_envelope(held, self.release_step, self.state)
+        reduction = self.smoother.process(released)
+        self.reduction_db = float(reduction.max())
+
+        # Output is the input from lookahead frames ago
+        audio = np.concatenate([self.delay, block])
+        self.delay = audio[frames:]
+        gain = 10.0 ** (-reduction / 20.0)
+        return audio[:frames] * gain[:, None].astype(np.float32)
+
+
+class Ducker:
+    """Sidechain ducking: lowers the mix while key voices are loud
+
+    Reduction grows from 0 at threshold_db to depth_db at threshold_db +
+    range_db of key level, ramps in over attack_ms and recovers at
+    release_rate dB/s once the key goes quiet.
+    """
+
+    def __init__(self, sample_rate: int = 44100, threshold_db: float = -40.0, depth_db: float = 12.0,
+                 range_db: float = 6.0, attack_ms: float = 20.0, release_rate: float = 30.0):
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.depth_db = depth_db
+        self.range_db = range_db
+        self.release_step = release_rate / sample_rate
+        self.attack = BoxSmoother(int(attack_ms * sample_rate / 1000))
+        self.state = SILENCE_DB
+        self.enabled = True
+        self.reduction_db = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Still reducing (the mix must keep being ducked while it recovers)"""
+        return self.reduction_db > 0.01
+
+    def gain(self, key_level: np.ndarray) -> np.ndarray:
+        """Per-frame gain for the ducked voices from the key's peak level"""
+        env, self.state = release_envelope(to_db(key_level), self.release_step, self.state)
+        reduction = self.depth_db * np.clip((env - self.threshold_db) / self.range_db, 0.0, 1.0)
+        reduction = self.attack.process(reduction)
+        self.reduction_db = float(reduction.max())
+        return (10.0 ** (-reduction / 20.0)).astype(np.float32)
+
+
+class MasterDynamics:
+    """Master-bus stage: compressor then limiter, plus the engine's ducker
+
+    The limiter is on by default so stacked loops never clip; compression
+    and ducking are opt-in.
+    """
+
+    def __init__(self, channels: int = 2, sample_rate: int = 44100):
+        self.compressor = Compressor(sample_rate)
+        self.compressor.enabled = False
+        self.limiter = Limiter(channels, sample_rate)
+        self.ducker = Ducker(sample_rate)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Process a (frames, channels) block"""
+        block = self.compressor.process(block)
+        return self.limiter.process(block)
+
+    def stats(self) -> dict:
+        """Current gain reduction of each stage in dB"""
+        return {
+            'compressor_db': self.compressor.reduction_db if self.compressor.enabled else 0.0,
+            'limiter_db': self.limiter.reduction_db if self.limiter.enabled else 0.0,
+            'ducking_db': self.ducker.reduction_db,
+        }
+
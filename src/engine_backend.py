@@ -0,0 +1,339 @@
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from dynamics import MasterDynamics
+from mix_engine import LoopSource, MixEngine
+from mixer_backend import PygameBackend, WallClockBackend
+from output_sinks import NullSink, PortAudioSink, PygameStreamSink, WavFileSink
+from recorder import Recorder
+from reverb import ConvolutionReverb
+from sample_store import SampleStore
+
+# Output sinks selectable by name ('native' is the plain PygameBackend)
+OUTPUT_SINKS = ('pygame', 'portaudio', 'wav', 'null')
+
+
+class EngineSound:
+    """Decoded sound for the software mixer (int16, native channel count)"""
+
+    def __init__(self, sound_path: str, samples: np.ndarray, sample_rate: int):
+        self.sound_path = sound_path
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.volume = 1.0
+
+    def set_volume(self, volume: float):
+        self.volume = volume
+
+    def get_length(self) -> float:
+        return self.samples.shape[0] / self.sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    def make_source(self) -> LoopSource:
+        return LoopSource(self.samples)
+
+
+class SourceSound:
+    """Generated sound for the software mixer, streamed from a source object"""
+
+    def __init__(self, name: str, source):
+        self.sound_path = name
+        self.source = source
+        self.volume = 1.0
+
+    def set_volume(self, volume: float):
+        self.volume = volume
+
+    def get_length(self) -> float:
+        return float('inf')
+
+    @property
+    def nbytes(self) -> int:
+        return getattr(self.source, 'nbytes', 0)
+
+    def make_source(self):
+        # The source keeps its state, so a replayed sound continues the stream
+        return self.source
+
+
+class EngineChannel:
+    """pygame.mixer.Channel look-alike backed by a MixEngine voice
+
+    set_volume(left, right) receives equal-power gains from AudioPlayer;
+    they are turned back into a gain and an x position for the engine's
+    panner, so the same player code drives stereo and surround layouts.
+    """
+
+    def __init__(self, engine: MixEngine, index: int):
+        self.engine = engine
+        self.name = f"channel-{index}"
+        self.busy = False
+        self.paused = False
+        self.gain = 1.0
+        self.x = 0.0
+        self.y = 0.0
+        self.key = False
+        self.filters = None
+
+    def play(self, sound, loops: int = -1):
+        self.engine.add_voice(self.name, sound.make_source(), self.gain * sound.volume, self.x, self.y,
+                              self.key, self.filters)
+        self.busy = True
+        self.paused = False
+
+    def pause(self):
+        self.engine.set_paused(self.name, True)
+        self.paused = True
+
+    def unpause(self):
+        self.engine.set_paused(self.name, False)
+        self.paused = False
+
+    def stop(self):
+        self.engine.remove_voice(self.name)
+        self.busy = False
+        self.paused = False
+        self.key = False
+        self.filters = None
+
+    def set_volume(self, left: float, right: Optional[float] = None):
+        if right is None:
+            right = left
+        self.gain = math.hypot(left, right)
+        if self.gain > 0:
+            # Invert the equal-power law: angle 0..pi/2 maps to pan -1..1
+            self.x = math.atan2(right, left) * 4 / math.pi - 1.0
+        self.engine.set_gain(self.name, self.gain)
+        self.engine.set_position(self.name, self.x, self.y)
+
+    def set_depth(self, y: float):
+        """Front/back position for surround layouts (-1 back, 1 front)"""
+        self.y = y
+        self.engine.set_position(self.name, self.x, y)
+
+    def set_key(self, key: bool):
+        """Use this channel as the sidechain key that ducks the others"""
+        self.key = key
+        self.engine.set_key(self.name, key)
+
+    def set_filters(self, filters):
+        """Filter this channel's sound through an eq.FilterChain (None to bypass)"""
+        self.filters = filters
+        self.engine.set_filters(self.name, filters)
+
+    def get_volume(self) -> float:
+        return self.gain
+
+    def get_busy(self) -> bool:
+        return self.busy
+
+
+class OutputDriver:
+    """Render thread feeding a push sink
+
+    Sinks that do not pace themselves (WAV, null) are paced against the
+    monotonic clock; a block rendered after its deadline counts as an
+    underrun. Callback sinks (PortAudio) pull blocks instead. Taps (such
+    as a Recorder) see every block on the render thread and must not block.
+    """
+
+    def __init__(self, engine: MixEngine, sink, realtime: bool = True):
+        self.engine = engine
+        self.sink = sink
+        self.realtime = realtime
+        self.blocks = 0
+        self.late_blocks = 0
+        self.worst_render = 0.0
+        self.taps: List[Callable[[np.ndarray], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def render(self) -> np.ndarray:
+        """Render one block and track render time"""
+        start = time.perf_counter()
+        block = self.engine.render_block()
+        elapsed = time.perf_counter() - start
+        self.blocks += 1
+        if elapsed > self.worst_render:
+            self.worst_render = elapsed
+        for tap in self.taps:
+            tap(block)
+        return block
+
+    def start(self):
+        """Start rendering"""
+        if hasattr(self.sink, 'start'):
+            self.sink.start(self.render)
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Push loop for write()-style sinks"""
+        period = self.engine.block_size / self.engine.sample_rate
+        deadline = time.monotonic() + period
+        while not self._stop.is_set():
+            self.sink.write(self.render())
+            if getattr(self.sink, 'paced', False) or not self.realtime:
+                continue
+            now = time.monotonic()
+            if now > deadline:
+                # The block was due before it was ready
+                self.late_blocks += 1
+                deadline = now
+            self._stop.wait(max(0.0, deadline - now))
+            deadline += period
+
+    @property
+    def underruns(self) -> int:
+        """Underruns reported by the sink plus blocks that missed their deadline"""
+        return getattr(self.sink, 'underruns', 0) + self.late_blocks
+
+    def stop(self):
+        """Stop rendering and close the sink"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.sink.close()
+
+
+class EngineBackend(WallClockBackend):
+    """Software-mixed output (MixEngine) routed to a selectable sink"""
+
+    # Voices are mixed here, so each can be filtered
+    supports_filters = True
+
+    def __init__(self, sink: str = 'pygame', layout: str = 'stereo',
+                 file_path: Optional[str] = None, device=None, realtime: bool = True):
+        super().__init__()
+        if sink not in OUTPUT_SINKS:
+            raise ValueError(f"Unknown output sink: {sink} (choose from {', '.join(OUTPUT_SINKS)})")
+        if sink == 'wav' and not file_path:
+            raise ValueError("The WAV sink needs a file path")
+
+        self.sink_name = sink
+        self.layout = layout
+        self.file_path = file_path
+        self.device = device
+        self.realtime = realtime
+        self.engine: Optional[MixEngine] = None
+        self.store: Optional[SampleStore] = None
+        self.driver: Optional[OutputDriver] = None
+        self.channels: List[EngineChannel] = []
+        self.recorder: Optional[Recorder] = None
+        self.dynamics: Optional[MasterDynamics] = None
+
+    def _create_sink(self, channels: int, sample_rate: int, buffer_size: int):
+        """Instantiate the selected sink"""
+        if self.sink_name == 'pygame':
+            return PygameStreamSink(channels, sample_rate, buffer_size)
+        if self.sink_name == 'portaudio':
+            return PortAudioSink(channels, sample_rate, buffer_size, self.device)
+        if self.sink_name == 'wav':
+            return WavFileSink(self.file_path, channels, sample_rate)
+        return NullSink(channels, sample_rate)
+
+    def init(self, frequency: int, buffer_size: int, num_channels: int):
+        """Create the engine and start feeding the sink"""
+        self.engine = MixEngine(self.layout, frequency, buffer_size)
+        # Limiter on the summed output, ducker between key and other voices
+        self.dynamics = MasterDynamics(self.engine.channels, frequency)
+        self.engine.master_bus.append(self.dynamics)
+        self.engine.ducker = self.dynamics.ducker
+        self.store = SampleStore(frequency)
+        self.channels = [EngineChannel(self.engine, i) for i in range(num_channels)]
+        sink = self._create_sink(self.engine.channels, frequency, buffer_size)
+        self.driver = OutputDriver(self.engine, sink, self.realtime)
+        self.driver.start()
+
+    def quit(self):
+        """Stop rendering and close the sink"""
+        self.stop_ticker()
+        if self.driver is not None:
+            stats = self.output_stats()
+            if stats and stats['underruns']:
+                print(f"Output underruns: {stats['underruns']} of {stats['blocks']} blocks")
+            self.driver.stop()
+            self.driver = None
+        self.stop_recording()
+
+    def load_sound(self, sound_path: str) -> EngineSound:
+        """Decode a WAV file at the engine sample rate"""
+        return EngineSound(sound_path, self.store.load(sound_path), self.store.sample_rate)
+
+    def create_sound(self, name: str, source) -> SourceSound:
+        """Wrap a generated source so it plays like a loaded sound"""
+        return SourceSound(name, source)
+
+    def sound_bytes(self, sound) -> int:
+        """Bytes of sample data held for a sound"""
+        return sound.nbytes
+
+    def find_channel(self) -> Optional[EngineChannel]:
+        """Return an idle engine channel"""
+        for channel in self.channels:
+            if not channel.busy:
+                return channel
+        return None
+
+    def start_recording(self, file_path: str) -> Recorder:
+        """Record the final mix to a WAV or FLAC file"""
+        if self.driver is None:
+            raise RuntimeError("The output is not running")
+        self.stop_recording()
+        recorder = Recorder(file_path, self.engine.channels, self.engine.sample_rate)
+        recorder.start()
+        self.recorder = recorder
+        self.driver.taps.append(recorder.push)
+        return recorder
+
+    def stop_recording(self) -> Optional[dict]:
+        """Finish the recording and return its stats"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return None
+        if self.driver is not None and recorder.push in self.driver.taps:
+            self.driver.taps.remove(recorder.push)
+        return recorder.stop()
+
+    def set_reverb(self, ir_path: Optional[str], wet: float = 0.25):
+        """Convolve the mix with an impulse response ahead of the dynamics, None removes it"""
+        stages = [stage for stage in self.engine.master_bus if not isinstance(stage, ConvolutionReverb)]
+        if ir_path is not None:
+            reverb = ConvolutionReverb.from_file(ir_path, self.engine.channels, self.engine.block_size,
+                                                 self.engine.sample_rate, wet=wet)
+            # The limiter has to see the reverb tail too
+            position = stages.index(self.dynamics) if self.dynamics in stages else len(stages)
+            stages.insert(position, reverb)
+        # Swapped in one assignment; a block being rendered finishes on the old list
+        self.engine.master_bus = stages
+
+    def master_dynamics(self) -> Optional[MasterDynamics]:
+        """Compressor, limiter and ducker of the master bus"""
+        return self.dynamics
+
+    def output_stats(self) -> Optional[dict]:
+        """Sink name, rendered blocks, underruns, worst render time and gain reduction"""
+        if self.driver is None:
+            return None
+        return {
+            'sink': self.sink_name,
+            'blocks': self.driver.blocks,
+            'underruns': self.driver.underruns,
+            'worst_render_ms': self.driver.worst_render * 1000,
+            **self.dynamics.stats(),
+        }
+
+
+def create_backend(output: str = 'native', **kwargs):
+    """Build a backend for an output name ('native' or one of OUTPUT_SINKS)"""
+    if output == 'native':
+        return PygameBackend()
+    return EngineBackend(output, **kwargs)
@@ -0,0 +1,311 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# RBJ cookbook filter types
+FILTER_TYPES = ('lowpass', 'highpass', 'lowshelf', 'highshelf', 'peaking')
+# Sub-block length of the closed-form block filter
+SUB_BLOCK = 64
+# Time constant of parameter smoothing in seconds
+SMOOTHING = 0.05
+# Smallest parameter change worth new coefficients while moving (octaves, dB)
+STEP_OCTAVES = 1.0 / 48.0
+STEP_DB = 0.1
+
+TONE_MIN_LOWPASS = 200.0
+TONE_MAX_HIGHPASS = 3000.0
+
+
+def biquad_coefficients(kind: str, freq: float, sample_rate: int, gain_db: float = 0.0,
+                        q: float = 0.707) -> Tuple[float, float, float, float, float]:
+    """Normalized (b0, b1, b2, a1, a2) of an RBJ cookbook biquad"""
+    if kind not in FILTER_TYPES:
+        raise ValueError(f"Unknown filter type: {kind}")
+    freq = min(max(freq, 10.0), sample_rate * 0.49)
+    w0 = 2.0 * math.pi * freq / sample_rate
+    cos_w0 = math.cos(w0)
+    alpha = math.sin(w0) / (2.0 * max(q, 0.05))
+    a = 10.0 ** (gain_db / 40.0)
+
+    if kind == 'lowpass':
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+        den = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    elif kind == 'highpass':
+        b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+        den = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    elif kind == 'peaking':
+        b = (1 + alpha * a, -2 * cos_w0, 1 - alpha * a)
+        den = (1 + alpha / a, -2 * cos_w0, 1 - alpha / a)
+    else:
+        root = 2 * math.sqrt(a) * alpha
+        sign = 1 if kind == 'lowshelf' else -1
+        b = (a * ((a + 1) - sign * (a - 1) * cos_w0 + root),
+             sign * 2 * a * ((a - 1) - sign * (a + 1) * cos_w0),
+             a * ((a + 1) - sign * (a - 1) * cos_w0 - root))
+        den = ((a + 1) + sign * (a - 1) * cos_w0 + root,
+               -sign * 2 * ((a - 1) + sign * (a + 1) * cos_w0),
+               (a + 1) + sign * (a - 1) * cos_w0 - root)
+    return b[0] / den[0], b[1] / den[0], b[2] / den[0], den[1] / den[0], den[2] / den[0]
+
+
+def cascade_state_space(sections: List[Tuple[float, ...]]):
+    """(A, B, C, D) of biquads in series, each in transposed direct form II"""
+    A = np.zeros((0, 0))
+    B = np.zeros(0)
+    C = np.zeros(0)
+    D = 1.0
+    for b0, b1, b2, a1, a2 in sections:
+        # One section: y = b0 x + s1; s1' = b1 x - a1 y + s2; s2' = b2 x - a2 y
+        As = np.array([[-a1, 1.0], [-a2, 0.0]])
+        Bs = np.array([b1 - a1 * b0, b2 - a2 * b0])
+        Cs = np.array([1.0, 0.0])
+        size = A.shape[0]
+        # Section input is the previous output C s + D x
+        A_new = np.zeros((size + 2, size + 2))
+        A_new[:size, :size] = A
+        A_new[size:, :size] = np.outer(Bs, C)
+        A_new[size:, size:] = As
+        B = np.concatenate([B, Bs * D])
+        C = np.concatenate([b0 * C, Cs])
+        D = b0 * D
+        A = A_new
+    return A, B, C, D
+
+
+class BlockFilter:
+    """Linear filter run a sub-block at a time in closed form
+
+    With the state-space form (A, B, C, D) of the whole cascade, every
+    sub-block of L frames is y = O s + T x and s' = P s + K x, where T is
+    the Toeplitz matrix of the first L impulse response samples. A block
+    is then two batched matmuls plus a scan over the few sub-block
+    boundaries, instead of a per-sample loop per section.
+    """
+
+    def __init__(self, sub_block: int = SUB_BLOCK):
+        self.sub_block = sub_block
+        self.system = None
+        self.matrices: Dict[int, tuple] = {}
+        self.state: Optional[np.ndarray] = None
+
+    def set_system(self, A: np.ndarray, B: np.ndarray, C: np.ndarray, D: float,
+                   state: Optional[np.ndarray] = None):
+        """Install new coefficients, keeping the state when the order matches
+
+        A state given here (order, channels) replaces the current one.
+        """
+        if state is not None:
+            self.state = state
+        elif self.state is not None and self.state.shape[0] != A.shape[0]:
+            self.state = None
+        self.system = (A, B, C, D)
+        self.matrices = {}
+
+    def _matrices(self, length: int) -> tuple:
+        """(T, O, K, P) for sub-blocks of length frames"""
+        matrices = self.matrices.get(length)
+        if matrices is not None:
+            return matrices
+        A, B, C, D = self.system
+        order = A.shape[0]
+        # A^0 .. A^length by doubling
+        powers = np.empty((length + 1, order, order))
+        powers[0] = np.eye(order)
+        count = 1
+        while count <= length:
+            step = powers[count - 1] @ A
+            n = min(count, length + 1 - count)
+            np.matmul(powers[:n], step, out=powers[count:count + n])
+            count += n
+
+        O = C @ powers[:length]
+        PB = powers[:length] @ B
+        # Impulse response h[0] = D, h[k] = C A^(k-1) B after length - 1 zeros
+        padded = np.zeros(2 * length - 1)
+        padded[length - 1] = D
+        padded[length:] = PB[:length - 1] @ C
+        # T[n, m] = h[n - m]
+        T = np.ascontiguousarray(sliding_window_view(padded, length)[:, ::-1])
+        K = PB[::-1].T
+        matrices = (T, O, K, powers[length])
+        self.matrices[length] = matrices
+        return matrices
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter a (frames,) or (frames, channels) block"""
+        if self.system is None:
+            return block
+        x = block if block.ndim == 2 else block[:, None]
+        frames, channels = x.shape
+        length = self.sub_block if frames % self.sub_block == 0 else frames
+        T, O, K, P = self._matrices(length)
+        order = P.shape[0]
+        if self.state is None or self.state.shape[1] != channels:
+            self.state = np.zeros((order, channels))
+
+        X = x.reshape(frames // length, length, channels)
+        Y = T @ X
+        KX = K @ X
+        states = np.empty((X.shape[0], order, channels))
+        state = self.state
+        for j in range(X.shape[0]):
+            states[j] = state
+            state = P @ state + KX[j]
+        self.state = state
+        Y += O @ states
+        out = Y.reshape(frames, channels).astype(np.float32)
+        return out if block.ndim == 2 else out[:, 0]
+
+
+class FilterChain:
+    """Per-sound EQ: named bands of RBJ biquads run as one cascade
+
+    set_band() only records a target. Each processed block moves the
+    current frequency, gain and Q part of the way there (log-frequency,
+    dB), so slider moves and slow sweeps are click free. The filter
+    matrices are rebuilt only once a parameter has moved by an audible
+    step (STEP_OCTAVES / STEP_DB) or settled on its target; a static EQ
+    costs no coefficient work at all.
+
+    Adding, removing or retyping a band changes the cascade's order. Bands
+    that stay keep their filter state, and the first block after the
+    change is crossfaded from the old cascade to the new one, so this is
+    click free too.
+    """
+
+    def __init__(self, sample_rate: int = 44100, smoothing: float = SMOOTHING):
+        self.sample_rate = sample_rate
+        self.smoothing = smoothing
+        # name -> {'type', 'target': [freq, gain_db, q], 'current': [...]}
+        self.bands: Dict[str, dict] = {}
+        self.filter = BlockFilter()
+        self.rebuilds = 0
+        self._layout: tuple = ()
+        # Parameters the current matrices were built from
+        self._built: list = []
+
+    def set_band(self, name: str, kind: Optional[str] = None, freq: Optional[float] = None,
+                 gain_db: Optional[float] = None, q: Optional[float] = None, smooth: bool = True):
+        """Add a band or retarget its parameters"""
+        band = self.bands.get(name)
+        if band is None:
+            if kind not in FILTER_TYPES:
+                raise ValueError(f"Unknown filter type: {kind}")
+            target = [freq or 1000.0, gain_db or 0.0, q or 0.707]
+            self.bands = {**self.bands, name: {'type': kind, 'target': target, 'current': list(target)}}
+            return
+        target = list(band['target'])
+        for index, value in enumerate((freq, gain_db, q)):
+            if value is not None:
+                target[index] = float(value)
+        band['target'] = target
+        if kind is not None and kind != band['type']:
+            band['type'] = kind
+            band['current'] = list(target)
+        elif not smooth:
+            band['current'] = list(target)
+
+    def remove_band(self, name: str):
+        """Drop a band"""
+        self.bands = {key: band for key, band in self.bands.items() if key != name}
+
+    def get_band(self, name: str) -> Optional[dict]:
+        """Target parameters of a band"""
+        band = self.bands.get(name)
+        if band is None:
+            return None
+        freq, gain_db, q = band['target']
+        return {'type': band['type'], 'freq': freq, 'gain_db': gain_db, 'q': q}
+
+    def _advance(self, seconds: float) -> bool:
+        """Move current parameters toward their targets, True if any moved"""
+        alpha = 1.0 - math.exp(-seconds / self.smoothing) if self.smoothing > 0 else 1.0
+        moved = False
+        for band in self.bands.values():
+            current, target = band['current'], band['target']
+            if current == target:
+                continue
+            moved = True
+            freq = current[0] * (target[0] / current[0]) ** alpha
+            gain = current[1] + (target[1] - current[1]) * alpha
+            q = current[2] * (target[2] / current[2]) ** alpha
+            # Snap once inaudibly close
+            if abs(math.log(target[0] / freq)) < 1e-3 and abs(target[1] - gain) < 0.01 \
+                    and abs(math.log(target[2] / q)) < 1e-3:
+                freq, gain, q = target
+            band['current'] = [freq, gain, q]
+        return moved
+
+    def _needs_rebuild(self) -> bool:
+        """Whether current parameters drifted far enough from the built ones"""
+        for band, built in zip(self.bands.values(), self._built):
+            current = band['current']
+            if current == built:
+                continue
+            if current == band['target']:
+                # Land exactly on the target once smoothing finishes
+                return True
+            if abs(math.log2(current[0] / built[0])) > STEP_OCTAVES \
+                    or abs(current[1] - built[1]) > STEP_DB \
+                    or abs(math.log2(current[2] / built[2])) > STEP_OCTAVES:
+                return True
+        return False
+
+    def _rebuild(self, state: Optional[np.ndarray] = None):
+        """Recompute the cascade from the current parameters"""
+        sections = []
+        for band in self.bands.values():
+            freq, gain_db, q = band['current']
+            sections.append(biquad_coefficients(band['type'], freq, self.sample_rate, gain_db, q))
+        self.filter.set_system(*cascade_state_space(sections), state=state)
+        self._built = [list(band['current']) for band in self.bands.values()]
+        self.rebuilds += 1
+
+    def _carried_state(self, layout: tuple) -> Optional[np.ndarray]:
+        """State of the new cascade with each surviving band's two values carried over"""
+        old = self.filter.state
+        if old is None:
+            return None
+        state = np.zeros((2 * len(layout), old.shape[1]))
+        rows = {band: 2 * index for index, band in enumerate(self._layout)}
+        for index, band in enumerate(layout):
+            row = rows.get(band)
+            if row is not None:
+                state[2 * index:2 * index + 2] = old[row:row + 2]
+        return state
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter a (frames,) or (frames, channels) block"""
+        if not self.bands and self.filter.system is None:
+            return block
+        layout = tuple((name, band['type']) for name, band in self.bands.items())
+        self._advance(block.shape[0] / self.sample_rate)
+        if layout == self._layout:
+            if self._needs_rebuild():
+                self._rebuild()
+            return self.filter.process(block)
+
+        # The cascade changes order: crossfade from the old one over this block
+        previous = self.filter
+        self.filter = BlockFilter(previous.sub_block)
+        if layout:
+            self._rebuild(self._carried_state(layout))
+        else:
+            self._built = []
+        self._layout = layout
+        old = previous.process(block)
+        new = self.filter.process(block)
+        fade = np.linspace(0.0, 1.0, block.shape[0], dtype=np.float32)
+        if block.ndim == 2:
+            fade = fade[:, None]
+        return (old + (new - old) * fade).astype(np.float32)
+
+
+def tone_bands(tone: float) -> Dict[str, float]:
+    """DJ-style tone control: -1 closes a low-pass down to 200 Hz, 1 opens a high-pass up to 3 kHz"""
+    tone = max(-1.0, min(1.0, tone))
+    lowpass = 20000.0 * (TONE_MIN_LOWPASS / 20000.0) ** max(0.0, -tone)
+    highpass = 20.0 * (TONE_MAX_HIGHPASS / 20.0) ** max(0.0, tone)
+    return {'lowpass': lowpass, 'highpass': highpass}
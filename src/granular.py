@@ -0,0 +1,151 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from sample_store import decode_int16
+
+# Envelope tables shared by all granular sources
+WINDOW_SIZE = 1024
+_window_tables: Dict[str, np.ndarray] = {}
+
+# Columns of the grain schedule; every block works on whole arrays of grains
+GRAIN_DTYPE = np.dtype([
+    ('onset', np.int64),     # absolute output frame of the first sample
+    ('length', np.int64),    # duration in frames
+    ('position', np.int64),  # read position in the source
+    ('envelope', np.int64),  # row of the window table
+    ('pan', np.float32),     # offset from the voice position
+])
+
+
+def window_table(name: str) -> np.ndarray:
+    """Precomputed grain envelope of WINDOW_SIZE points"""
+    table = _window_tables.get(name)
+    if table is not None:
+        return table
+
+    t = np.linspace(0.0, 1.0, WINDOW_SIZE, dtype=np.float64)
+    if name == 'hann':
+        table = 0.5 - 0.5 * np.cos(2 * np.pi * t)
+    elif name == 'tukey':
+        # Flat top with cosine edges over a quarter at each end
+        edge = np.minimum(t, 1.0 - t)
+        table = np.where(edge < 0.25, 0.5 - 0.5 * np.cos(np.pi * edge / 0.25), 1.0)
+    elif name == 'expodec':
+        # Short attack then exponential decay, good for droplets
+        table = np.exp(-5.0 * t) * np.minimum(1.0, t / 0.02)
+        table[-1] = 0.0
+    else:
+        raise ValueError(f"Unknown grain envelope: {name}")
+
+    table = table.astype(np.float32)
+    _window_tables[name] = table
+    return table
+
+
+class GranularSource:
+    """Endless texture built from randomized grains of a source asset
+
+    Grains (random read position, duration, envelope and pan) are drawn in
+    batches and rendered together as a (grains, frames) matrix, so the cost
+    per block grows with the number of overlapping grains but never loops
+    over grains in Python. Grains pan around the voice position, which makes
+    this a spatial source: it mixes itself into the output block.
+    """
+
+    # Renders into all output channels instead of a mono buffer
+    spatial = True
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = 44100, density: float = 200.0,
+                 grain_min: float = 0.04, grain_max: float = 0.25, spread: float = 0.6,
+                 envelopes: Sequence[str] = ('hann', 'tukey', 'expodec'),
+                 seed: Optional[int] = None, batch_seconds: float = 1.0):
+        samples = np.asarray(samples)
+        if samples.dtype != np.int16:
+            samples = samples.astype(np.float32, copy=False)
+        if samples.ndim == 2:
+            # Grains are positioned individually, so fold the source to mono
+            folded = samples.sum(axis=1, dtype=np.float32) / samples.shape[1]
+            samples = folded.astype(samples.dtype)
+        if samples.size == 0:
+            raise ValueError("Empty sample buffer")
+        self.samples = np.ascontiguousarray(samples)
+        self.scale = 1.0 / 32768.0 if samples.dtype == np.int16 else 1.0
+
+        self.sample_rate = sample_rate
+        self.density = density
+        self.grain_min = max(1, int(grain_min * sample_rate))
+        self.grain_max = max(self.grain_min + 1, int(grain_max * sample_rate))
+        self.spread = spread
+        self.windows = np.stack([window_table(name) for name in envelopes])
+        self.batch_frames = int(batch_seconds * sample_rate)
+        self.rng = np.random.default_rng(seed)
+
+        # Keep loudness steady whatever the overlap: uncorrelated grains add in power
+        overlap = density * (self.grain_min + self.grain_max) / 2 / sample_rate
+        self.level = self.scale / np.sqrt(max(1.0, overlap))
+
+        self.clock = 0
+        self.next_onset = 0.0
+        self.pending = np.zeros(0, dtype=GRAIN_DTYPE)
+        self.active = np.zeros(0, dtype=GRAIN_DTYPE)
+
+    @classmethod
+    def from_file(cls, file_path: str, sample_rate: int = 44100, **kwargs) -> 'GranularSource':
+        """Create a granular source from a WAV file"""
+        return cls(decode_int16(file_path, sample_rate), sample_rate, **kwargs)
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    def _schedule(self, until: int):
+        """Draw grain batches until the schedule reaches the given frame"""
+        while self.next_onset < until:
+            count = max(1, int(self.density * self.batch_frames / self.sample_rate))
+            # Poisson onsets: exponential gaps at the requested density
+            gaps = self.rng.exponential(self.sample_rate / self.density, count)
+            onsets = self.next_onset + np.cumsum(gaps)
+            self.next_onset = onsets[-1]
+
+            batch = np.empty(count, dtype=GRAIN_DTYPE)
+            batch['onset'] = onsets
+            batch['length'] = self.rng.integers(self.grain_min, self.grain_max, count)
+            batch['position'] = self.rng.integers(0, self.samples.shape[0], count)
+            batch['envelope'] = self.rng.integers(0, self.windows.shape[0], count)
+            batch['pan'] = self.rng.uniform(-self.spread, self.spread, count)
+            self.pending = np.concatenate([self.pending, batch])
+
+    def render(self, frames: int, out: np.ndarray, panner, gain: float, x: float, y: float = 0.0):
+        """Add the next frames of grains, panned around (x, y), into out"""
+        start = self.clock
+        end = start + frames
+        self.clock = end
+        self._schedule(end)
+
+        # Grains starting in this block join the active set
+        started = int(np.searchsorted(self.pending['onset'], end))
+        if started:
+            self.active = np.concatenate([self.active, self.pending[:started]])
+            self.pending = self.pending[started:]
+        grains = self.active
+        if grains.size == 0:
+            return
+
+        # (grains, frames) offset of every output frame into every grain
+        offset = np.arange(start, end)[None, :] - grains['onset'][:, None]
+        length = grains['length'][:, None]
+        inside = (offset >= 0) & (offset < length)
+        window_index = np.clip(offset * (WINDOW_SIZE - 1) // length, 0, WINDOW_SIZE - 1)
+        envelope = self.windows[grains['envelope'][:, None], window_index]
+        source = self.samples[(grains['position'][:, None] + offset) % self.samples.shape[0]]
+        signal = np.where(inside, source * envelope, np.float32(0.0)).astype(np.float32, copy=False)
+
+        positions = np.empty((grains.size, 2), dtype=np.float32)
+        positions[:, 0] = np.clip(x + grains['pan'], -1.0, 1.0)
+        positions[:, 1] = y
+        gains = panner.gain_matrix(positions) * np.float32(gain * self.level)
+        out += signal.T @ gains
+
+        # Drop grains that finished inside this block
+        self.active = grains[grains['onset'] + grains['length'] > end]
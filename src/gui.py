@@ -1,15 +1,22 @@
 import os
 import json
+import math
 import tkinter as tk
+from typing import Dict
 import customtkinter as ctk
-from PIL import Image, ImageTk
+from adaptive_quality import AdaptiveQuality
 from audio_player import AudioPlayer
-import random
-import time
-import threading
+from mixer_backend import DEFAULT_PROFILE
+from assets_watcher import AssetsWatcher, is_sound_file
+from noise_catalog import is_noise, noise_names
+from osc_control import OSCListener
+from preset_library import PresetLibrary
+from sound_index import SoundIndex, wav_duration
+from timeline import Timeline
+from startup_trace import trace
 
 class SoundMixerGUI:
-    def __init__(self, root):
+    def __init__(self, root, backend=None, profile: str = DEFAULT_PROFILE):
         self.root = root
         self.root.title("Ambient Sound Mixer")
         
@@ -37,18 +44,47 @@ class SoundMixerGUI:
         
         # Load settings
         self.settings = self.load_settings()
+
+        # Library of saved mixes (index only, bodies load on demand)
+        self.presets = PresetLibrary(os.path.join(self.base_dir, 'presets'))
         
         # Initialize player
-        self.audio_player = AudioPlayer()
+        self.audio_player = AudioPlayer(backend, profile)
+        self.audio_player.profiles_file = os.path.join(self.base_dir, 'cache', 'profiles.json')
+        # Waveform overviews of the cards; this cache and the loop variants
+        # need numpy, so they are opened once the window is up (open_caches)
+        self.waveforms = None
         
         # Create top control panel
         self.create_control_panel()
         
         # Create main container for cards
+        self.cards: Dict[str, 'GlassmorphicSoundCard'] = {}
+        self.max_cols = 3
+        # Search index over the cards; the grid shows only matches of search_query
+        self.sound_index = SoundIndex()
+        self.search_query = ''
         self.create_main_container()
         
         # Load sounds
         self.load_sounds()
+
+        # Pick up sounds added or removed while running
+        self.start_assets_watcher()
+
+        # Loop position markers on playing cards
+        self.root.after(100, self._update_playheads)
+
+        # Render non-repeating variants of short loops once the window is up
+        self.root.after_idle(self.open_caches)
+        self.root.after_idle(self.prepare_variations)
+        self.root.after_idle(self.prepare_profiles)
+
+        # Programmed sessions and sleep timer
+        self.timeline = Timeline(self.audio_player, resolve=self._sound_path,
+                                 on_event=lambda event: self.root.after(0, self._sync_cards))
+        self.osc = None
+        self.quality = None
         
         # Bind window close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -83,6 +119,19 @@ class SoundMixerGUI:
         )
         self.auto_balance_button.pack(side="left", padx=5)
         self.auto_balance_active = False
+
+        # Filter-as-you-type search over names, tags, duration and loudness
+        self.search_entry = ctk.CTkEntry(
+            control_panel,
+            placeholder_text="Search (rain, tag:night, dur>30, loud<-20)",
+            height=30,
+            corner_radius=15,
+            fg_color="#2a2a3e",
+            border_width=0
+        )
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.search_entry.bind("<KeyRelease>", self.on_search)
+        self.search_entry.bind("<Escape>", self.clear_search)
         
         # Add settings button
         self.settings_button = ctk.CTkButton(
@@ -145,12 +194,12 @@ class SoundMixerGUI:
         self.sounds_container.pack(expand=True, fill="both")
         
         # Configure column weights
-        for i in range(3):
+        for i in range(self.max_cols):
             self.sounds_container.grid_columnconfigure(i, weight=1)
 
     def _create_sound_card(self, sound_name: str, row: int, col: int):
         """Create sound card"""
-        sound_path = os.path.join(self.sounds_dir, sound_name)
+        sound_path = self._sound_path(sound_name)
         
         # Create card with glass effect
         card = GlassmorphicSoundCard(
@@ -158,16 +207,24 @@ class SoundMixerGUI:
             self._format_sound_name(sound_name),
             sound_path,
             self.audio_player,
-            self._get_icon_for_sound(sound_name)
+            self._get_icon_for_sound(sound_name),
+            self.waveforms
         )
         card.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
         
         return card
 
+    def _sound_path(self, sound_name: str) -> str:
+        """Player path of a card's sound"""
+        # Procedural sounds are played by name, not from a file
+        return sound_name if is_noise(sound_name) else os.path.join(self.sounds_dir, sound_name)
+
     def _get_icon_for_sound(self, filename: str) -> str:
         """Get emoji icon for sound"""
         filename = filename.lower()
-        if 'rain' in filename:
+        if is_noise(filename):
+            return '〰'
+        elif 'rain' in filename:
             return '🌧'
         elif 'sea' in filename or 'beach' in filename:
             return '🌊'
@@ -195,6 +252,9 @@ class SoundMixerGUI:
             'forest': 'Forest'
         }
         
+        if is_noise(filename):
+            return f"{filename.split(':', 1)[1].title()} Noise"
+
         # Get base filename
         name = os.path.splitext(filename)[0].lower()
         
@@ -210,43 +270,259 @@ class SoundMixerGUI:
         try:
             if not os.path.exists(self.sounds_dir):
                 os.makedirs(self.sounds_dir)
-                return
 
-            row = 0
-            col = 0
-            max_cols = 3
             playing_count = 0
 
-            for sound_file in os.listdir(self.sounds_dir):
-                if sound_file.endswith('.wav'):
-                    try:
-                        # Create sound card
-                        card = self._create_sound_card(sound_file, row, col)
-                        
-                        # Load saved settings for sound
-                        sound_settings = self.settings['sounds'].get(sound_file, {})
-                        if sound_settings:
-                            if sound_settings.get('volume') is not None:
-                                card.volume_slider.set(sound_settings['volume'] * 100)
-                            if sound_settings.get('pan') is not None:
-                                card.pan_slider.set(sound_settings['pan'] * 50)
-                            if sound_settings.get('playing', False):
-                                if playing_count < self.audio_player.max_sounds:
-                                    card.toggle_play()
-                                    playing_count += 1
-                        
-                        col += 1
-                        if col >= max_cols:
-                            col = 0
-                            row += 1
-                            
-                    except Exception as e:
-                        print(f"Error loading sound {sound_file}: {e}")
-                        continue
+            sound_files = [name for name in os.listdir(self.sounds_dir) if is_sound_file(name)]
+            for sound_file in sound_files + noise_names():
+                try:
+                    # Create sound card
+                    with trace.phase('card construction'):
+                        card = self._add_sound_card(sound_file)
+                    
+                    # Load saved settings for sound
+                    sound_settings = self.settings['sounds'].get(sound_file, {})
+                    if sound_settings:
+                        card.apply_mix(sound_settings)
+                        if sound_settings.get('playing', False):
+                            if playing_count < self.audio_player.max_sounds:
+                                # Auto-play may pick a pre-rendered variant
+                                self._open_variations()
+                                card.toggle_play()
+                                playing_count += 1
                         
+                except Exception as e:
+                    print(f"Error loading sound {sound_file}: {e}")
+                    continue
+                    
         except Exception as e:
             print(f"Error loading sounds directory: {e}")
 
+    def _add_sound_card(self, sound_file: str):
+        """Create a card in the next free grid slot"""
+        row, col = divmod(len(self.cards), self.max_cols)
+        card = self._create_sound_card(sound_file, row, col)
+        self.cards[sound_file] = card
+        self._index_sound(sound_file)
+        if self.search_query:
+            self._layout_cards()
+        return card
+
+    def _index_sound(self, sound_file: str):
+        """Add a sound's names, tags and metadata to the search index"""
+        sound_path = self._sound_path(sound_file)
+        tags = list(self.settings['sounds'].get(sound_file, {}).get('tags', []))
+        duration = None
+        if is_noise(sound_file):
+            tags.append('noise')
+        else:
+            try:
+                duration = wav_duration(sound_path)
+            except Exception as e:
+                print(f"Error reading {sound_file}: {e}")
+        # Loudness is filled in by _index_loudness once profiles are available
+        self.sound_index.add(sound_file, [sound_file, self._format_sound_name(sound_file)], tags,
+                             duration=duration)
+
+    def _loudness_db(self, sound_path: str):
+        """RMS level in dBFS from the cached band profile, None until analysed"""
+        profile = self.audio_player.profiles.get(sound_path)
+        if not profile or profile['rms'] <= 0:
+            return None
+        return 20.0 * math.log10(profile['rms'])
+
+    def _index_loudness(self):
+        """Fill in loudness of sounds whose profiles have been analysed"""
+        for sound_file in self.cards:
+            loudness_db = self._loudness_db(self._sound_path(sound_file))
+            if loudness_db is not None:
+                self.sound_index.set_metadata(sound_file, loudness_db=loudness_db)
+        if self.search_query:
+            self._layout_cards()
+
+    def on_search(self, event=None):
+        """Filter the cards as the search text changes"""
+        query = self.search_entry.get().strip()
+        if query != self.search_query:
+            self.search_query = query
+            self._layout_cards()
+
+    def clear_search(self, event=None):
+        """Show every card again"""
+        self.search_entry.delete(0, "end")
+        self.on_search()
+
+    def _layout_cards(self):
+        """Grid the cards matching the search in order, filling gaps
+
+        Only cards that change slot or visibility are touched, so typing
+        in the search box never rebuilds widgets.
+        """
+        if self.search_query:
+            visible = [name for name in self.sound_index.search(self.search_query) if name in self.cards]
+        else:
+            visible = list(self.cards)
+        shown = set(visible)
+        for sound_file, card in self.cards.items():
+            if sound_file not in shown and card.winfo_manager():
+                card.grid_remove()
+        for index, sound_file in enumerate(visible):
+            card = self.cards[sound_file]
+            row, col = divmod(index, self.max_cols)
+            info = card.grid_info()
+            if int(info.get('row', -1)) != row or int(info.get('column', -1)) != col:
+                # grid() also restores a card hidden by grid_remove with its padding
+                card.grid(row=row, column=col)
+
+    def _remove_sound_card(self, sound_file: str):
+        """Drop the card and cached audio of a deleted file"""
+        card = self.cards.pop(sound_file, None)
+        if card is None:
+            return
+        self.sound_index.remove(sound_file)
+        card.cleanup()
+        self.audio_player.unload_sound(card.sound_path)
+        card.destroy()
+        print(f"Sound removed: {sound_file}")
+
+    def _refresh_sound(self, sound_file: str):
+        """Invalidate cached audio of a rewritten file"""
+        card = self.cards.get(sound_file)
+        if card is not None:
+            self.audio_player.refresh_sound(card.sound_path)
+            card.reset_waveform()
+            self._index_sound(sound_file)
+            print(f"Sound updated: {sound_file}")
+
+    def _open_variations(self):
+        """Open the loop variant cache (imports numpy)"""
+        if self.audio_player.variations is None:
+            from variations import VariationCache
+            self.audio_player.variations = VariationCache(os.path.join(self.base_dir, 'cache', 'variations'))
+
+    def open_caches(self):
+        """Open the numpy-backed caches after the first frame is drawn"""
+        try:
+            self._open_variations()
+            if self.waveforms is None:
+                from waveform import WaveformCache
+                self.waveforms = WaveformCache(os.path.join(self.base_dir, 'cache', 'waveforms'))
+                for card in self.cards.values():
+                    card.set_waveforms(self.waveforms)
+        except Exception as e:
+            print(f"Error opening caches: {e}")
+
+    def prepare_variations(self, sound_files=None):
+        """Render missing loop variants in the background"""
+        try:
+            self._open_variations()
+            sound_files = self.cards if sound_files is None else sound_files
+            paths = [os.path.join(self.sounds_dir, name) for name in sound_files if not is_noise(name)]
+            self.audio_player.variations.generate_in_background(paths)
+        except Exception as e:
+            print(f"Error preparing variations: {e}")
+
+    def prepare_profiles(self, sound_files=None):
+        """Analyse the band profiles smart mixing needs in the background"""
+        try:
+            sound_files = self.cards if sound_files is None else sound_files
+            self.audio_player.prepare_profiles([self._sound_path(name) for name in sound_files],
+                                               lambda: self.root.after(0, self._index_loudness))
+            # Profiles already cached from earlier runs
+            self._index_loudness()
+        except Exception as e:
+            print(f"Error preparing profiles: {e}")
+
+    def run_program(self, file_path: str):
+        """Start a programmed session from a JSON file"""
+        try:
+            self.timeline.stop()
+            self.timeline.load(file_path)
+            self.timeline.start()
+            print(f"Program started: {file_path} ({self.timeline.pending} events)")
+        except Exception as e:
+            print(f"Error starting program {file_path}: {e}")
+
+    def set_sleep_timer(self, seconds: float, fade: float = 60.0):
+        """Fade everything out over the last fade seconds"""
+        self.timeline.sleep_timer(seconds, min(fade, seconds))
+        print(f"Sleep timer: {seconds / 60:.0f} min")
+
+    def start_osc(self, port: int, host: str = '127.0.0.1'):
+        """Accept OSC control on a UDP port (/mixer/<sound>/<parameter>)"""
+        try:
+            self.osc = OSCListener(self.audio_player, host=host, port=port, resolve=self._sound_path,
+                                   on_apply=lambda batch: self.root.after(0, self._sync_osc, batch))
+            self.osc.start()
+        except Exception as e:
+            self.osc = None
+            print(f"Error starting OSC listener: {e}")
+
+    def start_adaptive_quality(self):
+        """Lower effect and display update rates while the machine is under load"""
+        self.quality = AdaptiveQuality(self.audio_player)
+        self.quality.start()
+
+    def _sync_osc(self, batch: dict):
+        """Move card sliders to the values applied from OSC"""
+        for (sound, parameter), value in batch.items():
+            card = self.cards.get(sound)
+            if card is None:
+                continue
+            if parameter == 'volume':
+                card.volume_slider.set(min(1.0, max(0.0, float(value))) * 100)
+            elif parameter == 'pan':
+                card.pan_slider.set(min(1.0, max(-1.0, float(value))) * 50)
+        self._sync_cards()
+
+    def _sync_cards(self):
+        """Update play buttons after the timeline started or stopped sounds"""
+        for card in self.cards.values():
+            sound_info = self.audio_player.playing_sounds.get(card.sound_path)
+            playing = bool(sound_info and sound_info['channel'] and sound_info['channel'].get_busy()
+                           and not sound_info.get('paused'))
+            if playing != card.is_playing:
+                card.is_playing = playing
+                card.play_button.configure(text="⏸️" if playing else "▶️",
+                                           fg_color=card.active_color if playing else card.inactive_color)
+
+    def _update_playheads(self):
+        """Move the loop position markers, at the player's GUI refresh rate"""
+        for card in self.cards.values():
+            card.update_playhead()
+        interval = max(0.1, self.audio_player.gui_interval)
+        self.root.after(int(interval * 1000), self._update_playheads)
+
+    def start_assets_watcher(self):
+        """Watch the assets directory for new, removed and changed files"""
+        try:
+            self.assets_watcher = AssetsWatcher(self.sounds_dir)
+            self.root.after(int(self.assets_watcher.interval * 1000), self._poll_assets)
+        except Exception as e:
+            print(f"Error starting assets watcher: {e}")
+
+    def _poll_assets(self):
+        """Apply assets directory changes to the card grid"""
+        try:
+            added, removed, changed = self.assets_watcher.poll()
+            for sound_file in removed:
+                self._remove_sound_card(sound_file)
+            if removed:
+                self._layout_cards()
+            for sound_file in changed:
+                self._refresh_sound(sound_file)
+            for sound_file in added:
+                if sound_file not in self.cards:
+                    self._add_sound_card(sound_file)
+                    print(f"Sound added: {sound_file}")
+            if added or changed:
+                self.prepare_variations(list(added) + list(changed))
+                self.prepare_profiles(list(added) + list(changed))
+        except Exception as e:
+            print(f"Error watching assets: {e}")
+
+        self.root.after(int(self.assets_watcher.interval * 1000), self._poll_assets)
+
     def load_settings(self) -> dict:
         """Load application settings"""
         default_settings = {
@@ -284,11 +560,13 @@ class SoundMixerGUI:
             # Save sound settings
             for widget in self.sounds_container.winfo_children():
                 sound_name = os.path.basename(widget.sound_path)
-                self.settings['sounds'][sound_name] = {
+                # Keep hand-written keys such as search tags
+                self.settings['sounds'].setdefault(sound_name, {}).update({
                     'volume': widget.current_volume,
                     'pan': widget.current_pan,
+                    'tone': widget.current_tone,
                     'playing': widget.is_playing
-                }
+                })
             
             # Save to file
             with open(self.settings_file, 'w', encoding='utf-8') as f:
@@ -299,6 +577,51 @@ class SoundMixerGUI:
         except Exception as e:
             print(f"Error saving settings: {e}")
 
+    def _current_mix(self) -> dict:
+        """Collect volume, pan, tone and play state of every card"""
+        return {
+            sound_name: {
+                'volume': card.current_volume,
+                'pan': card.current_pan,
+                'tone': card.current_tone,
+                'playing': card.is_playing
+            }
+            for sound_name, card in self.cards.items()
+        }
+
+    def save_preset(self, name: str, tags=()):
+        """Save the current mix to the preset library"""
+        try:
+            mix = {k: v for k, v in self._current_mix().items() if v['playing']}
+            self.presets.save(name, mix, tags)
+            print(f"Preset saved: {name}")
+        except Exception as e:
+            print(f"Error saving preset {name}: {e}")
+
+    def apply_preset(self, name: str) -> bool:
+        """Load a preset and apply it to the cards"""
+        preset = self.presets.load(name)
+        if preset is None:
+            print(f"Preset not found: {name}")
+            return False
+
+        sounds = preset.get('sounds', {})
+        # Stop sounds that are not part of the preset first
+        for sound_name, card in self.cards.items():
+            if card.is_playing and not sounds.get(sound_name, {}).get('playing', False):
+                card.toggle_play()
+
+        for sound_name, sound_settings in sounds.items():
+            card = self.cards.get(sound_name)
+            if card is None:
+                print(f"Preset sound missing from assets: {sound_name}")
+                continue
+            # Start first so the levels below reach the player, not just the sliders
+            if sound_settings.get('playing', False) and not card.is_playing:
+                card.toggle_play()
+            card.apply_mix(sound_settings)
+        return True
+
     def toggle_auto_balance(self):
         """Toggle auto-balance"""
         self.auto_balance_active = not self.auto_balance_active
@@ -316,12 +639,30 @@ class SoundMixerGUI:
         pass
 
     def on_closing(self):
-        """Handle window close"""
-        self.save_settings()
-        self.root.destroy()
+        """Handle window close: save settings, stop inputs and workers, release audio"""
+        try:
+            self.save_settings()
+            if getattr(self, 'assets_watcher', None):
+                self.assets_watcher.close()
+            self.timeline.stop()
+            if self.osc:
+                self.osc.stop()
+            if self.quality:
+                self.quality.stop()
+            if self.audio_player.variations is not None:
+                self.audio_player.variations.close()
+            self.audio_player.stop_recording()
+            stats = self.audio_player.output_stats()
+            if stats.get('underruns'):
+                print(f"Output stats: {stats}")
+            self.audio_player.cleanup()
+        except Exception as e:
+            print(f"Error during cleanup: {e}")
+        finally:
+            self.root.destroy()
 
 class GlassmorphicSoundCard(ctk.CTkFrame):
-    def __init__(self, parent, sound_name, sound_path, audio_player, emoji="🔊"):
+    def __init__(self, parent, sound_name, sound_path, audio_player, emoji="🔊", waveforms=None):
         super().__init__(
             parent,
             fg_color="#2a2a3e",
@@ -338,6 +679,7 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
         # Save current volume and pan values
         self.current_volume = 0.5  # 50%
         self.current_pan = 0.0     # center
+        self.current_tone = 0.0    # flat
         
         # Define colors
         self.active_color = "#4CAF50"  # Green for active state
@@ -370,6 +712,17 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
             text_color="#ffffff"
         )
         name_label.pack(side="left", padx=4)
+
+        # Waveform overview with loop position (file sounds only); drawn once
+        # a WaveformCache is given here or through set_waveforms
+        self.waveforms = waveforms
+        self.waveform = None
+        self.waveform_requested = False
+        self.waveform_canvas = None
+        if not is_noise(sound_path):
+            self.waveform_canvas = tk.Canvas(content, height=32, bg="#2a2a3e", highlightthickness=0)
+            self.waveform_canvas.pack(fill="x", pady=(0, 4))
+            self.waveform_canvas.bind('<Configure>', lambda event: self.draw_waveform())
         
         # Play button
         self.play_button = ctk.CTkButton(
@@ -502,6 +855,53 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
             width=15
         )
         right_label.pack(side="right")
+
+        # Tone control (software-mixed outputs filter each sound)
+        self.sweep_active = False
+        if getattr(audio_player.backend, 'supports_filters', False):
+            tone_frame = ctk.CTkFrame(content, fg_color="transparent")
+            tone_frame.pack(fill="x", pady=4)
+
+            # Filter sweep button
+            self.sweep_button = ctk.CTkButton(
+                tone_frame,
+                text="〽️",
+                width=30,
+                height=30,
+                corner_radius=15,
+                command=self.toggle_sweep,
+                font=("Segoe UI Emoji", 12),
+                fg_color=self.inactive_color,
+                hover_color=self.hover_color
+            )
+            self.sweep_button.pack(side="left", padx=(0, 4))
+
+            self.tone_value = ctk.CTkLabel(
+                tone_frame,
+                text="Flat",
+                font=("Helvetica", 10),
+                text_color="#ffffff",
+                width=30
+            )
+            self.tone_value.pack(side="right")
+
+            self.tone_slider = ctk.CTkSlider(
+                tone_frame,
+                from_=-50,
+                to=50,
+                number_of_steps=100,
+                width=120,
+                height=16,
+                corner_radius=8,
+                button_corner_radius=8,
+                button_length=12,
+                command=self.on_tone_change,
+                progress_color="#4CAF50",
+                button_color="#4CAF50",
+                button_hover_color="#45a049"
+            )
+            self.tone_slider.set(0)
+            self.tone_slider.pack(side="right", expand=True, fill="x", padx=4)
         
         self.breathing_active = False
         self.random_pan_active = False
@@ -527,6 +927,12 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
                 elif self.audio_player.play(self.sound_path):
                     self.is_playing = True
                     self.play_button.configure(text="⏸️", fg_color=self.active_color)
+                    # The player starts at its base volume and centred
+                    self.audio_player.set_volume(self.sound_path, self.current_volume)
+                    if self.current_pan:
+                        self.audio_player.set_pan(self.sound_path, self.current_pan)
+                    if self.current_tone:
+                        self.audio_player.set_tone(self.sound_path, self.current_tone)
                     print("Sound started")
                 else:
                     print("Failed to start sound")
@@ -550,6 +956,8 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
             # Update display
             self.update_volume_display(volume)
             
+            self.current_volume = volume
+
             # Set volume only if sound is playing
             if self.is_playing and self.sound_path in self.audio_player.playing_sounds:
                 self.audio_player.set_volume(self.sound_path, volume)
@@ -557,6 +965,19 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
         except Exception as e:
             print(f"Error changing volume: {e}")
 
+    def apply_mix(self, sound_settings: dict):
+        """Set volume, pan and tone from saved settings or a preset"""
+        if sound_settings.get('volume') is not None:
+            self.on_volume_change(sound_settings['volume'] * 100)
+        if sound_settings.get('pan') is not None:
+            # The slider runs opposite to the pan value (see on_pan_change)
+            value = -sound_settings['pan'] * 50
+            self.pan_slider.set(value)
+            self.on_pan_change(value)
+        if sound_settings.get('tone') is not None and hasattr(self, 'tone_slider'):
+            self.tone_slider.set(sound_settings['tone'] * 50)
+            self.on_tone_change(sound_settings['tone'] * 50)
+
     def update_volume_display(self, volume):
         """Update volume display"""
         try:
@@ -664,6 +1085,41 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
         except Exception as e:
             print(f"Error toggling random pan: {e}")
 
+    def on_tone_change(self, value):
+        """Handle tone change"""
+        try:
+            self.current_tone = float(value) / 50.0
+            if value == 0:
+                self.tone_value.configure(text="Flat")
+            else:
+                # Dark = low-pass, Thin = high-pass
+                self.tone_value.configure(text=f"{'D' if value < 0 else 'T'}{int(abs(value)) * 2}%")
+
+            if self.is_playing:
+                self.audio_player.set_tone(self.sound_path, self.current_tone)
+
+        except Exception as e:
+            print(f"Error changing tone: {e}")
+
+    def toggle_sweep(self):
+        """Toggle filter sweep"""
+        try:
+            if not self.is_playing:
+                return
+
+            if self.sweep_active:
+                if self.audio_player.stop_filter_sweep(self.sound_path):
+                    self.sweep_button.configure(fg_color=self.inactive_color)
+                    self.sweep_active = False
+                    print("Filter sweep stopped")
+            elif self.audio_player.start_filter_sweep(self.sound_path):
+                self.sweep_button.configure(fg_color=self.active_color)
+                self.sweep_active = True
+                print("Filter sweep started")
+
+        except Exception as e:
+            print(f"Error toggling filter sweep: {e}")
+
     def update_pan_display(self, pan):
         """Update pan display"""
         try:
@@ -694,6 +1150,61 @@ class GlassmorphicSoundCard(ctk.CTkFrame):
         else:
             print("Failed to start random pan")
 
+    def draw_waveform(self):
+        """Draw the waveform at the canvas's current size"""
+        try:
+            canvas = self.waveform_canvas
+            if self.waveforms is None:
+                return
+            if self.waveform is None and not self.waveform_requested:
+                # Cached pyramids load now; missing ones are built in the background
+                self.waveform_requested = True
+                self.waveform = self.waveforms.request(
+                    self.sound_path, lambda waveform: self.after(0, self._waveform_ready, waveform))
+            if self.waveform is None or canvas.winfo_width() < 2:
+                return
+            canvas.delete('wave')
+            canvas.create_polygon(self.waveform.outline(canvas.winfo_width(), canvas.winfo_height()),
+                                  fill="#4CAF50", outline="", tags='wave')
+        except Exception as e:
+            print(f"Error drawing waveform: {e}")
+
+    def set_waveforms(self, waveforms):
+        """Attach the waveform cache and draw the overview"""
+        self.waveforms = waveforms
+        if self.waveform_canvas is not None:
+            self.draw_waveform()
+
+    def _waveform_ready(self, waveform):
+        """Background build finished"""
+        self.waveform = waveform
+        self.draw_waveform()
+
+    def reset_waveform(self):
+        """Rebuild the waveform after the file changed"""
+        if self.waveform_canvas is None:
+            return
+        self.waveform = None
+        self.waveform_requested = False
+        self.waveform_canvas.delete('wave')
+        self.draw_waveform()
+
+    def update_playhead(self):
+        """Mark the loop position on the waveform"""
+        canvas = self.waveform_canvas
+        if canvas is None:
+            return
+        canvas.delete('playhead')
+        position = self.audio_player.loop_position(self.sound_path) if self.is_playing else None
+        if position is None or self.waveform is None:
+            return
+        seconds, length = position
+        # A pre-rendered variant is playing: its positions don't map onto the file
+        if abs(length - self.waveform.duration) > 0.01 * self.waveform.duration:
+            return
+        x = seconds / length * canvas.winfo_width()
+        canvas.create_line(x, 0, x, canvas.winfo_height(), fill="#ffffff", tags='playhead')
+
     def cleanup(self):
         """Cleanup resources on close"""
         if hasattr(self, 'breathing_active') and self.breathing_active:
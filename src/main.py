@@ -1,10 +1,16 @@
-import os
-import sys
-import tkinter as tk
-from tkinter import messagebox
-from gui import SoundMixerGUI
-import ctypes
-import customtkinter
+from startup_trace import trace
+
+with trace.phase('imports'):
+    import argparse
+    import os
+    import sys
+    import tkinter as tk
+    from tkinter import messagebox
+    from assets_watcher import is_sound_file
+    from gui import SoundMixerGUI
+    from mixer_backend import DEFAULT_PROFILE, LATENCY_PROFILES
+    import ctypes
+    import customtkinter
 
 def check_assets_directory():
     """Check if assets directory exists"""
@@ -18,11 +24,50 @@ def check_assets_directory():
         )
     return assets_dir
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Ambient Sound Mixer")
+    parser.add_argument('--output', default='native',
+                        choices=['native', 'pygame', 'portaudio', 'wav', 'null'],
+                        help="audio output: native pygame mixer or a software-mixed sink")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, choices=list(LATENCY_PROFILES),
+                        help="latency profile (buffer size and sample rate)")
+    parser.add_argument('--layout', default='stereo', choices=['stereo', 'quad', '4.0', '5.1'],
+                        help="speaker layout for software-mixed outputs")
+    parser.add_argument('--output-file', help="file written by the wav output")
+    parser.add_argument('--program', help="JSON program of timed events to run (see programs/)")
+    parser.add_argument('--sleep-timer', type=float, metavar='MINUTES',
+                        help="fade everything out after this many minutes")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record the mix to a .wav or .flac file (software-mixed outputs)")
+    parser.add_argument('--reverb', metavar='IR',
+                        help="room reverb from an impulse response WAV file (software-mixed outputs)")
+    parser.add_argument('--reverb-wet', type=float, default=0.25, metavar='LEVEL',
+                        help="reverb level mixed over the dry signal (default 0.25)")
+    parser.add_argument('--osc-port', type=int, metavar='PORT',
+                        help="accept OSC control messages on this UDP port (e.g. 9000)")
+    parser.add_argument('--adaptive-quality', action='store_true',
+                        help="lower effect and display update rates under CPU load")
+    parser.add_argument('--trace-startup', action='store_true',
+                        help="print a timed breakdown of startup phases")
+    args = parser.parse_args()
+    if args.reverb and args.output == 'native':
+        parser.error("--reverb needs a software-mixed output (--output pygame, portaudio, wav or null)")
+    return args
+
+def create_backend(args):
+    """Create the audio backend selected on the command line"""
+    if args.output == 'native':
+        return None
+    from engine_backend import create_backend as create_engine_backend
+    return create_engine_backend(args.output, layout=args.layout, file_path=args.output_file)
+
 def main():
+    args = parse_args()
     try:
         # Check for assets folder
         assets_dir = check_assets_directory()
-        if not any(f.endswith('.wav') for f in os.listdir(assets_dir)):
+        if not any(is_sound_file(f) for f in os.listdir(assets_dir)):
             if not messagebox.askyesno(
                 "Warning",
                 "No WAV files found in assets folder.\n"
@@ -31,7 +76,8 @@ def main():
                 return
         
         # Create main window
-        root = tk.Tk()
+        with trace.phase('tk root'):
+            root = tk.Tk()
         root.title("Ambient Sound Mixer")
         
         try:
@@ -55,19 +101,24 @@ def main():
         customtkinter.deactivate_automatic_dpi_awareness()  # Disable automatic DPI
         
         # Create application instance
-        app = SoundMixerGUI(root)
+        app = SoundMixerGUI(root, create_backend(args), args.profile)
+        if args.program:
+            app.run_program(args.program)
+        if args.sleep_timer:
+            app.set_sleep_timer(args.sleep_timer * 60)
+        if args.osc_port:
+            app.start_osc(args.osc_port)
+        if args.reverb and not app.audio_player.set_reverb(args.reverb, args.reverb_wet):
+            messagebox.showerror("Error", f"Could not load reverb impulse response:\n{args.reverb}")
+        if args.record:
+            app.audio_player.start_recording(args.record)
+        if args.adaptive_quality:
+            app.start_adaptive_quality()
         
-        # Configure window close handler
-        def on_closing():
-            try:
-                app.save_settings()  # Save settings before exit
-                app.audio_player.cleanup()
-            except Exception as e:
-                print(f"Error during cleanup: {e}")
-            finally:
-                root.destroy()
-            
-        root.protocol("WM_DELETE_WINDOW", on_closing)
+        # The window close handler is SoundMixerGUI.on_closing
+
+        # Report startup breakdown once the window is drawn
+        root.after_idle(trace.report)
         
         # Start main loop
         root.mainloop()
@@ -0,0 +1,239 @@
+import math
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from audio_io import read_wav_int16
+from output_sinks import WavFileSink
+from spatial import SpatialPanner
+
+
+class LoopSource:
+    """Endless mono or stereo source looping over a sample buffer
+
+    Accepts float or int16 (frames,) / (frames, channels) buffers. Samples
+    stay in their stored form and are scaled one block at a time, so int16
+    assets never get a full float copy. Stereo keeps both channels (the
+    engine balances them); other channel counts are folded to mono.
+    """
+
+    def __init__(self, samples: np.ndarray):
+        samples = np.asarray(samples)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if samples.size == 0:
+            raise ValueError("Empty sample buffer")
+        if samples.dtype != np.int16:
+            samples = samples.astype(np.float32, copy=False)
+        self.samples = samples
+        self.channels = 2 if samples.shape[1] == 2 else 1
+        # Folded channels are averaged
+        fold = samples.shape[1] if self.channels == 1 else 1
+        self.scale = (1.0 / 32768.0 if samples.dtype == np.int16 else 1.0) / fold
+        self.position = 0
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'LoopSource':
+        """Create a looping source from a WAV file"""
+        samples, _ = read_wav_int16(file_path)
+        return cls(samples)
+
+    def read(self, frames: int, out: np.ndarray):
+        """Fill out[:frames] with the next samples, (frames,) mono or (frames, 2) stereo"""
+        length = self.samples.shape[0]
+        written = 0
+        while written < frames:
+            count = min(frames - written, length - self.position)
+            chunk = self.samples[self.position:self.position + count]
+            if self.channels == 1:
+                np.sum(chunk, axis=1, dtype=np.float32, out=out[written:written + count])
+            else:
+                out[written:written + count] = chunk
+            written += count
+            self.position = (self.position + count) % length
+        out[:frames] *= self.scale
+
+
+class MixEngine:
+    """Block-based software mixer rendering voices to N output channels"""
+
+    def __init__(self, layout: str = 'stereo', sample_rate: int = 44100, block_size: int = 512):
+        self.panner = SpatialPanner(layout)
+        self.channels = self.panner.channels
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+
+        # Voices are keyed by name like AudioPlayer.playing_sounds
+        self.voices: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+        # Master bus stages, each exposing process(block) -> block
+        self.master_bus: List = []
+        # Sidechain ducker (see dynamics.Ducker) driven by key voices
+        self.ducker = None
+
+        # Scratch buffers reused between blocks
+        self._blocks = np.zeros((0, block_size), dtype=np.float32)
+        self._out = np.zeros((block_size, self.channels), dtype=np.float32)
+        self._key_out = np.zeros((block_size, self.channels), dtype=np.float32)
+        self._spatial = np.zeros((block_size, self.channels), dtype=np.float32)
+
+    def add_voice(self, name: str, source, gain: float = 0.5, x: float = 0.0, y: float = 0.0,
+                  key: bool = False, filters=None):
+        """Add a source to the mix"""
+        with self.lock:
+            self.voices[name] = {
+                'source': source,
+                'gain': gain,
+                'position': (x, y),
+                'paused': False,
+                'matrix': None,
+                'key': key,
+                'filters': filters,
+            }
+
+    def remove_voice(self, name: str) -> bool:
+        """Remove a source from the mix"""
+        with self.lock:
+            return self.voices.pop(name, None) is not None
+
+    def set_gain(self, name: str, gain: float):
+        """Set voice gain"""
+        voice = self.voices.get(name)
+        if voice:
+            voice['gain'] = gain
+
+    def set_position(self, name: str, x: float, y: float = 0.0):
+        """Set voice position in the room"""
+        voice = self.voices.get(name)
+        if voice:
+            voice['position'] = (x, y)
+
+    def set_key(self, name: str, key: bool):
+        """Make a voice a sidechain key that ducks the rest of the mix"""
+        voice = self.voices.get(name)
+        if voice:
+            voice['key'] = key
+
+    def set_filters(self, name: str, filters):
+        """Run a voice through a filter chain (see eq.FilterChain), None to bypass"""
+        voice = self.voices.get(name)
+        if voice:
+            voice['filters'] = filters
+
+    def set_paused(self, name: str, paused: bool):
+        """Pause or resume a voice"""
+        voice = self.voices.get(name)
+        if voice:
+            voice['paused'] = paused
+
+    def render_block(self) -> np.ndarray:
+        """Render the next (block_size, channels) block"""
+        with self.lock:
+            active = [v for v in self.voices.values() if not v['paused']]
+
+        ducker = self.ducker
+        keys = [v for v in active if v['key']] if ducker is not None and ducker.enabled else []
+        if keys or (ducker is not None and ducker.enabled and ducker.active):
+            # Key voices are mixed apart; their peak level ducks everything else
+            self._mix([v for v in active if not v['key']], self._out)
+            self._mix(keys, self._key_out)
+            self._out *= ducker.gain(np.max(np.abs(self._key_out), axis=1))[:, None]
+            self._out += self._key_out
+        else:
+            self._mix(active, self._out)
+
+        block = self._out
+        for stage in self.master_bus:
+            block = stage.process(block)
+        return block
+
+    def _mix(self, voices: List[dict], out: np.ndarray):
+        """Pan voices into out, overwriting it"""
+        # Spatial sources (e.g. granular) pan their own content into the block
+        spatial = [v for v in voices if getattr(v['source'], 'spatial', False)]
+        if spatial:
+            voices = [v for v in voices if not getattr(v['source'], 'spatial', False)]
+
+        if not voices:
+            out.fill(0.0)
+        else:
+            # One row per source channel: mono voices sit at their position,
+            # stereo voices keep left and right apart and are balanced
+            widths = [getattr(v['source'], 'channels', 1) for v in voices]
+            rows = sum(widths)
+            if self._blocks.shape[0] < rows:
+                self._blocks = np.zeros((rows, self.block_size), dtype=np.float32)
+            blocks = self._blocks[:rows]
+
+            positions = np.empty((rows, 2), dtype=np.float32)
+            gains = np.empty((rows, 1), dtype=np.float32)
+            row = 0
+            for voice, width in zip(voices, widths):
+                x, y = voice['position']
+                if width == 1:
+                    voice['source'].read(self.block_size, blocks[row])
+                    if voice['filters'] is not None:
+                        # Mono sources are filtered before panning
+                        blocks[row] = voice['filters'].process(blocks[row])
+                    positions[row] = (x, y)
+                    gains[row] = voice['gain']
+                else:
+                    channels = blocks[row:row + 2].T
+                    voice['source'].read(self.block_size, channels)
+                    if voice['filters'] is not None:
+                        channels[:] = voice['filters'].process(channels)
+                    # Equal-power balance, the gains pygame applies to a stereo sound
+                    angle = (min(1.0, max(-1.0, x)) + 1.0) * math.pi / 4
+                    positions[row:row + 2] = ((-1.0, y), (1.0, y))
+                    gains[row:row + 2, 0] = (voice['gain'] * math.cos(angle),
+                                             voice['gain'] * math.sin(angle))
+                row += width
+
+            matrix = self.panner.gain_matrix(positions) * gains
+            previous = matrix.copy()
+            row = 0
+            for voice, width in zip(voices, widths):
+                if voice['matrix'] is not None and voice['matrix'].shape[0] == width:
+                    previous[row:row + width] = voice['matrix']
+                voice['matrix'] = matrix[row:row + width]
+                row += width
+            self.panner.mix(blocks, matrix, previous, out=out)
+
+        for voice in spatial:
+            x, y = voice['position']
+            if voice['filters'] is None:
+                voice['source'].render(self.block_size, out, self.panner, voice['gain'], x, y)
+            else:
+                self._spatial.fill(0.0)
+                voice['source'].render(self.block_size, self._spatial, self.panner, voice['gain'], x, y)
+                out += voice['filters'].process(self._spatial)
+
+    def render(self, seconds: float, sink) -> int:
+        """Render offline into a sink, returns frames rendered"""
+        blocks = int(np.ceil(seconds * self.sample_rate / self.block_size))
+        for _ in range(blocks):
+            sink.write(self.render_block())
+        return blocks * self.block_size
+
+
+def render_to_wav(engine: MixEngine, file_path: str, seconds: float) -> int:
+    """Render an engine into a multichannel WAV file"""
+    sink = WavFileSink(file_path, engine.channels, engine.sample_rate)
+    try:
+        return engine.render(seconds, sink)
+    finally:
+        sink.close()
+
+
+def render_source(source, sample_rate: int, seconds: float, layout: str = 'stereo',
+                  block_size: int = 1024) -> np.ndarray:
+    """Render a source on its own at full gain, centered, into a (frames, channels) array"""
+    engine = MixEngine(layout, sample_rate, block_size)
+    engine.add_voice('source', source, 1.0)
+    frames = int(seconds * sample_rate)
+    out = np.empty((-(-frames // block_size) * block_size, engine.channels), dtype=np.float32)
+    for start in range(0, out.shape[0], block_size):
+        out[start:start + block_size] = engine.render_block()
+    return out[:frames]
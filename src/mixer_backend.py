@@ -0,0 +1,422 @@
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# pygame is imported on first use, see import_pygame
+pygame = None
+
+# Named latency profiles: smaller buffers answer faster, larger ones survive load
+LATENCY_PROFILES = {
+    'low': {'sample_rate': 48000, 'buffer_size': 256},
+    'balanced': {'sample_rate': 44100, 'buffer_size': 512},
+    'safe': {'sample_rate': 44100, 'buffer_size': 2048},
+}
+DEFAULT_PROFILE = 'balanced'
+
+
+def get_profile(name: str) -> dict:
+    """Look up a latency profile by name"""
+    if name not in LATENCY_PROFILES:
+        raise ValueError(f"Unknown latency profile: {name} (choose from {', '.join(LATENCY_PROFILES)})")
+    return dict(LATENCY_PROFILES[name], name=name)
+
+
+def import_pygame():
+    """Import pygame lazily so it stays off the startup path"""
+    global pygame
+    if pygame is None:
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+        import pygame as _pygame
+        pygame = _pygame
+    return pygame
+
+
+class MixerBackend:
+    """Interface between AudioPlayer and the audio device and clock
+
+    Channels returned by find_channel() follow the pygame.mixer.Channel
+    API used by the player: play(sound, loops), pause(), unpause(), stop(),
+    set_volume(left, right), get_volume() and get_busy().
+    """
+
+    # Whether channels accept per-sound filters (set_filters)
+    supports_filters = False
+
+    def init(self, frequency: int, buffer_size: int, num_channels: int):
+        """Open the output"""
+        raise NotImplementedError
+
+    def quit(self):
+        """Close the output"""
+        raise NotImplementedError
+
+    def exists(self, sound_path: str) -> bool:
+        """Check that a sound can be loaded"""
+        return os.path.exists(sound_path)
+
+    def load_sound(self, sound_path: str):
+        """Decode a sound file"""
+        raise NotImplementedError
+
+    def find_channel(self):
+        """Return an idle channel or None"""
+        raise NotImplementedError
+
+    def create_sound(self, name: str, source):
+        """Make a playable sound from a generated source (see mix_engine)"""
+        raise NotImplementedError
+
+    def sound_bytes(self, sound) -> int:
+        """Bytes of sample data held for a loaded sound"""
+        raise NotImplementedError
+
+    def now(self) -> float:
+        """Monotonic time in seconds"""
+        raise NotImplementedError
+
+    def start_ticker(self, interval: float, callback: Callable[[float], None]):
+        """Call callback(now) every interval seconds"""
+        raise NotImplementedError
+
+    def stop_ticker(self):
+        """Stop the ticker"""
+        raise NotImplementedError
+
+    def ticker_running(self) -> bool:
+        """Whether the ticker is active"""
+        raise NotImplementedError
+
+    def set_alarm(self, when: float, callback: Callable[[float], None]):
+        """Call callback(now) once at time when (replaces a pending alarm)"""
+        raise NotImplementedError
+
+    def cancel_alarm(self):
+        """Drop the pending alarm"""
+        raise NotImplementedError
+
+    def master_dynamics(self):
+        """Master-bus dynamics (see dynamics.MasterDynamics), None without a software mix"""
+        return None
+
+    def set_reverb(self, ir_path: Optional[str], wet: float = 0.25):
+        """Convolution reverb on the master bus from an impulse response WAV, None removes it"""
+        raise RuntimeError("Reverb needs a software-mixed output (--output pygame, portaudio, wav or null)")
+
+    def start_recording(self, file_path: str):
+        """Record the final mix to a file (software-mixed outputs only)"""
+        raise RuntimeError("Recording needs a software-mixed output (--output pygame, portaudio, wav or null)")
+
+    def stop_recording(self) -> Optional[dict]:
+        """Finish the recording and return its stats"""
+        return None
+
+
+class WallClockBackend(MixerBackend):
+    """Base for real-time backends: monotonic clock and one clock thread
+
+    The thread serves both the periodic control ticker and the one-shot
+    alarm, sleeping until whichever is due next. With neither active it
+    waits without waking up at all.
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Condition()
+        self._interval: Optional[float] = None
+        self._tick_callback: Optional[Callable[[float], None]] = None
+        self._next_tick = 0.0
+        self._alarm_time: Optional[float] = None
+        self._alarm_callback: Optional[Callable[[float], None]] = None
+
+    def output_stats(self) -> Optional[dict]:
+        """Output buffer statistics, None when the device does not expose them"""
+        return None
+
+    def now(self) -> float:
+        """Wall-clock monotonic time"""
+        return time.monotonic()
+
+    def _ensure_thread(self):
+        """Start the clock thread on first use"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def start_ticker(self, interval: float, callback: Callable[[float], None]):
+        """Run callback every interval seconds on the clock thread"""
+        with self._wake:
+            if self._tick_callback is not None:
+                return
+            self._interval = interval
+            self._tick_callback = callback
+            self._next_tick = time.monotonic()
+            self._ensure_thread()
+            self._wake.notify()
+
+    def set_alarm(self, when: float, callback: Callable[[float], None]):
+        """Call callback once at monotonic time when"""
+        with self._wake:
+            self._alarm_time = when
+            self._alarm_callback = callback
+            self._ensure_thread()
+            self._wake.notify()
+
+    def cancel_alarm(self):
+        """Drop the pending alarm"""
+        with self._wake:
+            self._alarm_time = None
+            self._alarm_callback = None
+            self._wake.notify()
+
+    def _run(self):
+        """Clock thread body"""
+        while True:
+            with self._wake:
+                now = time.monotonic()
+                deadlines = []
+                if self._tick_callback is not None:
+                    deadlines.append(self._next_tick)
+                if self._alarm_callback is not None:
+                    deadlines.append(self._alarm_time)
+                if not deadlines:
+                    # Nothing scheduled: sleep until start_ticker or set_alarm
+                    self._wake.wait()
+                    continue
+                if min(deadlines) > now:
+                    self._wake.wait(min(deadlines) - now)
+                    continue
+
+                # Pick what is due while holding the lock, call it after
+                tick = None
+                if self._tick_callback is not None and self._next_tick <= now:
+                    tick = self._tick_callback
+                    self._next_tick += self._interval
+                    if self._next_tick <= now:
+                        # Fell behind: skip missed ticks instead of bursting
+                        self._next_tick = now + self._interval
+                alarm = None
+                if self._alarm_callback is not None and self._alarm_time <= now:
+                    alarm = self._alarm_callback
+                    self._alarm_time = None
+                    self._alarm_callback = None
+
+            if tick is not None:
+                tick(now)
+            if alarm is not None:
+                alarm(now)
+
+    def stop_ticker(self):
+        """Stop the periodic ticker"""
+        with self._wake:
+            self._tick_callback = None
+            self._wake.notify()
+
+    def ticker_running(self) -> bool:
+        """Whether the ticker is active"""
+        return self._tick_callback is not None and self._thread is not None and self._thread.is_alive()
+
+
+class PygameBackend(WallClockBackend):
+    """Native pygame.mixer output (SDL mixes the channels)"""
+
+    def init(self, frequency: int, buffer_size: int, num_channels: int):
+        """Initialize only the pygame mixer subsystem"""
+        import_pygame()
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=frequency, size=-16, channels=2, buffer=buffer_size)
+        pygame.mixer.set_num_channels(num_channels)
+
+    def quit(self):
+        """Close the mixer"""
+        self.stop_ticker()
+        if pygame is not None:
+            pygame.mixer.quit()
+
+    def load_sound(self, sound_path: str):
+        """Decode a sound file with pygame"""
+        return pygame.mixer.Sound(sound_path)
+
+    def find_channel(self):
+        """Return an idle pygame channel"""
+        return pygame.mixer.find_channel()
+
+    def create_sound(self, name: str, source, seconds: float = 60.0):
+        """Pre-render a generated source into a looping pygame sound
+
+        SDL mixes fixed buffers, so the native path cannot stream a source;
+        the software-mixed outputs play it live instead.
+        """
+        from audio_io import to_int16
+        from mix_engine import render_source
+        frequency = pygame.mixer.get_init()[0]
+        data = render_source(source, frequency, seconds, 'stereo')
+        return pygame.mixer.Sound(buffer=to_int16(data).tobytes())
+
+    def sound_bytes(self, sound) -> int:
+        """Bytes of a sound expanded to the mixer format"""
+        frequency, size, channels = pygame.mixer.get_init()
+        return int(round(sound.get_length() * frequency)) * channels * abs(size) // 8
+
+
+class FakeSound:
+    """In-memory stand-in for pygame.mixer.Sound"""
+
+    def __init__(self, sound_path: str, length: float = 60.0):
+        self.sound_path = sound_path
+        self.length = length
+        self.volume = 1.0
+
+    def set_volume(self, volume: float):
+        self.volume = volume
+
+    def get_volume(self) -> float:
+        return self.volume
+
+    def get_length(self) -> float:
+        return self.length
+
+
+class FakeChannel:
+    """In-memory stand-in for pygame.mixer.Channel that records gain changes"""
+
+    def __init__(self, backend: 'FakeBackend', index: int):
+        self.backend = backend
+        self.index = index
+        self.sound: Optional[FakeSound] = None
+        self.busy = False
+        self.paused = False
+        self.volume: Tuple[float, float] = (1.0, 1.0)
+        # (virtual time, left, right) for every set_volume call
+        self.history: List[Tuple[float, float, float]] = []
+        self.record = True
+
+    def play(self, sound: FakeSound, loops: int = 0):
+        self.sound = sound
+        self.busy = True
+        self.paused = False
+
+    def pause(self):
+        self.paused = True
+
+    def unpause(self):
+        self.paused = False
+
+    def stop(self):
+        self.sound = None
+        self.busy = False
+        self.paused = False
+
+    def set_volume(self, left: float, right: Optional[float] = None):
+        if right is None:
+            right = left
+        self.volume = (left, right)
+        if self.record:
+            self.history.append((self.backend.clock, left, right))
+
+    def get_volume(self) -> float:
+        return max(self.volume)
+
+    def get_busy(self) -> bool:
+        return self.busy
+
+
+class FakeBackend(MixerBackend):
+    """Deterministic backend driven by a virtual clock
+
+    Nothing happens until advance() is called, which runs every control
+    tick that falls inside the advanced span synchronously. Hours of fades
+    and effects simulate in well under a second.
+    """
+
+    def __init__(self, sound_length: float = 60.0, missing: Tuple[str, ...] = ()):
+        self.clock = 0.0
+        self.sound_length = sound_length
+        self.missing = set(missing)
+        self.channels: List[FakeChannel] = []
+        self.loaded: List[str] = []
+        self.initialized = False
+        self._interval: Optional[float] = None
+        self._callback: Optional[Callable[[float], None]] = None
+        self._next_tick = 0.0
+        self.ticks = 0
+        self._alarm_time: Optional[float] = None
+        self._alarm_callback: Optional[Callable[[float], None]] = None
+
+    def init(self, frequency: int, buffer_size: int, num_channels: int):
+        self.channels = [FakeChannel(self, i) for i in range(num_channels)]
+        self.initialized = True
+
+    def quit(self):
+        self.stop_ticker()
+        self.initialized = False
+
+    def exists(self, sound_path: str) -> bool:
+        return sound_path not in self.missing
+
+    def load_sound(self, sound_path: str) -> FakeSound:
+        if sound_path in self.missing:
+            raise FileNotFoundError(sound_path)
+        self.loaded.append(sound_path)
+        return FakeSound(sound_path, self.sound_length)
+
+    def find_channel(self) -> Optional[FakeChannel]:
+        for channel in self.channels:
+            if not channel.busy:
+                return channel
+        return None
+
+    def create_sound(self, name: str, source) -> FakeSound:
+        self.loaded.append(name)
+        return FakeSound(name, self.sound_length)
+
+    def sound_bytes(self, sound: FakeSound) -> int:
+        # Sized as 16-bit stereo at 44.1 kHz, the pygame mixer format
+        return int(sound.length * 44100) * 4
+
+    def now(self) -> float:
+        return self.clock
+
+    def start_ticker(self, interval: float, callback: Callable[[float], None]):
+        if self.ticker_running():
+            return
+        self._interval = interval
+        self._callback = callback
+        self._next_tick = self.clock
+
+    def stop_ticker(self):
+        self._callback = None
+
+    def ticker_running(self) -> bool:
+        return self._callback is not None
+
+    def set_alarm(self, when: float, callback: Callable[[float], None]):
+        self._alarm_time = when
+        self._alarm_callback = callback
+
+    def cancel_alarm(self):
+        self._alarm_time = None
+        self._alarm_callback = None
+
+    def advance(self, seconds: float):
+        """Move the virtual clock forward, firing due ticks and alarms in order"""
+        target = self.clock + seconds
+        while True:
+            tick_due = self._callback is not None and self._next_tick <= target
+            alarm_due = self._alarm_callback is not None and self._alarm_time <= target
+            if not tick_due and not alarm_due:
+                break
+            if alarm_due and (not tick_due or self._alarm_time < self._next_tick):
+                self.clock = max(self.clock, self._alarm_time)
+                callback = self._alarm_callback
+                self._alarm_time = None
+                self._alarm_callback = None
+                callback(self.clock)
+                continue
+            self.clock = self._next_tick
+            self.ticks += 1
+            self._callback(self.clock)
+            if self._interval is None:
+                break
+            self._next_tick += self._interval
+        self.clock = target
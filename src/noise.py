@@ -0,0 +1,96 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Names live in a numpy-free module so the GUI can list them at startup
+from noise_catalog import NOISE_COLORS, NOISE_PREFIX, is_noise, noise_names  # noqa: F401
+
+# One-pole filters run over chunks of this many frames; a^-CHUNK must stay
+# inside float64 range for the fastest pole
+CHUNK = 512
+
+
+class OnePoleBank:
+    """Parallel one-pole lowpass filters y[n] = a*y[n-1] + g*x[n], plus a direct path
+
+    Each chunk is solved in closed form,
+    y[n] = a^(n+1) * y[-1] + g * a^n * cumsum(a^-k * x[k]),
+    so a block costs a few vector operations instead of a sample loop.
+    """
+
+    def __init__(self, poles: Sequence[float], gains: Sequence[float], direct: float = 0.0):
+        self.direct = direct
+        self.poles = np.asarray(poles, dtype=np.float64)[:, None]
+        self.gains = np.asarray(gains, dtype=np.float64)[:, None]
+        self.state = np.zeros(len(poles), dtype=np.float64)
+
+        k = np.arange(CHUNK, dtype=np.float64)[None, :]
+        self.powers = self.poles ** k
+        self.next_powers = self.poles ** (k + 1)
+        self.inverse_powers = self.poles ** -k
+
+    def variance(self) -> float:
+        """Output variance of the summed filters for unit white input"""
+        # The direct path behaves as a pole at zero
+        a = np.append(self.poles[:, 0], 0.0)
+        g = np.append(self.gains[:, 0], self.direct)
+        return float(np.sum(np.outer(g, g) / (1.0 - np.outer(a, a))))
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Filter a chunk of at most CHUNK samples, returns the summed output"""
+        n = x.shape[0]
+        acc = np.cumsum(self.inverse_powers[:, :n] * x[None, :], axis=1)
+        y = self.next_powers[:, :n] * self.state[:, None] + self.gains * self.powers[:, :n] * acc
+        self.state = y[:, -1].copy()
+        return y.sum(axis=0) + self.direct * x
+
+
+class NoiseSource:
+    """Endless white, pink or brown noise generated block by block
+
+    Uses constant memory and no disk I/O; the seeded generator makes a
+    given seed reproduce the same stream.
+    """
+
+    def __init__(self, color: str = 'pink', sample_rate: int = 44100, seed: Optional[int] = None,
+                 level: float = 0.15):
+        if color not in NOISE_COLORS:
+            raise ValueError(f"Unknown noise color: {color} (choose from {', '.join(NOISE_COLORS)})")
+        self.color = color
+        self.sample_rate = sample_rate
+        self.rng = np.random.default_rng(seed)
+
+        if color == 'pink':
+            # Paul Kellet's economy pink filter: three poles plus a direct path
+            self.filters = OnePoleBank([0.99765, 0.96300, 0.57000],
+                                       [0.0990460, 0.2965164, 1.0526913], direct=0.1848)
+        elif color == 'brown':
+            # Leaky integrator: 1/f^2 above a 10 Hz corner, bounded below it
+            pole = 1.0 - 2 * np.pi * 10.0 / sample_rate
+            self.filters = OnePoleBank([pole], [1.0])
+        else:
+            self.filters = None
+
+        # Scale the filtered noise to the requested RMS level
+        variance = self.filters.variance() if self.filters else 1.0
+        self.scale = level / np.sqrt(variance)
+
+    @classmethod
+    def from_name(cls, sound_name: str, sample_rate: int = 44100, **kwargs) -> 'NoiseSource':
+        """Create a source from a "noise:<color>" sound name"""
+        return cls(sound_name[len(NOISE_PREFIX):], sample_rate, **kwargs)
+
+    @property
+    def nbytes(self) -> int:
+        return 0
+
+    def read(self, frames: int, out: np.ndarray):
+        """Fill out[:frames] with the next samples"""
+        white = self.rng.standard_normal(frames)
+        if self.filters is None:
+            np.multiply(white, self.scale, out=out[:frames], casting='same_kind')
+            return
+        for start in range(0, frames, CHUNK):
+            chunk = white[start:start + CHUNK]
+            np.multiply(self.filters.process(chunk), self.scale,
+                        out=out[start:start + chunk.shape[0]], casting='same_kind')
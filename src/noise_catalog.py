@@ -0,0 +1,13 @@
+# Noise colors available as sound names "noise:<color>"
+NOISE_COLORS = ('white', 'pink', 'brown')
+NOISE_PREFIX = 'noise:'
+
+
+def is_noise(sound_name: str) -> bool:
+    """Whether a sound name refers to a procedural noise source"""
+    return sound_name.startswith(NOISE_PREFIX) and sound_name[len(NOISE_PREFIX):] in NOISE_COLORS
+
+
+def noise_names() -> list:
+    """Sound names of every noise color"""
+    return [NOISE_PREFIX + color for color in NOISE_COLORS]
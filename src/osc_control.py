@@ -0,0 +1,223 @@
+import socket
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Address layout: /mixer/<sound>/<parameter> [value]
+OSC_PREFIX = '/mixer/'
+PARAMETERS = ('volume', 'pan', 'play', 'pause', 'stop', 'breathing', 'random_pan')
+DEFAULT_PORT = 9000
+
+
+def _read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """Null-terminated string padded to 4 bytes"""
+    end = data.index(b'\0', offset)
+    return data[offset:end].decode('utf-8'), (end + 4) & ~3
+
+
+def parse_message(data: bytes) -> Tuple[str, list]:
+    """Decode one OSC message into (address, arguments)"""
+    address, offset = _read_string(data, 0)
+    if offset >= len(data):
+        return address, []
+    tags, offset = _read_string(data, offset)
+    args = []
+    for tag in tags[1:]:
+        if tag == 'f':
+            args.append(struct.unpack_from('>f', data, offset)[0])
+            offset += 4
+        elif tag == 'i':
+            args.append(struct.unpack_from('>i', data, offset)[0])
+            offset += 4
+        elif tag == 'd':
+            args.append(struct.unpack_from('>d', data, offset)[0])
+            offset += 8
+        elif tag == 's':
+            value, offset = _read_string(data, offset)
+            args.append(value)
+        elif tag in 'TF':
+            args.append(tag == 'T')
+        else:
+            raise ValueError(f"Unsupported OSC type tag: {tag}")
+    return address, args
+
+
+def parse_packet(data: bytes) -> List[Tuple[str, list]]:
+    """Decode a message or a (nested) bundle into a list of messages"""
+    if not data.startswith(b'#bundle\0'):
+        return [parse_message(data)]
+    messages = []
+    # Skip the bundle header and time tag; elements are applied immediately
+    offset = 16
+    while offset + 4 <= len(data):
+        size = struct.unpack_from('>i', data, offset)[0]
+        messages.extend(parse_packet(data[offset + 4:offset + 4 + size]))
+        offset += 4 + size
+    return messages
+
+
+def build_message(address: str, *args) -> bytes:
+    """Encode an OSC message (float, int, str and bool arguments)"""
+    def padded(text: str) -> bytes:
+        raw = text.encode('utf-8') + b'\0'
+        return raw + b'\0' * (-len(raw) % 4)
+
+    tags = ','
+    payload = b''
+    for arg in args:
+        if isinstance(arg, bool):
+            tags += 'T' if arg else 'F'
+        elif isinstance(arg, int):
+            tags += 'i'
+            payload += struct.pack('>i', arg)
+        elif isinstance(arg, float):
+            tags += 'f'
+            payload += struct.pack('>f', arg)
+        else:
+            tags += 's'
+            payload += padded(str(arg))
+    return padded(address) + padded(tags) + payload
+
+
+class OSCListener:
+    """UDP OSC input for the mixer, coalesced per control tick
+
+    A dedicated socket thread only parses datagrams and overwrites the
+    latest value for each (sound, parameter). The player's control tick
+    swaps that table out and applies it, so a fader sending at hundreds of
+    Hz costs at most one set_volume per tick and a flood never queues up
+    behind the control path.
+    """
+
+    def __init__(self, player, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 resolve: Optional[Callable[[str], str]] = None,
+                 on_apply: Optional[Callable[[Dict[Tuple[str, str], object]], None]] = None):
+        self.player = player
+        self.host = host
+        self.port = port
+        # Maps an OSC sound name to the player's sound path
+        self.resolve = resolve or (lambda name: name)
+        # Called with every applied batch (e.g. to update the GUI)
+        self.on_apply = on_apply
+
+        self.pending: Dict[Tuple[str, str], object] = {}
+        self.lock = threading.Lock()
+        self.received = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.errors = 0
+
+        self.sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        """Bind the socket and start listening"""
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Room for bursts while the thread is descheduled
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind((self.host, self.port))
+        self.port = self.sock.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.player.add_tick_hook(self.apply_pending)
+        print(f"OSC listening on {self.host}:{self.port}")
+
+    def _run(self):
+        """Socket thread: parse and coalesce"""
+        while self._running:
+            try:
+                data, _ = self.sock.recvfrom(65536)
+            except OSError:
+                break
+            if not self._running:
+                break
+            try:
+                messages = parse_packet(data)
+            except Exception:
+                self.errors += 1
+                continue
+            with self.lock:
+                for address, args in messages:
+                    self.received += 1
+                    key = self._key(address)
+                    if key is None:
+                        self.errors += 1
+                        continue
+                    if key in self.pending:
+                        self.coalesced += 1
+                    self.pending[key] = args[0] if args else True
+
+    def _key(self, address: str) -> Optional[Tuple[str, str]]:
+        """(sound, parameter) for an address, None if not ours"""
+        if not address.startswith(OSC_PREFIX):
+            return None
+        sound, _, parameter = address[len(OSC_PREFIX):].rpartition('/')
+        if not sound or parameter not in PARAMETERS:
+            return None
+        return sound, parameter
+
+    def apply_pending(self, now: float = 0.0):
+        """Control tick hook: apply the latest value of every parameter"""
+        if not self.pending:
+            return
+        with self.lock:
+            batch, self.pending = self.pending, {}
+
+        player = self.player
+        for (sound, parameter), value in batch.items():
+            sound_path = self.resolve(sound)
+            try:
+                if parameter == 'volume':
+                    player.set_volume(sound_path, min(1.0, max(0.0, float(value))))
+                elif parameter == 'pan':
+                    player.set_pan(sound_path, min(1.0, max(-1.0, float(value))))
+                elif parameter == 'play':
+                    if value:
+                        player.unpause_sound(sound_path) or player.play(sound_path)
+                    else:
+                        player.pause_sound(sound_path)
+                elif parameter == 'pause':
+                    player.pause_sound(sound_path)
+                elif parameter == 'stop':
+                    player.stop_sound(sound_path)
+                elif parameter == 'breathing':
+                    if value:
+                        player.start_breathing(sound_path)
+                    else:
+                        player.stop_breathing(sound_path)
+                elif parameter == 'random_pan':
+                    if value:
+                        player.start_random_pan(sound_path)
+                    else:
+                        player.stop_random_pan(sound_path)
+                self.applied += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Error applying OSC {sound}/{parameter}: {e}")
+
+        if self.on_apply:
+            self.on_apply(batch)
+
+    def stats(self) -> dict:
+        """Message counters"""
+        return {'received': self.received, 'coalesced': self.coalesced,
+                'applied': self.applied, 'errors': self.errors}
+
+    def stop(self):
+        """Stop listening and release the port"""
+        if not self._running:
+            return
+        self._running = False
+        self.player.remove_tick_hook(self.apply_pending)
+        try:
+            # Wake the blocking recvfrom with an empty datagram
+            waker = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            waker.sendto(b'', (self.host if self.host != '0.0.0.0' else '127.0.0.1', self.port))
+            waker.close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.sock.close()
@@ -0,0 +1,235 @@
+import time
+import wave
+
+import numpy as np
+
+from audio_io import to_int16
+from mixer_backend import import_pygame
+
+
+class NullSink:
+    """Sink that discards audio, used for tests and benchmarks"""
+
+    # Rendering must be paced by the caller
+    paced = False
+
+    def __init__(self, channels: int = 2, sample_rate: int = 44100):
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.frames_written = 0
+
+    def write(self, block: np.ndarray):
+        """Accept a (frames, channels) block"""
+        self.frames_written += block.shape[0]
+
+    def close(self):
+        """Nothing to release"""
+        pass
+
+
+class WavFileSink:
+    """Sink that streams rendered blocks into a 16-bit WAV file"""
+
+    # Rendering must be paced by the caller
+    paced = False
+
+    def __init__(self, file_path: str, channels: int = 2, sample_rate: int = 44100):
+        self.file_path = file_path
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.frames_written = 0
+
+        self.wav = wave.open(file_path, 'wb')
+        self.wav.setnchannels(channels)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray):
+        """Append a (frames, channels) block"""
+        self.wav.writeframes(to_int16(block).tobytes())
+        self.frames_written += block.shape[0]
+
+    def close(self):
+        """Finalize the WAV header"""
+        if self.wav:
+            self.wav.close()
+            self.wav = None
+
+
+class PygameStreamSink:
+    """Sink that streams rendered blocks to the default device through pygame
+
+    Blocks are grouped into chunks and queued on a reserved channel. write()
+    blocks while a chunk is already queued, which paces the renderer. If the
+    channel went idle before the next chunk arrived, an underrun is counted.
+    """
+
+    # Rendering is paced by the device, not by a timer
+    paced = True
+
+    def __init__(self, channels: int = 2, sample_rate: int = 44100, buffer_size: int = 512,
+                 chunk_blocks: int = 4):
+        pygame = import_pygame()
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=sample_rate, size=-16, channels=channels, buffer=buffer_size)
+        self.pygame = pygame
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.chunk_frames = buffer_size * chunk_blocks
+        self.channel = pygame.mixer.Channel(0)
+        pygame.mixer.set_reserved(1)
+
+        # A full chunk may be queued behind the one playing, plus the device buffer
+        self.output_latency = (self.chunk_frames + buffer_size) / sample_rate
+
+        self.pending = np.zeros((self.chunk_frames, channels), dtype=np.float32)
+        self.filled = 0
+        self.started = False
+        self.frames_written = 0
+        self.underruns = 0
+
+    def write(self, block: np.ndarray):
+        """Append a block, queueing a chunk on the device when full"""
+        frames = block.shape[0]
+        self.pending[self.filled:self.filled + frames] = block
+        self.filled += frames
+        self.frames_written += frames
+        if self.filled < self.chunk_frames:
+            return
+
+        sound = self.pygame.mixer.Sound(buffer=to_int16(self.pending).tobytes())
+        self.filled = 0
+
+        # Wait for room in the one-slot queue
+        while self.channel.get_queue() is not None:
+            time.sleep(self.chunk_frames / self.sample_rate / 8)
+
+        if not self.channel.get_busy():
+            if self.started:
+                self.underruns += 1
+            self.channel.play(sound)
+            self.started = True
+        else:
+            self.channel.queue(sound)
+
+    def close(self):
+        """Stop the stream"""
+        self.channel.stop()
+
+
+class PortAudioSink:
+    """Callback-driven PortAudio stream (requires the sounddevice package)
+
+    The device asks for each block from its own thread; output underflows
+    reported by PortAudio are counted as underruns.
+    """
+
+    def __init__(self, channels: int = 2, sample_rate: int = 44100, buffer_size: int = 512,
+                 device=None):
+        try:
+            import sounddevice
+        except ImportError:
+            raise RuntimeError("PortAudio output needs the 'sounddevice' package")
+
+        self.sounddevice = sounddevice
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.buffer_size = buffer_size
+        self.device = device
+        self.stream = None
+        self.render = None
+        self.output_latency = buffer_size / sample_rate
+        self.frames_written = 0
+        self.underruns = 0
+
+    def start(self, render):
+        """Open the stream; render() must return one (buffer_size, channels) block"""
+        self.render = render
+        self.stream = self.sounddevice.OutputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.buffer_size,
+            channels=self.channels,
+            dtype='float32',
+            device=self.device,
+            callback=self._callback
+        )
+        self.stream.start()
+        self.output_latency = self.stream.latency
+
+    def _callback(self, outdata, frames, time_info, status):
+        """PortAudio callback"""
+        if status.output_underflow:
+            self.underruns += 1
+        try:
+            outdata[:] = self.render()
+        except Exception as e:
+            outdata.fill(0)
+            print(f"Error rendering audio block: {e}")
+        self.frames_written += frames
+
+    def close(self):
+        """Stop and close the stream"""
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class CaptureSink:
+    """Loopback sink that keeps a copy of every block with its write time
+
+    Blocks are forwarded to an optional target sink, so the capture sees
+    exactly what the device or file receives. output_latency is taken from
+    the target (0 for files and the null sink).
+    """
+
+    def __init__(self, target=None, channels: int = 2, sample_rate: int = 44100):
+        self.target = target
+        self.channels = target.channels if target is not None else channels
+        self.sample_rate = target.sample_rate if target is not None else sample_rate
+        self.paced = getattr(target, 'paced', False)
+        self.blocks = []
+        self.times = []
+        self.frames_written = 0
+
+    @property
+    def output_latency(self) -> float:
+        return getattr(self.target, 'output_latency', 0.0)
+
+    @property
+    def underruns(self) -> int:
+        return getattr(self.target, 'underruns', 0)
+
+    def _capture(self, block: np.ndarray):
+        self.times.append(time.monotonic())
+        self.blocks.append(block.copy())
+        self.frames_written += block.shape[0]
+
+    def write(self, block: np.ndarray):
+        """Record a block and pass it on"""
+        self._capture(block)
+        if self.target is not None:
+            self.target.write(block)
+
+    def close(self):
+        """Close the target sink"""
+        if self.target is not None:
+            self.target.close()
+
+    def samples(self) -> np.ndarray:
+        """All captured audio as one (frames, channels) array"""
+        if not self.blocks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(self.blocks)
+
+
+class CaptureCallbackSink(CaptureSink):
+    """CaptureSink for callback-driven targets such as PortAudioSink"""
+
+    def start(self, render):
+        """Wrap the render function so pulled blocks are recorded"""
+        def capture_render():
+            block = render()
+            self._capture(block)
+            return block
+        self.target.start(capture_render)
@@ -0,0 +1,91 @@
+import random
+from typing import List, Optional, Tuple
+
+
+class RandomPanTrajectory:
+    """Smooth random pan path built from a precomputed periodic spline
+
+    Control points are drawn once within +/- pan_range and joined by cubic
+    Hermite segments with tangents in pan units per second, so the path is
+    smooth in time even with uneven segment lengths. Evaluation only walks a
+    cursor and runs a cubic on plain floats, so a control tick allocates
+    nothing.
+    """
+
+    def __init__(self, pan_range: float = 0.8, speed: float = 1.0,
+                 seed: Optional[int] = None, points: int = 96,
+                 min_interval: float = 2.0, max_interval: float = 5.0):
+        if points < 3:
+            raise ValueError("A trajectory needs at least 3 control points")
+        if speed <= 0:
+            raise ValueError("Speed must be positive")
+
+        self.pan_range = pan_range
+        self.speed = speed
+        self.seed = seed
+        rng = random.Random(seed)
+
+        # Control points and their spacing in seconds
+        values = [rng.uniform(-pan_range, pan_range) for _ in range(points)]
+        durations = [rng.uniform(min_interval, max_interval) / speed for _ in range(points)]
+
+        # Catmull-Rom style tangents, scaled by time so velocity stays continuous
+        tangents = []
+        for i in range(points):
+            prev_i = (i - 1) % points
+            next_i = (i + 1) % points
+            span = durations[prev_i] + durations[i]
+            tangents.append((values[next_i] - values[prev_i]) / span)
+
+        # Segment table: (start time, end time, 1 / duration, a, b, c, d)
+        self.segments: List[Tuple[float, ...]] = []
+        start = 0.0
+        for i in range(points):
+            j = (i + 1) % points
+            dur = durations[i]
+            p1, p2 = values[i], values[j]
+            m1, m2 = tangents[i] * dur, tangents[j] * dur
+            a = 2 * p1 + m1 - 2 * p2 + m2
+            b = -3 * p1 - 2 * m1 + 3 * p2 - m2
+            self.segments.append((start, start + dur, 1.0 / dur, a, b, m1, p1))
+            start += dur
+
+        self.period = start
+        self.cursor = 0
+        self.origin = 0.0
+
+    def start(self, now: float, current: float = 0.0):
+        """Begin following the path from the current time
+
+        The path is entered at the point closest to the current pan so that
+        starting the effect does not jump.
+        """
+        best_index = 0
+        best_distance = None
+        for i, segment in enumerate(self.segments):
+            distance = abs(segment[6] - current)
+            if best_distance is None or distance < best_distance:
+                best_index, best_distance = i, distance
+        self.cursor = best_index
+        self.origin = now - self.segments[best_index][0]
+
+    def value_at(self, now: float) -> float:
+        """Evaluate the pan for a monotonic timestamp"""
+        t = (now - self.origin) % self.period
+        segments = self.segments
+
+        # Time only moves forward, so the cursor normally advances in place
+        if t < segments[self.cursor][0]:
+            self.cursor = 0
+        last = len(segments) - 1
+        while self.cursor < last and t >= segments[self.cursor][1]:
+            self.cursor += 1
+
+        start, _, inv_dur, a, b, c, d = segments[self.cursor]
+        u = (t - start) * inv_dur
+        value = ((a * u + b) * u + c) * u + d
+        if value > self.pan_range:
+            return self.pan_range
+        if value < -self.pan_range:
+            return -self.pan_range
+        return value
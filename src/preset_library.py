@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+INDEX_VERSION = 1
+
+
+class PresetLibrary:
+    """Library of saved mixes with an index kept apart from preset bodies
+
+    Bodies are appended as compact JSON records to presets.dat. The index
+    (index.json) holds name, tags, sounds, modified time and the byte range
+    of each body, so listing and searching never read a body and opening a
+    preset is one seek and one small read.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.data_file = os.path.join(directory, 'presets.dat')
+        self.index_file = os.path.join(directory, 'index.json')
+        self.lock = threading.Lock()
+
+        # name -> {'name', 'tags', 'sounds', 'modified', 'offset', 'length'}
+        self.entries: Dict[str, dict] = {}
+        # Inverted maps for tag and sound filters
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.by_sound: Dict[str, Set[str]] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Read the index file"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                for entry in index.get('presets', []):
+                    self._add_entry(entry)
+        except Exception as e:
+            print(f"Error loading preset index: {e}")
+
+    def _write_index(self):
+        """Atomically replace the index file"""
+        temp_file = self.index_file + '.tmp'
+        index = {'version': INDEX_VERSION, 'presets': list(self.entries.values())}
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(temp_file, self.index_file)
+
+    def _add_entry(self, entry: dict):
+        """Register an index entry and its inverted keys"""
+        self._drop_entry(entry['name'])
+        self.entries[entry['name']] = entry
+        for tag in entry['tags']:
+            self.by_tag.setdefault(tag.lower(), set()).add(entry['name'])
+        for sound in entry['sounds']:
+            self.by_sound.setdefault(sound.lower(), set()).add(entry['name'])
+
+    def _drop_entry(self, name: str) -> Optional[dict]:
+        """Remove an index entry and its inverted keys"""
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return None
+        for key, table in (('tags', self.by_tag), ('sounds', self.by_sound)):
+            for value in entry[key]:
+                names = table.get(value.lower())
+                if names:
+                    names.discard(name)
+                    if not names:
+                        del table[value.lower()]
+        return entry
+
+    def save(self, name: str, sounds: Dict[str, dict], tags: Iterable[str] = (),
+             extra: Optional[dict] = None, write_index: bool = True) -> dict:
+        """Save or replace a preset, returns its index entry
+
+        Bulk imports pass write_index=False and call flush() at the end.
+        """
+        body = {'name': name, 'sounds': sounds}
+        if extra:
+            body.update(extra)
+        data = json.dumps(body, separators=(',', ':')).encode('utf-8') + b'\n'
+
+        with self.lock:
+            with open(self.data_file, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+
+            entry = {
+                'name': name,
+                'tags': sorted(set(tags)),
+                'sounds': sorted(sounds),
+                'modified': time.time(),
+                'offset': offset,
+                'length': len(data),
+            }
+            self._add_entry(entry)
+            if write_index:
+                self._write_index()
+        return entry
+
+    def flush(self):
+        """Write the index after unflushed saves"""
+        with self.lock:
+            self._write_index()
+
+    def load(self, name: str) -> Optional[dict]:
+        """Read one preset body"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        try:
+            with open(self.data_file, 'rb') as f:
+                f.seek(entry['offset'])
+                return json.loads(f.read(entry['length']))
+        except Exception as e:
+            print(f"Error loading preset {name}: {e}")
+            return None
+
+    def delete(self, name: str) -> bool:
+        """Remove a preset from the index"""
+        with self.lock:
+            if self._drop_entry(name) is None:
+                return False
+            self._write_index()
+        return True
+
+    def list(self) -> List[dict]:
+        """All index entries, most recently modified first"""
+        return sorted(self.entries.values(), key=lambda e: e['modified'], reverse=True)
+
+    def search(self, text: str = '', tags: Iterable[str] = (), sounds: Iterable[str] = (),
+               limit: Optional[int] = None) -> List[dict]:
+        """Find presets by name/tag text and required tags and sounds"""
+        candidates: Optional[Set[str]] = None
+        for key, table in ((tags, self.by_tag), (sounds, self.by_sound)):
+            for value in key:
+                names = table.get(value.lower(), set())
+                candidates = set(names) if candidates is None else candidates & names
+                if not candidates:
+                    return []
+
+        entries = (self.entries.values() if candidates is None
+                   else (self.entries[n] for n in candidates))
+        text = text.lower()
+        if text:
+            entries = (e for e in entries
+                       if text in e['name'].lower() or any(text in t.lower() for t in e['tags']))
+
+        results = sorted(entries, key=lambda e: e['modified'], reverse=True)
+        return results[:limit] if limit else results
+
+    def garbage_bytes(self) -> int:
+        """Bytes in the data file no longer referenced by the index"""
+        try:
+            size = os.path.getsize(self.data_file)
+        except OSError:
+            return 0
+        return size - sum(e['length'] for e in self.entries.values())
+
+    def compact(self):
+        """Rewrite the data file without replaced or deleted bodies"""
+        with self.lock:
+            temp_file = self.data_file + '.tmp'
+            with open(self.data_file, 'rb') as src, open(temp_file, 'wb') as dst:
+                for entry in sorted(self.entries.values(), key=lambda e: e['offset']):
+                    src.seek(entry['offset'])
+                    data = src.read(entry['length'])
+                    entry['offset'] = dst.tell()
+                    dst.write(data)
+            os.replace(temp_file, self.data_file)
+            self._write_index()
@@ -0,0 +1,85 @@
+from typing import Callable, Optional
+
+
+class ParameterRamp:
+    """Slew-limited parameter ramp that can be retargeted in flight
+
+    A new target only moves the endpoint; the value keeps travelling from
+    where it is, so a burst of control events costs O(1) each and never
+    restarts the movement. Ramps are advanced by the player's control tick.
+    """
+
+    __slots__ = ('value', 'target', 'rate', 'duration', 'callback', 'active', 'dirty')
+
+    def __init__(self, value: float = 0.0, duration: float = 0.9):
+        self.value = value
+        self.target = value
+        self.rate = 0.0
+        self.duration = duration
+        self.callback: Optional[Callable] = None
+        self.active = False
+        self.dirty = False
+
+    def set_target(self, target: float, duration: Optional[float] = None,
+                   callback: Optional[Callable] = None):
+        """Move the ramp endpoint, arriving duration seconds from now
+
+        The new target replaces the pending completion callback with its
+        own (or none): a fade-out whose level is taken over by a slider is
+        abandoned, not finished at the slider's level.
+        """
+        duration = self.duration if duration is None else duration
+        distance = abs(target - self.value)
+        self.target = target
+        self.callback = callback
+
+        if duration <= 0 or distance == 0:
+            self.jump(target)
+            return
+
+        # Paced by this target's own duration, so a slow drift that follows
+        # a fast slider move does not inherit its speed
+        self.rate = distance / duration
+        self.active = True
+
+    def jump(self, value: float):
+        """Set the value immediately and stop the ramp"""
+        self.value = value
+        self.target = value
+        self.rate = 0.0
+        self.active = False
+        self.dirty = True
+
+    def cancel(self):
+        """Stop where the ramp currently is"""
+        self.target = self.value
+        self.rate = 0.0
+        self.active = False
+        self.callback = None
+
+    def advance(self, dt: float) -> bool:
+        """Move toward the target by dt seconds, returns True if the value changed"""
+        changed = self.dirty
+        self.dirty = False
+        if not self.active:
+            return changed
+
+        step = self.rate * dt
+        remaining = self.target - self.value
+        if abs(remaining) <= step:
+            self.value = self.target
+            self.rate = 0.0
+            self.active = False
+        elif remaining > 0:
+            self.value += step
+        else:
+            self.value -= step
+        return True
+
+    def pop_callback(self) -> Optional[Callable]:
+        """Return the completion callback once the ramp has finished"""
+        if self.active or self.callback is None:
+            return None
+        callback = self.callback
+        self.callback = None
+        return callback
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+import wave
+from typing import Optional
+
+import numpy as np
+
+from audio_io import to_int16
+
+# Largest data chunk a RIFF/WAV file can describe
+WAV_LIMIT = 2 ** 32 - 1 - 44
+RECORD_FORMATS = ('.wav', '.flac')
+
+
+class RingBuffer:
+    """Single-producer, single-consumer ring of int16 frames
+
+    The audio thread only advances `written` and the writer thread only
+    advances `read`. Both are ever-increasing frame counters and each is
+    published after its data copy, so neither side takes a lock. A block
+    that does not fit is dropped and counted instead of waiting.
+    """
+
+    def __init__(self, frames: int, channels: int):
+        self.data = np.zeros((frames, channels), dtype=np.int16)
+        self.capacity = frames
+        self.written = 0
+        self.read = 0
+        self.overruns = 0
+        self.dropped_frames = 0
+
+    def available(self) -> int:
+        """Frames waiting to be read"""
+        return self.written - self.read
+
+    def push(self, block: np.ndarray) -> bool:
+        """Copy a float block in (audio thread), False if it was dropped"""
+        frames = block.shape[0]
+        if frames > self.capacity - (self.written - self.read):
+            self.overruns += 1
+            self.dropped_frames += frames
+            return False
+        start = self.written % self.capacity
+        first = min(frames, self.capacity - start)
+        samples = to_int16(block)
+        self.data[start:start + first] = samples[:first]
+        if first < frames:
+            self.data[:frames - first] = samples[first:]
+        self.written += frames
+        return True
+
+    def peek(self, frames: int) -> np.ndarray:
+        """Contiguous view of up to frames unread frames (writer thread)"""
+        start = self.read % self.capacity
+        frames = min(frames, self.available(), self.capacity - start)
+        return self.data[start:start + frames]
+
+    def advance(self, frames: int):
+        """Release frames returned by peek()"""
+        self.read += frames
+
+
+class Recorder:
+    """Record the final mix to WAV or FLAC without blocking the audio thread
+
+    push() runs on the render thread and only copies the block into a
+    fixed ring buffer. A writer thread wakes a few times per chunk and
+    writes whole chunks (one second by default) sequentially, so a slow
+    disk only fills the ring; when it is full, blocks are dropped and
+    counted as overruns rather than stalling playback. Memory is the ring
+    plus one chunk regardless of how long the recording runs. WAV
+    recordings continue in numbered parts (name.001.wav, ...) when a file
+    reaches the 4 GB format limit; FLAC needs the soundfile package.
+    """
+
+    def __init__(self, file_path: str, channels: int = 2, sample_rate: int = 44100,
+                 buffer_seconds: float = 8.0, chunk_seconds: float = 1.0):
+        self.extension = os.path.splitext(file_path)[1].lower()
+        if self.extension not in RECORD_FORMATS:
+            raise ValueError(f"Unsupported recording format: {file_path} (use .wav or .flac)")
+        if self.extension == '.flac':
+            try:
+                import soundfile
+            except ImportError:
+                raise RuntimeError("FLAC recording needs the 'soundfile' package")
+            self.soundfile = soundfile
+
+        self.file_path = file_path
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.chunk_frames = max(1, int(chunk_seconds * sample_rate))
+        # Whole chunks per ring, so a chunk never straddles the wrap
+        chunks = max(2, int(round(buffer_seconds / chunk_seconds)))
+        self.ring = RingBuffer(self.chunk_frames * chunks, channels)
+
+        self.file = None
+        self.part = 0
+        self.part_frames = 0
+        self.frames_written = 0
+        self.writes = 0
+        self.worst_write = 0.0
+        self.write_time = 0.0
+        self.max_fill = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Open the file and start the writer thread"""
+        self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def push(self, block: np.ndarray):
+        """Output tap: called with every rendered block"""
+        self.ring.push(block)
+
+    def _part_path(self) -> str:
+        """File name of the current part"""
+        if self.part == 0:
+            return self.file_path
+        root, extension = os.path.splitext(self.file_path)
+        return f"{root}.{self.part:03d}{extension}"
+
+    def _open(self):
+        """Open the current part for writing"""
+        path = self._part_path()
+        if self.extension == '.flac':
+            self.file = self.soundfile.SoundFile(path, 'w', self.sample_rate, self.channels,
+                                                 subtype='PCM_16', format='FLAC')
+        else:
+            self.file = wave.open(path, 'wb')
+            self.file.setnchannels(self.channels)
+            self.file.setsampwidth(2)
+            self.file.setframerate(self.sample_rate)
+        self.part_frames = 0
+
+    def _close(self):
+        """Finalize the current part"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write(self, samples: np.ndarray):
+        """Append frames to the file, starting a new part at the WAV limit"""
+        start = time.perf_counter()
+        if self.extension == '.flac':
+            self.file.write(samples)
+        else:
+            if (self.part_frames + samples.shape[0]) * self.channels * 2 > WAV_LIMIT:
+                self._close()
+                self.part += 1
+                self._open()
+            self.file.writeframes(samples.tobytes())
+        frames = samples.shape[0]
+        self.part_frames += frames
+        self.frames_written += frames
+        elapsed = time.perf_counter() - start
+        self.writes += 1
+        self.write_time += elapsed
+        self.worst_write = max(self.worst_write, elapsed)
+
+    def _run(self):
+        """Writer thread: flush whole chunks, the remainder on stop"""
+        poll = self.chunk_frames / self.sample_rate / 4
+        while True:
+            stopping = self._stop.is_set()
+            while self.ring.available() >= self.chunk_frames:
+                self._flush(self.chunk_frames)
+            if stopping:
+                while self.ring.available():
+                    self._flush(self.chunk_frames)
+                break
+            self._stop.wait(poll)
+
+    def _flush(self, frames: int):
+        """Write one contiguous piece of the ring"""
+        self.max_fill = max(self.max_fill, self.ring.available())
+        samples = self.ring.peek(frames)
+        try:
+            self._write(samples)
+        except Exception as e:
+            print(f"Error writing recording: {e}")
+        self.ring.advance(samples.shape[0])
+
+    def stop(self) -> dict:
+        """Write out what is buffered, close the file and return stats"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+        return self.stats()
+
+    def stats(self) -> dict:
+        """Written seconds, overruns and writer timing"""
+        return {
+            'file': self.file_path,
+            'parts': self.part + 1,
+            'seconds': self.frames_written / self.sample_rate,
+            'overruns': self.ring.overruns,
+            'dropped_seconds': self.ring.dropped_frames / self.sample_rate,
+            'writes': self.writes,
+            'average_write_ms': self.write_time / self.writes * 1000 if self.writes else 0.0,
+            'worst_write_ms': self.worst_write * 1000,
+            'max_fill': self.max_fill / self.ring.capacity,
+            'buffer_bytes': self.ring.data.nbytes,
+        }
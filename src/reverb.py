@@ -0,0 +1,142 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from audio_io import read_wav, resample
+
+# Impulse response spectra keyed by (path, mtime, size, block size, rate)
+_spectrum_cache: Dict[Tuple, np.ndarray] = {}
+_cache_lock = threading.Lock()
+
+
+def generate_room_impulse(seconds: float = 3.0, sample_rate: int = 44100,
+                          channels: int = 2, rt60: Optional[float] = None, seed: int = 0) -> np.ndarray:
+    """Synthesize a decaying noise impulse response (frames, channels)"""
+    rt60 = rt60 or seconds
+    frames = int(seconds * sample_rate)
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames, dtype=np.float32) / sample_rate
+    # -60 dB after rt60 seconds
+    envelope = np.power(10.0, -3.0 * t / rt60).astype(np.float32)
+    impulse = rng.standard_normal((frames, channels)).astype(np.float32) * envelope[:, None]
+    return impulse / np.sqrt(np.sum(impulse ** 2, axis=0, keepdims=True))
+
+
+def impulse_spectra(impulse: np.ndarray, block_size: int) -> np.ndarray:
+    """Split an impulse response into block-sized partitions and FFT them
+
+    Returns an array of shape (partitions, channels, block_size + 1).
+    """
+    impulse = np.asarray(impulse, dtype=np.float32)
+    if impulse.ndim == 1:
+        impulse = impulse[:, None]
+    frames, channels = impulse.shape
+    partitions = max(1, -(-frames // block_size))
+
+    padded = np.zeros((partitions * block_size, channels), dtype=np.float32)
+    padded[:frames] = impulse
+    parts = padded.reshape(partitions, block_size, channels).transpose(0, 2, 1)
+    # Zero-pad each partition to 2 * block_size for overlap-save
+    return np.fft.rfft(parts, n=2 * block_size, axis=2).astype(np.complex64)
+
+
+def load_impulse_spectra(file_path: str, block_size: int, sample_rate: int = 44100) -> np.ndarray:
+    """Load an impulse response file and return its cached partition spectra"""
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime, stat.st_size, block_size, sample_rate)
+    with _cache_lock:
+        spectra = _spectrum_cache.get(key)
+    if spectra is not None:
+        return spectra
+
+    impulse, rate = read_wav(file_path)
+    # Linear resampling is enough for a diffuse reverb tail
+    impulse = resample(impulse, rate, sample_rate)
+
+    spectra = impulse_spectra(impulse, block_size)
+    with _cache_lock:
+        _spectrum_cache[key] = spectra
+    return spectra
+
+
+class ConvolutionReverb:
+    """Uniformly partitioned FFT convolution reverb for the master bus
+
+    Each block is convolved with every partition of the impulse response in
+    the frequency domain (overlap-save), so latency is one block regardless
+    of impulse length.
+    """
+
+    def __init__(self, spectra: np.ndarray, channels: int = 2, block_size: int = 512,
+                 wet: float = 0.25, dry: float = 1.0):
+        if spectra.shape[2] != block_size + 1:
+            raise ValueError("Impulse spectra were prepared for a different block size")
+
+        self.block_size = block_size
+        self.channels = channels
+        self.wet = wet
+        self.dry = dry
+        self.enabled = True
+
+        # Map bus channels onto impulse channels (mono IRs feed every channel)
+        ir_channels = spectra.shape[1]
+        mapping = [c % ir_channels for c in range(channels)]
+        spectra = spectra[:, mapping, :]
+        self.partitions = spectra.shape[0]
+
+        # Partitions stored reversed and doubled so the ring buffer lines up
+        # with a contiguous slice instead of a per-block roll
+        reversed_spectra = spectra[::-1]
+        self.filters = np.ascontiguousarray(np.concatenate([reversed_spectra, reversed_spectra]))
+
+        # Frequency-domain delay line and time-domain input history
+        bins = block_size + 1
+        self.delay_line = np.zeros((self.partitions, channels, bins), dtype=np.complex64)
+        self.head = 0
+        self.window = np.zeros((channels, 2 * block_size), dtype=np.float32)
+        self.accum = np.zeros((channels, bins), dtype=np.complex64)
+        self.out = np.zeros((block_size, channels), dtype=np.float32)
+
+    @classmethod
+    def from_file(cls, file_path: str, channels: int = 2, block_size: int = 512,
+                  sample_rate: int = 44100, **kwargs) -> 'ConvolutionReverb':
+        """Create a reverb from an impulse response WAV file"""
+        spectra = load_impulse_spectra(file_path, block_size, sample_rate)
+        return cls(spectra, channels, block_size, **kwargs)
+
+    @classmethod
+    def from_impulse(cls, impulse: np.ndarray, channels: int = 2, block_size: int = 512,
+                     **kwargs) -> 'ConvolutionReverb':
+        """Create a reverb from an in-memory impulse response"""
+        return cls(impulse_spectra(impulse, block_size), channels, block_size, **kwargs)
+
+    def reset(self):
+        """Clear the reverb tail"""
+        self.delay_line.fill(0)
+        self.window.fill(0.0)
+        self.head = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Process a (block_size, channels) block"""
+        if not self.enabled:
+            return block
+
+        size = self.block_size
+        # Slide the 2-block input window and transform it
+        self.window[:, :size] = self.window[:, size:]
+        self.window[:, size:] = block.T
+        self.head = (self.head + 1) % self.partitions
+        self.delay_line[self.head] = np.fft.rfft(self.window, axis=1)
+
+        # Multiply-accumulate every partition against its delayed input
+        start = self.partitions - 1 - self.head
+        filters = self.filters[start:start + self.partitions]
+        np.einsum('pcf,pcf->cf', self.delay_line, filters, out=self.accum)
+
+        # Only the second half of the inverse transform is alias free
+        tail = np.fft.irfft(self.accum, axis=1)[:, size:]
+        np.multiply(block, self.dry, out=self.out)
+        self.out += self.wet * tail.T
+        return self.out
@@ -0,0 +1,55 @@
+import os
+import threading
+import weakref
+from typing import Dict
+
+import numpy as np
+
+from audio_io import read_wav_int16, resample, to_int16
+
+
+def decode_int16(sound_path: str, sample_rate: int) -> np.ndarray:
+    """Decode a WAV file to (frames, channels) int16 at the given rate"""
+    samples, rate = read_wav_int16(sound_path)
+    if rate != sample_rate:
+        samples = to_int16(resample(samples / 32768.0, rate, sample_rate))
+    return samples
+
+
+class SampleStore:
+    """Decoded assets kept as int16 at their native channel count
+
+    Mono recordings stay mono; the mixer spreads them over the output
+    channels when rendering, so a mono asset costs 2 bytes per frame
+    instead of the 4 (int16 stereo) or 8 (float32 stereo) of a
+    mixer-format copy. Buffers are shared while any sound holds them and
+    freed with the last reference.
+    """
+
+    def __init__(self, sample_rate: int = 44100):
+        self.sample_rate = sample_rate
+        self._buffers: 'weakref.WeakValueDictionary' = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def load(self, sound_path: str) -> np.ndarray:
+        """Return the (frames, channels) int16 buffer for a WAV file"""
+        stat = os.stat(sound_path)
+        key = (os.path.abspath(sound_path), stat.st_mtime, stat.st_size)
+        with self._lock:
+            samples = self._buffers.get(key)
+        if samples is not None:
+            return samples
+
+        samples = decode_int16(sound_path, self.sample_rate)
+        with self._lock:
+            self._buffers[key] = samples
+        return samples
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes held per loaded file"""
+        with self._lock:
+            return {key[0]: samples.nbytes for key, samples in self._buffers.items()}
+
+    def total_bytes(self) -> int:
+        """Bytes held by all loaded buffers"""
+        return sum(self.usage().values())
@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Default budget for decoded audio that is not playing
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class SoundCache:
+    """LRU cache of decoded sounds bounded by a byte budget
+
+    Playing (or paused) sounds are pinned and never evicted; once they are
+    stopped they become ordinary entries and the least recently used ones
+    are dropped whenever the total exceeds the budget.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries: 'OrderedDict[str, dict]' = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+
+    def get(self, key: str):
+        """Return a cached sound and mark it recently used, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry['sound']
+
+    def put(self, key: str, sound, nbytes: int, pinned: bool = False):
+        """Add a sound, evicting unpinned entries if over budget"""
+        with self.lock:
+            self.discard(key)
+            self.entries[key] = {'sound': sound, 'bytes': nbytes, 'pinned': pinned}
+            self.bytes += nbytes
+            self._evict()
+
+    def pin(self, key: str):
+        """Protect an entry from eviction while it plays"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry['pinned'] = True
+                self.entries.move_to_end(key)
+
+    def unpin(self, key: str):
+        """Allow an entry to be evicted again"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry['pinned'] = False
+                self._evict()
+
+    def discard(self, key: str) -> bool:
+        """Drop an entry regardless of pinning"""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return False
+            self.bytes -= entry['bytes']
+            return True
+
+    def set_budget(self, budget_bytes: int):
+        """Change the budget and evict down to it"""
+        with self.lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used unpinned entries until within budget"""
+        if self.bytes <= self.budget_bytes:
+            return
+        for key in list(self.entries):
+            if self.bytes <= self.budget_bytes:
+                break
+            entry = self.entries[key]
+            if not entry['pinned']:
+                del self.entries[key]
+                self.bytes -= entry['bytes']
+                self.evictions += 1
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes per cached sound"""
+        with self.lock:
+            return {key: entry['bytes'] for key, entry in self.entries.items()}
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters plus current size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'pinned': sum(1 for entry in self.entries.values() if entry['pinned']),
+                'bytes': self.bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def peek(self, key: str) -> Optional[object]:
+        """Return a cached sound without touching counters or order"""
+        entry = self.entries.get(key)
+        return entry['sound'] if entry else None
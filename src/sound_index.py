@@ -0,0 +1,155 @@
+import operator
+import re
+import wave
+from typing import Dict, Iterable, List, Optional, Set
+
+# Query filters on metadata, e.g. "dur>30" or "loud<-20"
+FILTER_FIELDS = {'dur': 'duration', 'loud': 'loudness_db'}
+FILTER_PATTERN = re.compile(r'^(dur|loud)(<=|>=|<|>|=)(-?\d+(?:\.\d+)?)$')
+OPERATORS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq}
+# Terms shorter than a trigram match word prefixes instead
+PREFIX_LENGTH = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a file name, display name or tag"""
+    return [word for word in re.split(r'[^0-9a-z]+', text.lower()) if word]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Three-character substrings of a string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def wav_duration(file_path: str) -> float:
+    """Length of a WAV file in seconds, read from its header only"""
+    with wave.open(file_path, 'rb') as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+class SoundIndex:
+    """In-memory search index over the sound library
+
+    Every sound has searchable text (file name, display name, tags) and
+    metadata (duration, loudness). Terms of three or more characters are
+    looked up in a trigram index and confirmed with a substring check;
+    shorter terms use a map of word prefixes. Postings are sets of entry
+    ids, so a query is a few set intersections regardless of library size.
+    Results keep the order sounds were added in.
+
+    Query terms are ANDed: plain words, "tag:<tag>", and metadata filters
+    such as "dur>30" (seconds) or "loud<-20" (dBFS).
+    """
+
+    def __init__(self):
+        # id -> {'key', 'text', 'tags', 'duration', 'loudness_db'}
+        self.entries: Dict[int, dict] = {}
+        self.ids: Dict[str, int] = {}
+        self.by_trigram: Dict[str, Set[int]] = {}
+        self.by_prefix: Dict[str, Set[int]] = {}
+        self.by_tag: Dict[str, Set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, key: str, names: Iterable[str], tags: Iterable[str] = (),
+            duration: Optional[float] = None, loudness_db: Optional[float] = None):
+        """Index a sound (re-adding a key replaces it but keeps its position)"""
+        entry_id = self.ids.get(key)
+        if entry_id is None:
+            entry_id = self._next_id
+            self._next_id += 1
+            self.ids[key] = entry_id
+        else:
+            self._unindex(entry_id)
+
+        tags = sorted({tag.lower() for tag in tags})
+        words = [word for text in list(names) + tags for word in tokenize(text)]
+        text = ' '.join(words)
+        self.entries[entry_id] = {'key': key, 'text': text, 'tags': tags,
+                                  'duration': duration, 'loudness_db': loudness_db}
+        for gram in trigrams(text):
+            self.by_trigram.setdefault(gram, set()).add(entry_id)
+        for word in words:
+            for length in range(1, min(PREFIX_LENGTH, len(word)) + 1):
+                self.by_prefix.setdefault(word[:length], set()).add(entry_id)
+        for tag in tags:
+            self.by_tag.setdefault(tag, set()).add(entry_id)
+
+    def set_metadata(self, key: str, **fields):
+        """Update duration and/or loudness_db of a sound"""
+        entry_id = self.ids.get(key)
+        if entry_id is not None:
+            self.entries[entry_id].update(fields)
+
+    def remove(self, key: str) -> bool:
+        """Drop a sound from the index"""
+        entry_id = self.ids.pop(key, None)
+        if entry_id is None:
+            return False
+        self._unindex(entry_id)
+        del self.entries[entry_id]
+        return True
+
+    def _unindex(self, entry_id: int):
+        """Remove an entry's postings"""
+        entry = self.entries[entry_id]
+        words = entry['text'].split()
+        keys = [(self.by_trigram, gram) for gram in trigrams(entry['text'])]
+        keys += [(self.by_prefix, word[:length]) for word in words
+                 for length in range(1, min(PREFIX_LENGTH, len(word)) + 1)]
+        keys += [(self.by_tag, tag) for tag in entry['tags']]
+        for table, value in keys:
+            ids = table.get(value)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del table[value]
+
+    def _candidates(self, term: str) -> Optional[Set[int]]:
+        """Ids that may match one term (None for no constraint)"""
+        if term.startswith('tag:'):
+            return set(self.by_tag.get(term[4:], ()))
+        words = tokenize(term)
+        if not words:
+            return None
+        result: Optional[Set[int]] = None
+        for word in words:
+            if len(word) <= PREFIX_LENGTH:
+                ids = self.by_prefix.get(word, set())
+            else:
+                # Smallest posting lists first keeps the intersection cheap
+                lists = sorted((self.by_trigram.get(gram, set()) for gram in trigrams(word)), key=len)
+                ids = lists[0].intersection(*lists[1:])
+                # Trigrams can match out of order; confirm the substring
+                ids = {i for i in ids if word in self.entries[i]['text']}
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def search(self, query: str = '', limit: Optional[int] = None) -> List[str]:
+        """Keys of sounds matching every term of query, in insertion order"""
+        result: Optional[Set[int]] = None
+        filters = []
+        for term in query.lower().split():
+            match = FILTER_PATTERN.match(term)
+            if match:
+                field, op, value = match.groups()
+                filters.append((FILTER_FIELDS[field], OPERATORS[op], float(value)))
+                continue
+            ids = self._candidates(term)
+            if ids is None:
+                continue
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+
+        ids = self.entries.keys() if result is None else result
+        if filters:
+            ids = [i for i in ids if all(
+                self.entries[i][field] is not None and compare(self.entries[i][field], value)
+                for field, compare, value in filters)]
+        keys = [self.entries[i]['key'] for i in sorted(ids)]
+        return keys[:limit] if limit else keys
@@ -0,0 +1,145 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Speaker layouts in WAV channel order: (label, azimuth in degrees)
+# Azimuth 0 is front center, positive values are to the right. LFE has no azimuth.
+SPEAKER_LAYOUTS: Dict[str, List[Tuple[str, Optional[float]]]] = {
+    'stereo': [('L', -30.0), ('R', 30.0)],
+    'quad': [('FL', -45.0), ('FR', 45.0), ('RL', -135.0), ('RR', 135.0)],
+    '5.1': [('FL', -30.0), ('FR', 30.0), ('C', 0.0), ('LFE', None), ('SL', -110.0), ('SR', 110.0)],
+}
+SPEAKER_LAYOUTS['4.0'] = SPEAKER_LAYOUTS['quad']
+
+
+class SpatialPanner:
+    """Equal-power 2-D panner driven by precomputed gain tables
+
+    Positions are (x, y) in [-1, 1]: x runs left to right, y runs back to
+    front. Frontal layouts (stereo) only use x. Surround layouts pan by
+    azimuth between adjacent speakers, and sounds closer to the center
+    spread over all speakers at constant power.
+    """
+
+    def __init__(self, layout: str = 'stereo', resolution: int = 1025, lfe_send: float = 0.0):
+        if layout not in SPEAKER_LAYOUTS:
+            raise ValueError(f"Unknown speaker layout: {layout}")
+
+        self.layout = layout
+        self.speakers = SPEAKER_LAYOUTS[layout]
+        self.channels = len(self.speakers)
+        self.labels = [label for label, _ in self.speakers]
+        self.resolution = resolution
+        self.lfe_send = lfe_send
+
+        # Indices of speakers that take part in panning
+        self.panned = [i for i, (_, az) in enumerate(self.speakers) if az is not None]
+        self.lfe = [i for i, (_, az) in enumerate(self.speakers) if az is None]
+        azimuths = [self.speakers[i][1] for i in self.panned]
+        self.frontal = all(abs(az) <= 90.0 for az in azimuths)
+
+        # Omnidirectional spread used at the center of the room
+        self.omni = np.zeros(self.channels, dtype=np.float32)
+        self.omni[self.panned] = 1.0 / math.sqrt(len(self.panned))
+
+        self.table = self._build_table()
+        # Plain-float copy of the first two columns for per-tick stereo lookups
+        self.pan_pairs = [(float(row[0]), float(row[1])) for row in self.table] if self.frontal else None
+
+    def _pair_gains(self, azimuth: float, order: List[int], angles: List[float], wrap: bool) -> np.ndarray:
+        """Equal-power gains between the two speakers around an azimuth"""
+        gains = np.zeros(self.channels, dtype=np.float64)
+        count = len(order)
+        pairs = count if wrap else count - 1
+
+        for k in range(pairs):
+            a0 = angles[k]
+            a1 = angles[(k + 1) % count]
+            if wrap and k == count - 1:
+                a1 += 360.0
+            az = azimuth
+            if az < a0:
+                az += 360.0 if wrap else 0.0
+            if a0 <= az <= a1:
+                frac = (az - a0) / (a1 - a0) if a1 > a0 else 0.0
+                gains[order[k]] = math.cos(frac * math.pi / 2)
+                gains[order[(k + 1) % count]] = math.sin(frac * math.pi / 2)
+                return gains
+
+        # Outside a frontal layout: stick to the nearest speaker
+        nearest = order[0] if azimuth < angles[0] else order[-1]
+        gains[nearest] = 1.0
+        return gains
+
+    def _build_table(self) -> np.ndarray:
+        """Precompute directional gains over the full lookup range"""
+        order = sorted(self.panned, key=lambda i: self.speakers[i][1])
+        angles = [self.speakers[i][1] for i in order]
+        table = np.zeros((self.resolution, self.channels), dtype=np.float32)
+
+        for idx in range(self.resolution):
+            pos = idx / (self.resolution - 1)
+            if self.frontal:
+                # Table indexed by x, spread evenly across the frontal arc
+                azimuth = angles[0] + pos * (angles[-1] - angles[0])
+                table[idx] = self._pair_gains(azimuth, order, angles, wrap=False)
+            else:
+                # Table indexed by azimuth from -180 to 180 degrees
+                azimuth = -180.0 + pos * 360.0
+                table[idx] = self._pair_gains(azimuth, order, angles, wrap=True)
+
+        table[:, self.lfe] = self.lfe_send
+        return table
+
+    def gain_matrix(self, positions: np.ndarray) -> np.ndarray:
+        """Look up gains for an (S, 2) array of positions, returns (S, channels)"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        x = np.clip(positions[:, 0], -1.0, 1.0)
+        y = np.clip(positions[:, 1], -1.0, 1.0)
+        last = self.resolution - 1
+
+        if self.frontal:
+            idx = np.rint((x + 1.0) * 0.5 * last).astype(np.intp)
+            return self.table[idx]
+
+        azimuth = np.arctan2(x, y)
+        idx = np.rint((azimuth + np.pi) / (2 * np.pi) * last).astype(np.intp)
+        directional = self.table[idx]
+
+        # Blend toward the omni spread near the center and keep power constant
+        distance = np.minimum(np.hypot(x, y), 1.0)[:, None]
+        gains = distance * directional + (1.0 - distance) * self.omni
+        power = np.sqrt(np.sum(gains[:, self.panned] ** 2, axis=1, keepdims=True))
+        gains = gains / np.maximum(power, 1e-9)
+        gains[:, self.lfe] = self.lfe_send
+        return gains.astype(np.float32)
+
+    def gains(self, x: float, y: float = 0.0) -> np.ndarray:
+        """Gains for a single position"""
+        return self.gain_matrix(np.array([[x, y]], dtype=np.float32))[0]
+
+    def pan_gains(self, pan: float) -> Tuple[float, float]:
+        """Equal-power left/right gains for a stereo pan value in [-1, 1]"""
+        if self.pan_pairs is None:
+            gains = self.gains(pan, 0.0)
+            return float(gains[0]), float(gains[1])
+        pan = -1.0 if pan < -1.0 else 1.0 if pan > 1.0 else pan
+        return self.pan_pairs[int((pan + 1.0) * 0.5 * (self.resolution - 1) + 0.5)]
+
+    def mix(self, blocks: np.ndarray, gains: np.ndarray,
+            previous: Optional[np.ndarray] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Mix (S, frames) mono blocks through an (S, channels) gain matrix
+
+        When previous gains are given the matrix is interpolated across the
+        block so position changes do not click.
+        """
+        frames = blocks.shape[1]
+        if out is None:
+            out = np.empty((frames, self.channels), dtype=np.float32)
+
+        np.matmul(blocks.T, gains, out=out)
+        if previous is not None and not np.array_equal(previous, gains):
+            ramp = np.linspace(1.0, 0.0, frames, endpoint=False, dtype=np.float32)[:, None]
+            out += ramp * (blocks.T @ (previous - gains))
+        return out
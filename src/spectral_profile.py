@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from audio_io import read_wav
+from noise import NoiseSource, is_noise
+
+# Octave band edges in Hz (10 bands, centres 31 Hz .. 16 kHz)
+BAND_EDGES = (22.0, 44.0, 88.0, 177.0, 355.0, 710.0, 1420.0, 2840.0, 5680.0, 11360.0, 22720.0)
+BAND_COUNT = len(BAND_EDGES) - 1
+# Bands below 355 Hz / from 2.8 kHz up count as the low / high end for tilt
+LOW_BANDS = 4
+HIGH_BANDS = 3
+# Analysis frame and the most frames averaged per asset
+FRAME = 4096
+MAX_FRAMES = 128
+# Seconds of generated noise analysed for "noise:<color>" sounds
+NOISE_SECONDS = 4.0
+
+
+def band_profile(samples: np.ndarray, sample_rate: int) -> dict:
+    """Share of power per octave band and RMS level of a recording
+
+    Averages the Hann-windowed power spectrum of up to MAX_FRAMES frames
+    spread evenly over the file, then sums it per band. Bands are returned
+    as fractions of the total so profiles of quiet and loud files compare.
+    """
+    mono = np.asarray(samples, dtype=np.float64)
+    if mono.ndim == 2:
+        mono = mono.mean(axis=1)
+    rms = float(np.sqrt(np.mean(mono ** 2))) if mono.size else 0.0
+    if mono.shape[0] < FRAME:
+        mono = np.concatenate([mono, np.zeros(FRAME - mono.shape[0])])
+
+    count = min(MAX_FRAMES, mono.shape[0] // FRAME)
+    starts = np.linspace(0, mono.shape[0] - FRAME, count).astype(np.int64)
+    frames = mono[starts[:, None] + np.arange(FRAME)] * np.hanning(FRAME)
+    power = (np.abs(np.fft.rfft(frames, axis=1)) ** 2).mean(axis=0)
+
+    freqs = np.fft.rfftfreq(FRAME, 1.0 / sample_rate)
+    band = np.searchsorted(BAND_EDGES, freqs, side='right') - 1
+    valid = (band >= 0) & (band < BAND_COUNT)
+    energy = np.bincount(band[valid], weights=power[valid], minlength=BAND_COUNT)
+    total = energy.sum()
+    bands = energy / total if total > 0 else np.full(BAND_COUNT, 1.0 / BAND_COUNT)
+    return {'bands': [float(value) for value in bands], 'rms': rms}
+
+
+def smart_corrections(bands, levels, max_cut_db: float = 3.0,
+                      max_tilt_db: float = 4.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-sound gain trim and spectral tilt in dB for sounds playing together
+
+    bands is (sounds, BAND_COUNT) band shares, levels the RMS each sound
+    plays at. A band is congested when several sounds put similar energy
+    into it (1 - sum of squared shares, 0 when one sound owns it). A sound
+    that dominates the congested bands it lives in is trimmed by up to
+    max_cut_db, so the layers it masks come through; sounds that do not
+    compete with anything are left alone. The tilt says which end of that
+    sound to cut instead of its whole level: positive cuts highs, negative
+    cuts lows, up to max_tilt_db.
+    """
+    bands = np.asarray(bands, dtype=np.float64)
+    levels = np.asarray(levels, dtype=np.float64)
+    count = bands.shape[0]
+    if count < 2:
+        return np.zeros(count), np.zeros(count)
+    energy = bands * (levels ** 2)[:, None]
+    total = energy.sum(axis=0)
+    share = np.divide(energy, total, out=np.zeros_like(energy), where=total > 0)
+    congestion = (1.0 - (share ** 2).sum(axis=0)) / (1.0 - 1.0 / count)
+
+    # How much of each sound sits in congested bands, and how loud it is there
+    competing = (bands * congestion).sum(axis=1)
+    dominance = (bands * share).sum(axis=1)
+    excess = np.clip((dominance - 1.0 / count) / (1.0 - 1.0 / count), 0.0, 1.0)
+    gain_db = -max_cut_db * competing * excess
+
+    # Cut the end of the spectrum where the sound does most of the masking
+    pressure = bands * congestion * share
+    low = pressure[:, :LOW_BANDS].sum(axis=1)
+    high = pressure[:, -HIGH_BANDS:].sum(axis=1)
+    balance = np.divide(high - low, high + low, out=np.zeros(count), where=high + low > 0)
+    tilt_db = max_tilt_db * competing * excess * balance
+    return gain_db, tilt_db
+
+
+class ProfileCache:
+    """Band-energy profiles of assets, computed once and kept in a JSON file
+
+    Profiles are keyed by a hash of the file's path, modification time and
+    size, so an edited file is analysed again. Lookups only read memory;
+    analysis runs through prepare() or on a daemon thread, never while a
+    sound is being played.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path
+        self.profiles: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        # Paths queued for analysis, and paths that failed with the cache key
+        # they had then (None if missing); retried once the file changes
+        self._queued: set = set()
+        self._failed: Dict[str, Optional[str]] = {}
+        if file_path and os.path.exists(file_path):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    self.profiles = json.load(f)
+            except Exception as e:
+                print(f"Error loading spectral profiles: {e}")
+
+    def key(self, sound_path: str) -> str:
+        """Cache key for a sound file or generated noise name"""
+        if is_noise(sound_path):
+            return sound_path
+        stat = os.stat(sound_path)
+        data = json.dumps([os.path.abspath(sound_path), stat.st_mtime, stat.st_size])
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+    def _stat_key(self, sound_path: str) -> Optional[str]:
+        """Cache key of a file, None if it does not exist"""
+        try:
+            return self.key(sound_path)
+        except OSError:
+            return None
+
+    def _has_failed(self, sound_path: str) -> bool:
+        """True if the sound failed before and has not changed since"""
+        if sound_path not in self._failed:
+            return False
+        if self._stat_key(sound_path) == self._failed[sound_path]:
+            return True
+        # Copied in full, rewritten or re-added: try again
+        del self._failed[sound_path]
+        return False
+
+    def get(self, sound_path: str) -> Optional[dict]:
+        """Cached profile of a sound, or None"""
+        try:
+            return self.profiles.get(self.key(sound_path))
+        except OSError:
+            return None
+
+    def compute(self, sound_path: str) -> dict:
+        """Analyse a sound and cache its profile"""
+        if is_noise(sound_path):
+            source = NoiseSource.from_name(sound_path, seed=0)
+            samples = np.empty(int(NOISE_SECONDS * source.sample_rate), dtype=np.float32)
+            source.read(samples.shape[0], samples)
+            rate = source.sample_rate
+        else:
+            samples, rate = read_wav(sound_path)
+        profile = band_profile(samples, rate)
+        with self.lock:
+            self.profiles = {**self.profiles, self.key(sound_path): profile}
+        return profile
+
+    def prepare(self, sound_paths: Iterable[str], on_ready: Optional[Callable[[], None]] = None) -> int:
+        """Analyse sounds without a profile and save, returns how many were added"""
+        added = 0
+        for sound_path in sound_paths:
+            if self._has_failed(sound_path) or self.get(sound_path) is not None:
+                continue
+            try:
+                self.compute(sound_path)
+                added += 1
+            except Exception as e:
+                self._failed[sound_path] = self._stat_key(sound_path)
+                print(f"Error analysing {sound_path}: {e}")
+            finally:
+                self._queued.discard(sound_path)
+        if added:
+            self.save()
+            if on_ready:
+                on_ready()
+        return added
+
+    def prepare_in_background(self, sound_paths: Iterable[str],
+                              on_ready: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+        """Run prepare() on a daemon thread for sounds not already queued"""
+        with self.lock:
+            missing = [path for path in sound_paths
+                       if path not in self._queued and not self._has_failed(path) and self.get(path) is None]
+            # Nothing to analyse for names without a file (e.g. test backends)
+            self._failed.update((path, None) for path in missing if not is_noise(path) and not os.path.isfile(path))
+            missing = [path for path in missing if path not in self._failed]
+            self._queued.update(missing)
+        if not missing:
+            return None
+        thread = threading.Thread(target=self.prepare, args=(missing, on_ready), daemon=True)
+        thread.start()
+        return thread
+
+    def save(self):
+        """Write profiles to the cache file"""
+        if not self.file_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+            temp_path = self.file_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.profiles, f)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            print(f"Error saving spectral profiles: {e}")
@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Phases reported in this order, anything else is appended after them
+PHASE_ORDER = [
+    'imports',
+    'pygame init',
+    'tk root',
+    'card construction',
+    'asset decode',
+    'first audible sample',
+]
+
+
+class StartupTrace:
+    """Timed breakdown of application startup phases"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.marks: Dict[str, float] = {}
+        self.order: List[str] = []
+        self.reported = False
+
+    def _touch(self, name: str):
+        if name not in self.order:
+            self.order.append(name)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure a phase, repeated phases are accumulated"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._touch(name)
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def mark(self, name: str, offset: float = 0.0):
+        """Record the first time a point is reached (seconds since start)"""
+        if not self.enabled or name in self.marks:
+            return
+        self._touch(name)
+        self.marks[name] = time.perf_counter() - self.origin + offset
+        # Late marks (e.g. first sound started by the user) are printed directly
+        if self.reported:
+            print(f"[startup] {name:<22} at {self.marks[name] * 1000:8.1f} ms")
+
+    def elapsed(self) -> float:
+        """Seconds since trace origin"""
+        return time.perf_counter() - self.origin
+
+    def report(self, label: str = 'window ready') -> Optional[str]:
+        """Print startup breakdown"""
+        if not self.enabled:
+            return None
+
+        names = [n for n in PHASE_ORDER if n in self.order]
+        names += [n for n in self.order if n not in PHASE_ORDER]
+
+        lines = ["[startup] phase                  duration     at"]
+        for name in names:
+            if name in self.durations:
+                count = self.counts.get(name, 1)
+                suffix = f" (x{count})" if count > 1 else ""
+                lines.append(f"[startup] {name:<22} {self.durations[name] * 1000:8.1f} ms{suffix}")
+            else:
+                lines.append(f"[startup] {name:<22} {'':>11} {self.marks[name] * 1000:8.1f} ms")
+        lines.append(f"[startup] {label:<22} {'':>11} {self.elapsed() * 1000:8.1f} ms")
+
+        text = "\n".join(lines)
+        print(text)
+        self.reported = True
+        return text
+
+
+def _trace_requested() -> bool:
+    """Check command line and environment for trace mode"""
+    if '--trace-startup' in sys.argv:
+        return True
+    return os.environ.get('AMBIENT_TRACE_STARTUP', '') not in ('', '0')
+
+
+# Shared trace instance used by all modules
+trace = StartupTrace(enabled=_trace_requested())
@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import json
+import threading
+from typing import Callable, List, Optional, Union
+
+# Actions a program event can take, see Timeline._apply
+ACTIONS = ('play', 'stop', 'volume', 'pan', 'breathing', 'random_pan', 'fade_all')
+
+
+def parse_time(value: Union[int, float, str]) -> float:
+    """Seconds from a number or an "H:MM:SS" / "MM:SS" string"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in str(value).split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def load_program(file_path: str) -> List[dict]:
+    """Read a program: a JSON list of events, or an object with an "events" list"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        program = json.load(f)
+    if isinstance(program, dict):
+        program = program.get('events', [])
+    return program
+
+
+class Timeline:
+    """Programmed session: timed player actions fired from a heap
+
+    Each event is {"at": time, "action": ..., "sound": ..., ...}. Event
+    times are absolute offsets from start(), so a late event never delays
+    the ones after it. Only the earliest deadline is handed to the
+    backend's alarm, so nothing wakes up between events and no thread is
+    created per event. On FakeBackend a whole program runs in
+    accelerated time through advance().
+    """
+
+    def __init__(self, player, resolve: Optional[Callable[[str], str]] = None,
+                 on_event: Optional[Callable[[dict], None]] = None):
+        self.player = player
+        self.backend = player.backend
+        # Maps a program sound name to the player's sound path
+        self.resolve = resolve or (lambda name: name)
+        # Called after every fired event (e.g. to refresh the GUI)
+        self.on_event = on_event
+
+        self.queue: list = []
+        self.origin: Optional[float] = None
+        self.fired = 0
+        self.lateness = 0.0
+        self._order = itertools.count()
+        self._lock = threading.RLock()
+
+    def load(self, program: Union[str, List[dict]]):
+        """Queue a program (list of events or path to a JSON file)"""
+        if isinstance(program, str):
+            program = load_program(program)
+        for event in program:
+            self.add(event)
+
+    def add(self, event: dict):
+        """Queue one event; its time is relative to start()"""
+        if event.get('action') not in ACTIONS:
+            raise ValueError(f"Unknown timeline action: {event.get('action')}")
+        offset = parse_time(event.get('at', 0))
+        with self._lock:
+            deadline = offset if self.origin is None else self.origin + offset
+            heapq.heappush(self.queue, (deadline, next(self._order), event))
+            if self.origin is not None:
+                self._arm()
+
+    def start(self):
+        """Start the program now"""
+        with self._lock:
+            self.origin = self.backend.now()
+            # Queued offsets become absolute deadlines
+            self.queue = [(self.origin + offset, order, event) for offset, order, event in self.queue]
+            heapq.heapify(self.queue)
+            self._arm()
+
+    def stop(self):
+        """Drop all pending events"""
+        with self._lock:
+            self.queue.clear()
+            self.backend.cancel_alarm()
+
+    def sleep_timer(self, seconds: float, fade: float = 60.0):
+        """Fade everything out, ending seconds from now, and stop the program"""
+        with self._lock:
+            if self.origin is None:
+                self.start()
+            at = self.backend.now() - self.origin + max(0.0, seconds - fade)
+        self.add({'at': at, 'action': 'fade_all', 'seconds': fade})
+
+    @property
+    def pending(self) -> int:
+        return len(self.queue)
+
+    def elapsed(self) -> float:
+        """Seconds since start()"""
+        return 0.0 if self.origin is None else self.backend.now() - self.origin
+
+    def _arm(self):
+        """Hand the earliest deadline to the backend alarm"""
+        if self.queue:
+            self.backend.set_alarm(self.queue[0][0], self._fire)
+        else:
+            self.backend.cancel_alarm()
+
+    def _fire(self, now: float):
+        """Alarm callback: run every due event, then re-arm"""
+        with self._lock:
+            due = []
+            while self.queue and self.queue[0][0] <= now:
+                deadline, _, event = heapq.heappop(self.queue)
+                self.lateness = max(self.lateness, now - deadline)
+                due.append(event)
+
+            for event in due:
+                try:
+                    self._apply(event)
+                except Exception as e:
+                    print(f"Error in timeline event {event}: {e}")
+                self.fired += 1
+                if self.on_event:
+                    self.on_event(event)
+            self._arm()
+
+    def _apply(self, event: dict):
+        """Translate an event into player calls"""
+        player = self.player
+        action = event['action']
+        seconds = float(event.get('seconds', 0.0))
+
+        if action == 'fade_all':
+            for sound_path in list(player.playing_sounds):
+                self._fade_out(sound_path, seconds)
+            if event.get('end', True):
+                # The session is over: later events are dropped
+                self.queue.clear()
+            return
+
+        sound_path = self.resolve(event['sound'])
+        if action == 'play':
+            volume = float(event.get('volume', player.base_volume))
+            sound_info = player.playing_sounds.get(sound_path)
+            if sound_info and sound_info.get('paused'):
+                player.unpause_sound(sound_path)
+            elif sound_info and not (sound_info['channel'] and sound_info['channel'].get_busy()):
+                # Stopped or only loaded: start it afresh
+                player.unload_sound(sound_path)
+            start = 0.0
+            if sound_path in player.playing_sounds:
+                start = player.playing_sounds[sound_path]['volume_ramp'].value
+            elif not player.play(sound_path):
+                return
+            player.playing_sounds[sound_path]['volume'] = volume
+            player.fade_volume(sound_path, start, volume, duration=seconds)
+            if 'pan' in event:
+                player.set_pan(sound_path, float(event['pan']))
+        elif action == 'stop':
+            self._fade_out(sound_path, seconds)
+        elif action == 'volume':
+            # Slow level drift: a long fade toward a new level
+            sound_info = player.playing_sounds.get(sound_path)
+            if sound_info:
+                volume = float(event['volume'])
+                sound_info['volume'] = volume
+                player.fade_volume(sound_path, sound_info['volume_ramp'].value, volume, duration=seconds)
+        elif action == 'pan':
+            sound_info = player.playing_sounds.get(sound_path)
+            if sound_info:
+                player.fade_pan(sound_path, sound_info['pan'], float(event['pan']), duration=seconds)
+        elif action == 'breathing':
+            if event.get('enabled', True):
+                player.start_breathing(sound_path)
+            else:
+                player.stop_breathing(sound_path)
+        elif action == 'random_pan':
+            if event.get('enabled', True):
+                player.start_random_pan(sound_path)
+            else:
+                player.stop_random_pan(sound_path)
+
+    def _fade_out(self, sound_path: str, seconds: float):
+        """Fade a sound to silence, then unload it"""
+        sound_info = self.player.playing_sounds.get(sound_path)
+        if not sound_info:
+            return
+        if seconds <= 0:
+            self.player.unload_sound(sound_path)
+            return
+        self.player.fade_volume(sound_path, sound_info['volume_ramp'].value, 0.0,
+                                callback=lambda: self.player.unload_sound(sound_path),
+                                duration=seconds)
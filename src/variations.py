@@ -0,0 +1,270 @@
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import wave
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from assets_watcher import is_sound_file
+from audio_io import read_wav, write_wav
+
+# Variation settings; part of the cache key, so changing one regenerates
+DEFAULT_PARAMS = {
+    'seconds': None,         # length of each variant (None: as long as the source)
+    'min_segment': 0.75,     # shortest shuffled segment in seconds
+    'max_segment': 2.5,      # longest shuffled segment in seconds
+    'speed_variance': 0.03,  # +-3% playback speed per segment
+    'crossfade': 0.02,       # crossfade between segments in seconds
+}
+# "<key>.<n>" part of a variant file name
+VARIANT_SUFFIX = re.compile(r'^[0-9a-f]{16}\.\d+$')
+
+
+def zero_crossings(mono: np.ndarray) -> np.ndarray:
+    """Indices where the signal changes sign"""
+    return np.nonzero(np.signbit(mono[:-1]) != np.signbit(mono[1:]))[0] + 1
+
+
+def segment_bounds(samples: np.ndarray, rate: int, rng: np.random.Generator,
+                   min_segment: float, max_segment: float, fade: int) -> np.ndarray:
+    """Random segment boundaries snapped to zero crossings, shape (segments, 2)"""
+    frames = samples.shape[0]
+    crossings = zero_crossings(samples.mean(axis=1))
+    # Every segment reads fade frames past its end for the crossfade
+    crossings = crossings[crossings < frames - fade]
+    if crossings.size < 2:
+        return np.array([[0, max(1, frames - fade)]])
+
+    # Draw all lengths at once and snap each cut to the next crossing
+    count = int(frames / (min_segment * rate)) + 2
+    targets = crossings[0] + np.cumsum(rng.uniform(min_segment, max_segment, count) * rate)
+    targets = targets[targets < crossings[-1]]
+    cuts = crossings[np.searchsorted(crossings, targets)]
+    bounds = np.unique(np.concatenate([[crossings[0]], cuts, [crossings[-1]]]))
+
+    segments = np.stack([bounds[:-1], bounds[1:]], axis=1)
+    segments = segments[segments[:, 1] - segments[:, 0] > 2 * fade]
+    if segments.size == 0:
+        return np.array([[crossings[0], crossings[-1]]])
+    return segments
+
+
+def shuffle_order(segment_count: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    """Concatenated permutations without the same segment twice in a row"""
+    reps = -(-length // segment_count) + 1
+    order = np.concatenate([rng.permutation(segment_count) for _ in range(reps)])
+    if segment_count > 1:
+        repeats = np.nonzero(order[1:] == order[:-1])[0] + 1
+        # A repeat can only occur at a permutation seam; swap it one step on
+        for index in repeats:
+            swap = index + 1 if index + 1 < order.size else index - 2
+            order[index], order[swap] = order[swap], order[index]
+    return order
+
+
+def generate_variation(samples: np.ndarray, rate: int, seed: int = 0, **params) -> np.ndarray:
+    """Build a long, non-repeating variant of a loop
+
+    Segments cut at zero crossings are shuffled, each played back at a
+    slightly different speed (a light pitch and time change together) and
+    joined with equal-power crossfades. The tail is crossfaded into the
+    head so the variant loops without a seam. Without a seconds setting
+    the variant is as long as the loop it replaces.
+    """
+    settings = dict(DEFAULT_PARAMS, **params)
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    frames, channels = samples.shape
+    rng = np.random.default_rng(seed)
+    fade = max(1, int(settings['crossfade'] * rate))
+
+    segments = segment_bounds(samples, rate, rng, settings['min_segment'], settings['max_segment'], fade)
+    lengths = segments[:, 1] - segments[:, 0]
+    target = frames if settings['seconds'] is None else int(settings['seconds'] * rate)
+    needed = int(target / max(1.0, lengths.mean())) + 2
+    order = shuffle_order(len(segments), needed, rng)
+    variance = settings['speed_variance']
+    speeds = 1.0 + rng.uniform(-variance, variance, order.size)
+
+    ramp = np.linspace(0.0, np.pi / 2, fade, dtype=np.float32)
+    fade_in = np.sin(ramp)[:, None]
+    fade_out = np.cos(ramp)[:, None]
+
+    out = np.zeros((target + int(lengths.max() / (1.0 - variance)) + 2 * fade, channels), dtype=np.float32)
+    position = 0
+    for segment, speed in zip(order, speeds):
+        if position >= target:
+            break
+        start, end = segments[segment]
+        # The last segment is cut short to end exactly at the target length
+        count = min(int((end - start) / speed), target - position)
+
+        # Linear-interpolated read at the segment's speed, fade tail included
+        index = start + np.arange(count + fade) * speed
+        index = np.minimum(index, frames - 1)
+        base = index.astype(np.int64)
+        frac = (index - base).astype(np.float32)[:, None]
+        piece = samples[base] * (1.0 - frac) + samples[np.minimum(base + 1, frames - 1)] * frac
+
+        piece[:fade] *= fade_in
+        piece[count:] *= fade_out
+        out[position:position + count + fade] += piece
+        position += count
+
+    # Wrap the last fade-out onto the first fade-in for a seamless loop
+    out[:fade] += out[position:position + fade]
+    return out[:position]
+
+
+def _render_variation(job) -> str:
+    """Process pool worker: render one variant to its cache file"""
+    sound_path, out_path, seed, params = job
+    samples, rate = read_wav(sound_path)
+    variant = generate_variation(samples, rate, seed, **params)
+    # Write under a temporary name so readers never see a partial file
+    temp_path = out_path + '.tmp'
+    write_wav(temp_path, variant, rate)
+    os.replace(temp_path, out_path)
+    return out_path
+
+
+class VariationCache:
+    """Pre-rendered loop variants stored next to each other on disk
+
+    Files are named <sound>.<key>.<n>.wav, where the key hashes the source
+    path, modification time, size and parameters. Generation runs in a
+    process pool. A variant has the source's length and channel count and
+    is written as 16-bit, so loading one for playback takes the same
+    memory as a 16-bit source loop.
+    """
+
+    def __init__(self, directory: str, count: int = 3, params: Optional[dict] = None,
+                 max_source_seconds: float = 60.0):
+        self.directory = directory
+        self.count = count
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        # Longer recordings do not repeat audibly enough to need variants
+        self.max_source_seconds = max_source_seconds
+        # One pool per running generate(); close() shuts them all down
+        self._executors: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def key(self, sound_path: str) -> str:
+        """Cache key for a source file and the current parameters"""
+        stat = os.stat(sound_path)
+        data = json.dumps([os.path.abspath(sound_path), stat.st_mtime, stat.st_size, self.params],
+                          sort_keys=True)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+    def paths(self, sound_path: str) -> List[str]:
+        """Variant file paths for a source file"""
+        stem = os.path.splitext(os.path.basename(sound_path))[0]
+        key = self.key(sound_path)
+        return [os.path.join(self.directory, f"{stem}.{key}.{i}.wav") for i in range(self.count)]
+
+    def needs_variants(self, sound_path: str) -> bool:
+        """Whether a file is a short loop"""
+        try:
+            with wave.open(sound_path, 'rb') as wav:
+                return wav.getnframes() / wav.getframerate() <= self.max_source_seconds
+        except Exception:
+            return False
+
+    def lookup(self, sound_path: str) -> Optional[str]:
+        """A random finished variant of a file, or None"""
+        try:
+            ready = [path for path in self.paths(sound_path) if os.path.exists(path)]
+        except OSError:
+            return None
+        return random.choice(ready) if ready else None
+
+    def _prune(self, sound_path: str, keep: List[str]):
+        """Remove variants rendered from an older version of a file"""
+        stem = os.path.splitext(os.path.basename(sound_path))[0]
+        for path in glob.glob(os.path.join(glob.escape(self.directory), glob.escape(stem) + '.*.wav')):
+            # Only <stem>.<key>.<n>.wav, not variants of e.g. rain.heavy.wav when stem is rain
+            suffix = os.path.basename(path)[len(stem) + 1:-len('.wav')]
+            if path not in keep and VARIANT_SUFFIX.match(suffix):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def generate(self, sound_paths: Iterable[str], workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """Render missing variants in a process pool, returns ready paths per file"""
+        os.makedirs(self.directory, exist_ok=True)
+        jobs = []
+        ready: Dict[str, List[str]] = {}
+        for sound_path in sound_paths:
+            if not self.needs_variants(sound_path):
+                continue
+            paths = self.paths(sound_path)
+            self._prune(sound_path, paths)
+            ready[sound_path] = []
+            for seed, path in enumerate(paths):
+                if os.path.exists(path):
+                    ready[sound_path].append(path)
+                else:
+                    jobs.append((sound_path, path, seed, self.params))
+
+        if not jobs:
+            return ready
+
+        # Submitting under the lock means close() cannot shut the pool down halfway
+        with self._lock:
+            if self._closed:
+                return ready
+            executor = ProcessPoolExecutor(max_workers=workers)
+            self._executors.add(executor)
+            futures = [(job[0], executor.submit(_render_variation, job)) for job in jobs]
+        try:
+            for sound_path, future in futures:
+                try:
+                    ready[sound_path].append(future.result())
+                except CancelledError:
+                    pass
+                except Exception as e:
+                    print(f"Error generating variation for {sound_path}: {e}")
+        finally:
+            with self._lock:
+                self._executors.discard(executor)
+            executor.shutdown()
+        return ready
+
+    def generate_in_background(self, sound_paths: Iterable[str]) -> threading.Thread:
+        """Run generate() on a daemon thread"""
+        thread = threading.Thread(target=self.generate, args=(list(sound_paths),), daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Cancel pending renders"""
+        with self._lock:
+            self._closed = True
+            executors = list(self._executors)
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    """Pre-render variants: python src/variations.py [assets_dir] [cache_dir]"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assets_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, 'assets')
+    cache_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'cache', 'variations')
+    sound_paths = [os.path.join(assets_dir, name) for name in sorted(os.listdir(assets_dir))
+                   if is_sound_file(name)]
+    for sound_path, paths in VariationCache(cache_dir).generate(sound_paths).items():
+        print(f"{os.path.basename(sound_path)}: {len(paths)} variants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import read_wav_int16
+
+# Frames per bin of the finest level, and bins merged per coarser level
+BASE_BIN = 256
+FACTOR = 4
+# Coarsest level keeps at least this many bins
+MIN_BINS = 16
+
+
+def _tail_bins(samples: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Min and max per bin of width frames; a partial last bin is kept"""
+    frames = samples.shape[0]
+    full = frames // width
+    if full:
+        body = samples[:full * width].reshape(full, -1)
+        mins, maxs = body.min(axis=1), body.max(axis=1)
+    else:
+        # Shorter than one bin: only the tail, and no bins at all when empty
+        mins = maxs = np.zeros(0, dtype=samples.dtype)
+    if frames > full * width:
+        tail = samples[full * width:]
+        mins = np.append(mins, tail.min())
+        maxs = np.append(maxs, tail.max())
+    return mins, maxs
+
+
+def build_pyramid(samples: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Min/max peaks of int16 (frames, channels) audio at every resolution
+
+    Level 0 has one bin per BASE_BIN frames (all channels folded in); each
+    further level merges FACTOR bins of the one before, so the whole
+    pyramid is a third larger than its finest level.
+    """
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    mins, maxs = _tail_bins(samples, BASE_BIN)
+    levels = [(mins, maxs)]
+    while mins.shape[0] > MIN_BINS * FACTOR:
+        pad = -mins.shape[0] % FACTOR
+        mins = np.pad(mins, (0, pad), mode='edge').reshape(-1, FACTOR).min(axis=1)
+        maxs = np.pad(maxs, (0, pad), mode='edge').reshape(-1, FACTOR).max(axis=1)
+        levels.append((mins, maxs))
+    return levels
+
+
+class Waveform:
+    """Peak pyramid of one asset, drawn at any width"""
+
+    def __init__(self, levels: List[Tuple[np.ndarray, np.ndarray]], frames: int, sample_rate: int):
+        self.levels = levels
+        self.frames = frames
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds"""
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    def columns(self, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Min and max of each of width columns, scaled to [-1, 1]"""
+        # Coarsest level that still has a bin for every column
+        mins, maxs = self.levels[0]
+        for level_mins, level_maxs in self.levels:
+            if level_mins.shape[0] < width:
+                break
+            mins, maxs = level_mins, level_maxs
+        bins = mins.shape[0]
+        if bins == 0:
+            # Empty file: a flat line
+            return np.zeros(width), np.zeros(width)
+        if bins >= width:
+            starts = (np.arange(width) * bins) // width
+            mins = np.minimum.reduceat(mins, starts)
+            maxs = np.maximum.reduceat(maxs, starts)
+        else:
+            index = (np.arange(width) * bins) // width
+            mins, maxs = mins[index], maxs[index]
+        return mins / 32768.0, maxs / 32768.0
+
+    def outline(self, width: int, height: int) -> List[float]:
+        """Flat x, y polygon coordinates of the waveform filling width x height pixels"""
+        mins, maxs = self.columns(width)
+        middle = height / 2.0
+        x = np.arange(width, dtype=np.float64)
+        # Keep silence visible as a one-pixel line
+        top = middle - np.maximum(maxs * middle, 0.5)
+        bottom = middle - np.minimum(mins * middle, -0.5)
+        xs = np.concatenate([x, x[::-1]])
+        ys = np.concatenate([top, bottom[::-1]])
+        return np.column_stack([xs, ys]).ravel().tolist()
+
+
+class WaveformCache:
+    """Peak pyramids of assets stored next to each other on disk
+
+    Files are named <sound>.<key>.npz, where the key hashes the source
+    path, modification time and size, so an unchanged asset costs one
+    small file read and a changed one is rebuilt in the background.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.waveforms: Dict[str, Waveform] = {}
+        self._building: set = set()
+        self._lock = threading.Lock()
+
+    def key(self, sound_path: str) -> str:
+        """Cache key for a source file"""
+        stat = os.stat(sound_path)
+        data = json.dumps([os.path.abspath(sound_path), stat.st_mtime, stat.st_size, BASE_BIN, FACTOR])
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+    def path(self, sound_path: str) -> str:
+        """Pyramid file of a source file"""
+        stem = os.path.splitext(os.path.basename(sound_path))[0]
+        return os.path.join(self.directory, f"{stem}.{self.key(sound_path)}.npz")
+
+    def get(self, sound_path: str) -> Optional[Waveform]:
+        """Waveform from memory or disk, None if it has not been built"""
+        try:
+            cache_path = self.path(sound_path)
+        except OSError:
+            return None
+        waveform = self.waveforms.get(cache_path)
+        if waveform is None and os.path.exists(cache_path):
+            try:
+                waveform = self._load(cache_path)
+                self.waveforms[cache_path] = waveform
+            except Exception as e:
+                print(f"Error loading waveform {cache_path}: {e}")
+        return waveform
+
+    def _load(self, cache_path: str) -> Waveform:
+        """Read a pyramid file"""
+        with np.load(cache_path) as data:
+            splits = np.cumsum(data['sizes'])[:-1]
+            levels = list(zip(np.split(data['mins'], splits), np.split(data['maxs'], splits)))
+            return Waveform(levels, int(data['frames']), int(data['sample_rate']))
+
+    def build(self, sound_path: str) -> Waveform:
+        """Compute and store the pyramid of a file"""
+        samples, rate = read_wav_int16(sound_path)
+        levels = build_pyramid(samples)
+        waveform = Waveform(levels, samples.shape[0], rate)
+        cache_path = self.path(sound_path)
+        os.makedirs(self.directory, exist_ok=True)
+        self._prune(sound_path, cache_path)
+        # Write under a temporary name so readers never see a partial file
+        temp_path = cache_path + '.tmp.npz'
+        np.savez(temp_path,
+                 mins=np.concatenate([mins for mins, _ in levels]),
+                 maxs=np.concatenate([maxs for _, maxs in levels]),
+                 sizes=np.array([mins.shape[0] for mins, _ in levels]),
+                 frames=samples.shape[0], sample_rate=rate)
+        os.replace(temp_path, cache_path)
+        self.waveforms[cache_path] = waveform
+        return waveform
+
+    def _prune(self, sound_path: str, keep: str):
+        """Remove pyramids of older versions of a file"""
+        stem = os.path.splitext(os.path.basename(sound_path))[0]
+        for path in glob.glob(os.path.join(glob.escape(self.directory), glob.escape(stem) + '.*.npz')):
+            # Only <stem>.<key>.npz, not other sounds whose names start with stem
+            key = os.path.basename(path)[len(stem) + 1:-len('.npz')]
+            if path != keep and len(key) == 16 and '.' not in key:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def request(self, sound_path: str, on_ready: Callable[[Waveform], None]) -> Optional[Waveform]:
+        """Cached waveform now, or None and on_ready(waveform) once built on a daemon thread"""
+        waveform = self.get(sound_path)
+        if waveform is not None:
+            return waveform
+        with self._lock:
+            if sound_path in self._building:
+                return None
+            self._building.add(sound_path)
+        thread = threading.Thread(target=self._build_and_notify, args=(sound_path, on_ready), daemon=True)
+        thread.start()
+        return None
+
+    def _build_and_notify(self, sound_path: str, on_ready: Callable[[Waveform], None]):
+        """Background build"""
+        try:
+            on_ready(self.build(sound_path))
+        except Exception as e:
+            print(f"Error building waveform for {sound_path}: {e}")
+        finally:
+            with self._lock:
+                self._building.discard(sound_path)
@@ -0,0 +1,28 @@
+import os
+import sys
+import tkinter as tk
+
+import pytest
+
+# Modules live flat in src/ and import each other without a package prefix
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Mixer window on the virtual-clock backend with presets in tmp_path"""
+    ctk = pytest.importorskip('customtkinter')
+    from gui import SoundMixerGUI
+    from mixer_backend import FakeBackend
+    from preset_library import PresetLibrary
+    try:
+        root = ctk.CTk()
+    except tk.TclError:
+        pytest.skip('no display')
+    app = SoundMixerGUI(root, backend=FakeBackend())
+    app.presets = PresetLibrary(str(tmp_path))
+    yield app
+    try:
+        app.on_closing()
+    except tk.TclError:
+        pass  # Already closed by the test
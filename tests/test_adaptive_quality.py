@@ -0,0 +1,102 @@
+import pytest
+
+from adaptive_quality import MAX_LATENESS, QUALITY_LEVELS, AdaptiveQuality
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+
+
+def quality_with_load(load: list, **kwargs):
+    """Player on the virtual clock whose process uses load[0] of a CPU"""
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    cpu = {'time': 0.0, 'last': 0.0}
+
+    def cpu_clock():
+        cpu['time'] += (backend.now() - cpu['last']) * load[0]
+        cpu['last'] = backend.now()
+        return cpu['time']
+
+    quality = AdaptiveQuality(player, cpu_clock=cpu_clock, **kwargs)
+    quality.start()
+    return backend, player, quality
+
+
+def test_cpu_pressure_steps_down_one_level_per_window():
+    load = [0.9]
+    backend, player, quality = quality_with_load(load, window=2.0)
+    assert quality.name == 'full'
+    backend.advance(2.01)
+    assert quality.name == 'reduced'
+    assert player.control_interval == QUALITY_LEVELS[1]['control_interval']
+    assert player.gui_interval == QUALITY_LEVELS[1]['gui_interval']
+    # The backend ticks at the new interval
+    ticks = backend.ticks
+    backend.advance(0.8)
+    assert backend.ticks - ticks == pytest.approx(0.8 / 0.08, abs=1)
+
+    backend.advance(20.0)
+    assert quality.name == 'minimal'
+    assert [change['to'] for change in quality.changes] == ['reduced', 'low', 'minimal']
+    assert quality.changes[0]['cpu'] == pytest.approx(0.9)
+
+
+def test_recovers_one_level_after_calm_windows():
+    load = [0.9]
+    backend, player, quality = quality_with_load(load, window=2.0, recover_windows=3)
+    backend.advance(4.5)
+    assert quality.name == 'low'
+    load[0] = 0.1
+    # A load between the thresholds is neither pressure nor calm
+    backend.advance(5.0)
+    assert quality.name == 'low'
+    backend.advance(6.5)
+    assert quality.name == 'reduced'
+    backend.advance(6.5)
+    assert quality.name == 'full'
+    assert player.control_interval == QUALITY_LEVELS[0]['control_interval']
+
+
+def test_underruns_count_as_pressure():
+    load = [0.0]
+    backend, player, quality = quality_with_load(load, window=2.0)
+    underruns = {'underruns': 0}
+    backend.output_stats = lambda: dict(underruns)
+    backend.advance(4.5)
+    assert quality.name == 'full'
+    underruns['underruns'] = 3
+    backend.advance(2.0)
+    assert quality.name == 'reduced'
+    assert quality.changes[-1]['underruns'] == 3
+    # Old underruns are not counted again in the next window
+    backend.advance(2.0)
+    assert quality.name == 'reduced'
+
+
+def test_late_ticks_step_down_and_stalls_are_capped():
+    player = AudioPlayer(FakeBackend())
+    quality = AdaptiveQuality(player, window=1.0, cpu_clock=lambda: 0.0)
+    quality._apply(0)
+    # Every tick arrives a whole interval late
+    for index in range(11):
+        quality._tick(index * 0.1)
+    assert quality.lateness == pytest.approx(1.0)
+    assert quality.name == 'reduced'
+
+    # One ten-second stall weighs no more than MAX_LATENESS intervals
+    quality = AdaptiveQuality(player, window=1.0, cpu_clock=lambda: 0.0)
+    quality._tick(0.0)
+    quality._tick(10.0)
+    assert quality.lateness == pytest.approx(MAX_LATENESS)
+
+
+def test_stop_restores_full_quality():
+    load = [0.9]
+    backend, player, quality = quality_with_load(load, window=2.0)
+    backend.advance(4.5)
+    assert quality.name != 'full'
+    quality.stop()
+    assert quality.name == 'full'
+    assert player.control_interval == QUALITY_LEVELS[0]['control_interval']
+    changes = len(quality.changes)
+    backend.advance(10.0)
+    assert len(quality.changes) == changes
@@ -0,0 +1,24 @@
+from assets_watcher import AssetsWatcher, is_sound_file
+
+
+def test_sound_files_match_case_insensitively():
+    assert is_sound_file('rain.wav')
+    assert is_sound_file('RAIN.WAV')
+    assert not is_sound_file('notes.txt')
+    assert not is_sound_file('wav')
+
+
+def test_watcher_reports_added_removed_and_changed(tmp_path):
+    (tmp_path / 'rain.wav').write_bytes(b'RIFF')
+    (tmp_path / 'readme.txt').write_text('not a sound')
+    watcher = AssetsWatcher(str(tmp_path), use_inotify=False, full_scan_every=1)
+    assert watcher.names() == ['rain.wav']
+
+    (tmp_path / 'SEA.WAV').write_bytes(b'RIFF')
+    (tmp_path / 'rain.wav').write_bytes(b'RIFF----')
+    assert watcher.poll() == (['SEA.WAV'], [], ['rain.wav'])
+
+    (tmp_path / 'rain.wav').unlink()
+    assert watcher.poll() == ([], ['rain.wav'], [])
+    assert watcher.poll() == ([], [], [])
+    watcher.close()
@@ -0,0 +1,63 @@
+import asyncio
+
+from async_player import AsyncPlayer
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+
+
+async def drive(backend: FakeBackend, task: asyncio.Task, seconds: float):
+    """Advance the virtual clock tick by tick, letting the task run in between"""
+    for _ in range(int(seconds / 0.05)):
+        backend.advance(0.05)
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+def test_fade_resolves_true_when_it_arrives():
+    async def run():
+        backend = FakeBackend()
+        player = AudioPlayer(backend)
+        player.play('rain.wav')
+        front = AsyncPlayer(player)
+        task = asyncio.create_task(front.fade_to('rain.wav', 0.2, duration=1.0))
+        await asyncio.sleep(0)
+        await drive(backend, task, 1.5)
+        return await task
+
+    assert asyncio.run(run()) is True
+
+
+def test_stop_is_superseded_by_a_retarget_without_callback():
+    async def run():
+        backend = FakeBackend()
+        player = AudioPlayer(backend)
+        player.play('rain.wav')
+        front = AsyncPlayer(player)
+        task = asyncio.create_task(front.stop('rain.wav', duration=2.0))
+        await asyncio.sleep(0)
+        await drive(backend, task, 0.5)
+        player.set_volume('rain.wav', 0.8)
+        await drive(backend, task, 3.0)
+        return await task, player
+
+    stopped, player = asyncio.run(run())
+    assert stopped is False
+    assert player.playing_sounds['rain.wav']['channel'].get_busy()
+
+
+def test_cancelling_a_fade_stops_its_ramp_in_place():
+    async def run():
+        backend = FakeBackend()
+        player = AudioPlayer(backend)
+        player.play('rain.wav')
+        front = AsyncPlayer(player)
+        task = asyncio.create_task(front.fade_to('rain.wav', 0.0, duration=2.0))
+        await asyncio.sleep(0)
+        await drive(backend, task, 1.0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return player.playing_sounds['rain.wav']
+
+    sound_info = asyncio.run(run())
+    assert not sound_info['volume_ramp'].active
+    assert 0.0 < sound_info['volume'] == sound_info['volume_ramp'].value
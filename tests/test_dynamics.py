@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from dynamics import Ducker, Limiter, MasterDynamics
+from mix_engine import LoopSource, MixEngine
+
+
+def blocks(signal: np.ndarray, size: int = 512):
+    for start in range(0, signal.shape[0], size):
+        yield signal[start:start + size]
+
+
+def test_limiter_holds_the_ceiling_on_sudden_peaks():
+    rng = np.random.default_rng(1)
+    signal = rng.uniform(-0.3, 0.3, (44100, 2)).astype(np.float32)
+    # Single-sample spikes, one right at a block boundary
+    signal[10000] = 4.0
+    signal[20480] = -2.5
+    signal[30000:30600] *= 6.0
+    limiter = Limiter(2, 44100, ceiling_db=-1.0)
+    out = np.concatenate([limiter.process(block) for block in blocks(signal)])
+
+    ceiling = 10.0 ** (-1.0 / 20.0)
+    assert np.abs(out).max() <= ceiling * 1.0001
+    assert limiter.latency == pytest.approx(limiter.lookahead / 44100)
+    # Quiet material passes through unchanged, only delayed by the look-ahead
+    delay = limiter.lookahead
+    assert out[delay + 100:delay + 5000] == pytest.approx(signal[100:5000], abs=1e-6)
+
+
+def test_limiter_recovers_at_its_release_rate():
+    limiter = Limiter(2, 44100, ceiling_db=-6.0, release_rate=40.0)
+    loud = np.full((4410, 2), 1.0, dtype=np.float32)
+    limiter.process(loud)
+    assert limiter.reduction_db == pytest.approx(6.0, abs=0.01)
+    # A tenth of a second of quiet releases 4 dB at 40 dB/s, less the 5 ms
+    # look-ahead hold and half the smoothing window (0.3 dB together)
+    quiet = np.full((4410, 2), 0.01, dtype=np.float32)
+    out = limiter.process(quiet)
+    gain_db = 20.0 * np.log10(out[-1, 0] / 0.01)
+    assert gain_db == pytest.approx(-2.0 - 0.3, abs=0.05)
+    assert np.all(np.diff(out[limiter.lookahead * 2:, 0]) >= 0.0)
+
+
+def test_ducker_reaches_its_depth_and_recovers():
+    ducker = Ducker(44100, threshold_db=-40.0, depth_db=12.0, range_db=6.0, attack_ms=20.0, release_rate=30.0)
+    # Key 6 dB or more above the threshold ducks by the full depth after the attack
+    gain = ducker.gain(np.full(4410, 0.1))
+    assert gain[0] == pytest.approx(1.0, abs=0.01)
+    assert 20.0 * np.log10(gain[-1]) == pytest.approx(-12.0, abs=0.01)
+    # Halfway up the range ducks halfway
+    ducker = Ducker(44100, threshold_db=-40.0, depth_db=12.0, range_db=6.0)
+    gain = ducker.gain(np.full(4410, 10.0 ** (-37.0 / 20.0)))
+    assert 20.0 * np.log10(gain[-1]) == pytest.approx(-6.0, abs=0.01)
+
+    # The key level releases at 30 dB/s: from the top of the range, 0.1 s
+    # of silence brings it halfway down and the gain halfway back, less the
+    # 10 ms the attack average lags behind (0.3 dB of key level)
+    ducker = Ducker(44100, threshold_db=-40.0, depth_db=12.0, range_db=6.0, release_rate=30.0)
+    ducker.gain(np.full(4410, 10.0 ** (-34.0 / 20.0)))
+    gain = ducker.gain(np.zeros(4410))
+    assert ducker.active
+    assert 20.0 * np.log10(gain[-1]) == pytest.approx(-6.0 - 0.6, abs=0.05)
+    # A block after the key level has fallen through the threshold is clean
+    ducker.gain(np.zeros(44100))
+    assert ducker.gain(np.zeros(512)) == pytest.approx(1.0)
+    assert not ducker.active
+
+
+def test_key_voice_ducks_the_rest_of_the_mix():
+    engine = MixEngine('stereo', 44100, 512)
+    dynamics = MasterDynamics(engine.channels, 44100)
+    dynamics.limiter.enabled = False
+    engine.ducker = dynamics.ducker
+    bed = np.full((4096, 1), 8000, dtype=np.int16)
+    key = np.full((4096, 1), 16000, dtype=np.int16)
+    engine.add_voice('bed', LoopSource(bed), 1.0)
+    for _ in range(4):
+        engine.render_block()
+    before = engine.render_block()[:, 0].mean()
+
+    engine.add_voice('voice', LoopSource(key), 1.0, key=True)
+    for _ in range(20):
+        engine.render_block()
+    engine.remove_voice('voice')
+    # Without the key the bed stays ducked while the ducker recovers
+    ducked = engine.render_block()[:, 0].mean()
+    assert 20.0 * np.log10(ducked / before) == pytest.approx(-12.0, abs=0.5)
+    assert dynamics.stats()['ducking_db'] == pytest.approx(12.0, abs=0.5)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from eq import BlockFilter, FilterChain, biquad_coefficients, cascade_state_space
+
+RATE = 44100
+BLOCK = 512
+
+
+def direct_form(sections, x: np.ndarray) -> np.ndarray:
+    """Reference: each biquad per sample in transposed direct form II"""
+    y = np.array(x, dtype=np.float64)
+    for b0, b1, b2, a1, a2 in sections:
+        s1 = np.zeros(y.shape[1])
+        s2 = np.zeros(y.shape[1])
+        out = np.empty_like(y)
+        for n in range(y.shape[0]):
+            out[n] = b0 * y[n] + s1
+            s1 = b1 * y[n] - a1 * out[n] + s2
+            s2 = b2 * y[n] - a2 * out[n]
+        y = out
+    return y
+
+
+def noise(frames: int, channels: int = 2) -> np.ndarray:
+    return np.random.default_rng(3).uniform(-0.5, 0.5, (frames, channels)).astype(np.float32)
+
+
+def test_block_filter_matches_a_direct_form_cascade():
+    sections = [
+        biquad_coefficients('highpass', 80.0, RATE),
+        biquad_coefficients('peaking', 1000.0, RATE, 6.0, 1.4),
+        biquad_coefficients('highshelf', 6000.0, RATE, -4.0),
+        biquad_coefficients('lowpass', 12000.0, RATE),
+    ]
+    x = noise(BLOCK * 3 + 300)
+    block_filter = BlockFilter()
+    block_filter.set_system(*cascade_state_space(sections))
+    # Whole sub-blocks, then a block of another length: the state carries across both
+    out = np.concatenate([block_filter.process(x[:BLOCK]), block_filter.process(x[BLOCK:BLOCK * 3]),
+                          block_filter.process(x[BLOCK * 3:])])
+    assert out == pytest.approx(direct_form(sections, x), abs=1e-5)
+    # Mono blocks come back mono
+    mono = BlockFilter()
+    mono.set_system(*cascade_state_space(sections))
+    assert mono.process(x[:BLOCK, 0]) == pytest.approx(out[:BLOCK, 0], abs=1e-6)
+
+
+def test_settled_chain_matches_its_bands():
+    chain = FilterChain(RATE)
+    chain.set_band('low', 'lowshelf', 200.0, 3.0)
+    chain.set_band('presence', 'peaking', 3000.0, -5.0, 2.0)
+    x = noise(BLOCK * 4)
+    out = np.concatenate([chain.process(x[i * BLOCK:(i + 1) * BLOCK]) for i in range(4)])
+    sections = [biquad_coefficients('lowshelf', 200.0, RATE, 3.0),
+                biquad_coefficients('peaking', 3000.0, RATE, -5.0, 2.0)]
+    # The first block fades in from the empty cascade; after it the chain is the cascade
+    assert out[BLOCK:] == pytest.approx(direct_form(sections, x)[BLOCK:], abs=1e-5)
+
+
+def test_sweep_lands_on_its_target_with_few_rebuilds():
+    chain = FilterChain(RATE)
+    chain.set_band('lowpass', 'lowpass', 20000.0)
+    x = noise(BLOCK)
+    chain.process(x)
+    rebuilds = chain.rebuilds
+    chain.set_band('lowpass', freq=500.0)
+    for _ in range(100):
+        chain.process(x)
+    assert chain.bands['lowpass']['current'] == [500.0, 0.0, 0.707]
+    # Rebuilt after audible steps only, not on every block of the glide
+    assert chain.rebuilds - rebuilds < 30
+    static = chain.rebuilds
+    for _ in range(10):
+        chain.process(x)
+    assert chain.rebuilds == static
+
+
+def largest_steps(change, blocks: int = 20, at: int = 10):
+    """Largest sample-to-sample step of a filtered sine before and around a band change"""
+    t = np.arange(BLOCK * blocks) / RATE
+    tone = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    x = np.stack([tone, tone], axis=1)
+    chain = FilterChain(RATE)
+    chain.set_band('lowpass', 'lowpass', 2000.0)
+    out = []
+    for i in range(blocks):
+        if i == at:
+            change(chain)
+        out.append(chain.process(x[i * BLOCK:(i + 1) * BLOCK]))
+    steps = np.abs(np.diff(np.concatenate(out)[:, 0]))
+    return steps[BLOCK * 5:BLOCK * at - 2].max(), steps[BLOCK * at - 2:BLOCK * at + BLOCK].max()
+
+
+@pytest.mark.parametrize('change', [
+    lambda chain: chain.set_band('smart_low', 'lowshelf', 250.0, -3.0),
+    lambda chain: chain.set_band('highpass', 'highpass', 20.0),
+    lambda chain: chain.remove_band('lowpass'),
+    lambda chain: chain.set_band('lowpass', 'highpass'),
+], ids=['add shelf', 'add tone band', 'remove last band', 'retype band'])
+def test_changing_the_cascade_does_not_click(change):
+    steady, around_change = largest_steps(change)
+    assert around_change < steady * 1.2
@@ -0,0 +1,10 @@
+def test_closing_the_window_stops_every_worker(app):
+    app._open_variations()
+    closed = []
+    app.assets_watcher.close = lambda: closed.append('assets watcher')
+    app.audio_player.variations.close = lambda: closed.append('variations')
+    app.timeline.stop = lambda: closed.append('timeline')
+    app.audio_player.cleanup = lambda: closed.append('player')
+
+    app.on_closing()
+    assert closed == ['assets watcher', 'timeline', 'variations', 'player']
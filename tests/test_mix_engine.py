@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from mix_engine import LoopSource, MixEngine
+
+
+def render(samples: np.ndarray, x: float = 0.0, layout: str = 'stereo') -> np.ndarray:
+    """Second block of a single voice (the first one ramps in its gains)"""
+    engine = MixEngine(layout, 44100, 512)
+    engine.add_voice('voice', LoopSource(samples), 1.0, x)
+    engine.render_block()
+    return engine.render_block().copy()
+
+
+def left_only(frames: int = 4096) -> np.ndarray:
+    left = (np.sin(np.arange(frames) * 0.05) * 16000).astype(np.int16)
+    return np.stack([left, np.zeros_like(left)], axis=1)
+
+
+def test_stereo_assets_keep_their_image():
+    block = render(left_only())
+    assert np.abs(block[:, 0]).max() > 0.3
+    assert np.abs(block[:, 1]).max() == 0.0
+
+
+def test_stereo_balance_matches_equal_power_gains():
+    samples = left_only()
+    level = np.abs(samples[:, 0]).max() / 32768.0
+    # Centred: the same level a mono source gets on each side
+    assert np.abs(render(samples)[:, 0]).max() == pytest.approx(level * np.sqrt(0.5), rel=1e-3)
+    assert np.abs(render(samples[:, :1])).max(axis=0) == pytest.approx([level * np.sqrt(0.5)] * 2, rel=1e-3)
+    # Panned hard right, the left channel is gone
+    assert np.abs(render(samples, x=1.0)).max() == pytest.approx(0.0, abs=1e-6)
+    assert np.abs(render(samples, x=-1.0)[:, 0]).max() == pytest.approx(level, rel=1e-3)
+
+
+def test_stereo_source_reads_both_channels():
+    samples = left_only(100)
+    source = LoopSource(samples)
+    out = np.empty((250, 2), dtype=np.float32)
+    source.read(250, out)
+    assert source.channels == 2
+    assert np.allclose(out[:100], samples / 32768.0)
+    assert np.allclose(out[200:250], samples[:50] / 32768.0)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from noise import NOISE_COLORS, NoiseSource, is_noise, noise_names
+
+RATE = 44100
+
+
+def generate(color: str, seconds: float = 20.0, block: int = 1000) -> np.ndarray:
+    source = NoiseSource(color, RATE, seed=7)
+    out = np.empty(int(seconds * RATE), dtype=np.float32)
+    for start in range(0, out.shape[0], block):
+        source.read(min(block, out.shape[0] - start), out[start:])
+    return out
+
+
+def octave_power(samples: np.ndarray, low: float) -> float:
+    spectrum = np.abs(np.fft.rfft(samples)) ** 2
+    freqs = np.fft.rfftfreq(samples.shape[0], 1.0 / RATE)
+    return float(spectrum[(freqs >= low) & (freqs < 2 * low)].sum())
+
+
+@pytest.mark.parametrize('color', NOISE_COLORS)
+def test_every_color_plays_at_the_requested_level(color):
+    samples = generate(color)
+    assert np.sqrt(np.mean(samples ** 2)) == pytest.approx(0.15, rel=0.15)
+
+
+@pytest.mark.parametrize('color, slope_db', [('white', 3.0), ('pink', 0.0), ('brown', -3.0)])
+def test_spectral_slope_per_octave(color, slope_db):
+    samples = generate(color)
+    # Octave-band power from 200 Hz to 1.6 kHz, three octaves up
+    change = 10 * np.log10(octave_power(samples, 1600.0) / octave_power(samples, 200.0)) / 3
+    assert change == pytest.approx(slope_db, abs=0.7)
+
+
+def test_stream_does_not_depend_on_block_size():
+    assert np.allclose(generate('pink', 1.0, block=64), generate('pink', 1.0, block=4096), atol=1e-6)
+
+
+def test_noise_names():
+    assert noise_names() == ['noise:white', 'noise:pink', 'noise:brown']
+    assert is_noise('noise:pink') and not is_noise('noise:blue') and not is_noise('pink.wav')
+    with pytest.raises(ValueError):
+        NoiseSource('blue')
+
+
+def test_player_generates_noise_without_files():
+    backend = FakeBackend(missing=('noise:pink',))
+    player = AudioPlayer(backend)
+    assert player.play('noise:pink')
+    assert backend.loaded == ['noise:pink']
@@ -0,0 +1,61 @@
+import socket
+import time
+
+import pytest
+
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from osc_control import OSCListener, build_message, parse_packet
+
+
+def test_message_round_trip():
+    assert parse_packet(build_message('/mixer/rain/volume', 0.5)) == [('/mixer/rain/volume', [0.5])]
+
+
+def wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("OSC messages were not received in time")
+        time.sleep(0.001)
+
+
+def test_fader_burst_is_one_set_volume_per_tick(monkeypatch):
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.play('rain.wav')
+    player.play('sea.wav')
+    backend.advance(1.0)
+
+    calls = []
+    set_volume = player.set_volume
+    monkeypatch.setattr(player, 'set_volume',
+                        lambda sound_path, volume: (calls.append((backend.ticks, sound_path, volume)),
+                                                    set_volume(sound_path, volume)))
+
+    listener = OSCListener(player, port=0)
+    listener.start()
+    try:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for tick in range(3):
+            values = [i / 100 for i in range(tick * 100, tick * 100 + 100)]
+            for value in values:
+                sender.sendto(build_message('/mixer/rain.wav/volume', min(1.0, value)),
+                              ('127.0.0.1', listener.port))
+            sender.sendto(build_message('/mixer/sea.wav/volume', 0.25), ('127.0.0.1', listener.port))
+            wait_for(lambda: listener.received == (tick + 1) * 101)
+            backend.advance(player.control_interval)
+        sender.close()
+    finally:
+        listener.stop()
+
+    # One call per (sound, tick), each carrying the newest value
+    per_tick = {}
+    for tick, sound_path, volume in calls:
+        per_tick.setdefault((tick, sound_path), []).append(volume)
+    assert all(len(volumes) == 1 for volumes in per_tick.values())
+    rain = [volumes[0] for (tick, sound_path), volumes in sorted(per_tick.items()) if sound_path == 'rain.wav']
+    assert rain == pytest.approx([0.99, 1.0, 1.0])
+    assert listener.stats()['coalesced'] == 3 * 99
+    assert listener.stats()['applied'] == 6
+    assert player.playing_sounds['sea.wav']['volume'] == 0.25
@@ -0,0 +1,46 @@
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from audio_player import AudioPlayer
+from engine_backend import EngineBackend, create_backend
+from mixer_backend import LATENCY_PROFILES, PygameBackend, get_profile
+
+
+def test_latency_profiles():
+    assert get_profile('low') == dict(LATENCY_PROFILES['low'], name='low')
+    sizes = [get_profile(name)['buffer_size'] for name in ('low', 'balanced', 'safe')]
+    assert sizes == sorted(sizes)
+    with pytest.raises(ValueError):
+        get_profile('ultra')
+
+
+def test_backend_selection():
+    assert isinstance(create_backend('native'), PygameBackend)
+    assert isinstance(create_backend('null'), EngineBackend)
+    with pytest.raises(ValueError):
+        create_backend('alsa')
+    with pytest.raises(ValueError):
+        create_backend('wav')
+
+
+def test_wav_output_uses_the_profile_and_layout(tmp_path):
+    file_path = str(tmp_path / 'mix.wav')
+    player = AudioPlayer(EngineBackend('wav', layout='quad', file_path=file_path), 'low')
+    try:
+        assert player.play('noise:pink')
+        time.sleep(0.3)
+        stats = player.output_stats()
+        assert (stats['profile'], stats['sample_rate'], stats['buffer_size']) == ('low', 48000, 256)
+        assert stats['sink'] == 'wav' and stats['blocks'] > 0
+    finally:
+        player.cleanup()
+
+    with wave.open(file_path, 'rb') as wav:
+        assert (wav.getnchannels(), wav.getframerate(), wav.getsampwidth()) == (4, 48000, 2)
+        assert wav.getnframes() % 256 == 0
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16).reshape(-1, 4)
+    # Centred pink noise reaches every speaker of the quad layout
+    assert np.all(np.abs(samples).max(axis=0) > 0)
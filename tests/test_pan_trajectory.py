@@ -0,0 +1,51 @@
+import pytest
+
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from pan_trajectory import RandomPanTrajectory
+
+
+def test_path_is_continuous_bounded_and_periodic():
+    trajectory = RandomPanTrajectory(pan_range=0.6, seed=3)
+    times = [i * 0.01 for i in range(int(trajectory.period * 100) + 1)]
+    values = [trajectory.value_at(t) for t in times]
+    assert all(-0.6 <= value <= 0.6 for value in values)
+    # No jumps between 10 ms steps, including across segment joins
+    assert max(abs(b - a) for a, b in zip(values, values[1:])) < 0.02
+    assert RandomPanTrajectory(pan_range=0.6, seed=3).value_at(7.3 + trajectory.period) == \
+        pytest.approx(trajectory.value_at(7.3))
+
+
+def test_same_seed_gives_the_same_path():
+    first, second = RandomPanTrajectory(seed=9), RandomPanTrajectory(seed=9)
+    assert [first.value_at(t) for t in range(0, 60, 3)] == [second.value_at(t) for t in range(0, 60, 3)]
+    assert RandomPanTrajectory(seed=10).value_at(5.0) != first.value_at(5.0)
+
+
+def test_start_enters_near_the_current_pan():
+    trajectory = RandomPanTrajectory(seed=1)
+    trajectory.start(100.0, current=0.5)
+    closest = min(abs(segment[6] - 0.5) for segment in trajectory.segments)
+    assert abs(trajectory.value_at(100.0) - 0.5) == pytest.approx(closest)
+
+
+def test_player_follows_the_path_on_the_virtual_clock():
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.random_pan_seed = 4
+    player.play('rain.wav')
+    player.set_pan('rain.wav', 0.0)
+    assert player.start_random_pan('rain.wav')
+    trajectory = player.playing_sounds['rain.wav']['pan_trajectory']
+
+    pans = []
+    for _ in range(200):
+        backend.advance(player.control_interval)
+        pans.append(player.playing_sounds['rain.wav']['pan'])
+        assert pans[-1] == pytest.approx(trajectory.value_at(backend.now()))
+    assert max(pans) - min(pans) > 0.1
+    assert max(abs(b - a) for a, b in zip(pans, pans[1:])) < 0.05
+
+    assert player.stop_random_pan('rain.wav')
+    backend.advance(1.0)
+    assert player.playing_sounds['rain.wav']['pan'] == 0.0
@@ -0,0 +1,67 @@
+import pytest
+
+from preset_library import PresetLibrary
+
+MIX = {
+    'noise:pink': {'volume': 0.3, 'pan': -0.6, 'tone': 0.4, 'playing': True},
+    'noise:brown': {'volume': 0.8, 'pan': 0.2, 'tone': 0.0, 'playing': True},
+}
+
+
+def test_library_round_trip(tmp_path):
+    library = PresetLibrary(str(tmp_path))
+    library.save('evening', MIX, tags=['calm'])
+    library.save('evening', {'noise:white': MIX['noise:pink']})
+    library.save('evening', MIX, tags=['calm', 'night'])
+
+    # A fresh instance only has the index and the data file to go on
+    reopened = PresetLibrary(str(tmp_path))
+    assert reopened.load('evening')['sounds'] == MIX
+    assert [e['name'] for e in reopened.search('', tags=['night'], sounds=['noise:pink'])] == ['evening']
+    assert reopened.search('', sounds=['noise:white']) == []
+
+    assert reopened.garbage_bytes() > 0
+    reopened.compact()
+    assert reopened.garbage_bytes() == 0
+    assert reopened.load('evening')['sounds'] == MIX
+
+
+def test_preset_save_apply_round_trip(app):
+    backend = app.audio_player.backend
+    for sound_name, card in app.cards.items():
+        if card.is_playing:
+            card.toggle_play()
+    for sound_name, settings in MIX.items():
+        app.cards[sound_name].toggle_play()
+        app.cards[sound_name].apply_mix(settings)
+    app.save_preset('evening')
+    assert app.presets.load('evening')['sounds'] == pytest.approx(MIX)
+
+    # Pause one sound and move everything away from the saved mix
+    app.cards['noise:pink'].toggle_play()
+    for card in app.cards.values():
+        card.apply_mix({'volume': 1.0, 'pan': 0.9, 'tone': -0.5})
+    backend.advance(5.0)
+
+    assert app.apply_preset('evening')
+    backend.advance(5.0)
+    for sound_name, settings in MIX.items():
+        card = app.cards[sound_name]
+        sound_info = app.audio_player.playing_sounds[sound_name]
+        assert card.is_playing
+        assert sound_info['volume_ramp'].value == pytest.approx(settings['volume'])
+        assert sound_info['pan_ramp'].value == pytest.approx(settings['pan'])
+        assert card.current_tone == pytest.approx(settings['tone'])
+
+
+def test_preset_starts_sounds_at_saved_levels(app):
+    for card in app.cards.values():
+        if card.is_playing:
+            card.toggle_play()
+    app.presets.save('fresh', {'noise:white': {'volume': 0.2, 'pan': 0.4, 'playing': True}})
+
+    assert app.apply_preset('fresh')
+    app.audio_player.backend.advance(5.0)
+    sound_info = app.audio_player.playing_sounds['noise:white']
+    assert sound_info['volume_ramp'].value == pytest.approx(0.2)
+    assert sound_info['pan_ramp'].value == pytest.approx(0.4)
@@ -0,0 +1,67 @@
+import pytest
+
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from ramps import ParameterRamp
+
+
+def test_retarget_keeps_moving_from_the_current_value():
+    ramp = ParameterRamp(0.0, duration=1.0)
+    ramp.set_target(1.0)
+    ramp.advance(0.5)
+    assert ramp.value == pytest.approx(0.5)
+
+    # A new endpoint never restarts the movement; it arrives in its own duration
+    ramp.set_target(0.8)
+    assert ramp.value == pytest.approx(0.5)
+    ramp.advance(0.5)
+    assert ramp.value == pytest.approx(0.65)
+    ramp.advance(0.5)
+    assert ramp.value == pytest.approx(0.8)
+    assert not ramp.active
+
+
+def test_slow_drift_does_not_inherit_a_fast_rate():
+    ramp = ParameterRamp(0.0, duration=0.05)
+    ramp.set_target(1.0)
+    ramp.advance(0.025)
+    ramp.set_target(0.0, duration=10.0)
+    ramp.advance(1.0)
+    assert ramp.value == pytest.approx(0.45)
+    assert ramp.active
+
+
+def test_retarget_without_callback_abandons_the_pending_one():
+    fired = []
+    ramp = ParameterRamp(1.0, duration=1.0)
+    ramp.set_target(0.0, callback=lambda: fired.append('fade out'))
+    ramp.advance(0.5)
+    ramp.set_target(0.7)
+    ramp.advance(1.0)
+    assert ramp.pop_callback() is None
+
+    ramp.set_target(0.0, callback=lambda: fired.append('first'))
+    ramp.set_target(0.5, callback=lambda: fired.append('second'))
+    ramp.advance(1.0)
+    ramp.pop_callback()()
+    assert fired == ['second']
+
+
+def test_player_fade_is_retargeted_in_flight():
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.play('rain.wav')
+    player.fade_volume('rain.wav', 0.0, 1.0, duration=2.0)
+    backend.advance(1.0)
+    channel = player.playing_sounds['rain.wav']['channel']
+    halfway = channel.volume[0]
+    assert 0.3 < halfway < 0.4
+
+    # Retarget downward: the level turns around without jumping
+    player.fade_volume('rain.wav', 0.0, 0.2, duration=1.0)
+    start = len(channel.history)
+    backend.advance(1.1)
+    lefts = [left for _, left, _ in channel.history[start:]]
+    assert lefts[0] < halfway
+    assert all(b <= a for a, b in zip(lefts, lefts[1:]))
+    assert player.playing_sounds['rain.wav']['volume_ramp'].value == pytest.approx(0.2)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from audio_io import read_wav
+from recorder import Recorder, RingBuffer
+
+
+def ramp(start: int, frames: int, channels: int = 2) -> np.ndarray:
+    """Float block whose int16 samples count up from start"""
+    values = (np.arange(start, start + frames, dtype=np.float32) / 32767.0)[:, None]
+    return np.repeat(values, channels, axis=1)
+
+
+def test_ring_wraps_around_in_order():
+    ring = RingBuffer(8, 2)
+    assert ring.push(ramp(0, 6))
+    assert ring.peek(6)[:, 0].tolist() == list(range(6))
+    ring.advance(6)
+
+    # Five frames from position 6 land as 2 at the end and 3 at the start
+    assert ring.push(ramp(6, 5))
+    assert ring.available() == 5
+    first = ring.peek(8)
+    assert first[:, 0].tolist() == [6, 7]
+    ring.advance(first.shape[0])
+    second = ring.peek(8)
+    assert second[:, 0].tolist() == [8, 9, 10]
+    ring.advance(second.shape[0])
+    assert ring.available() == 0
+    assert ring.overruns == 0
+
+
+def test_full_ring_drops_and_counts_blocks():
+    ring = RingBuffer(8, 2)
+    assert ring.push(ramp(0, 6))
+    assert not ring.push(ramp(6, 3))
+    assert not ring.push(ramp(6, 4))
+    assert (ring.overruns, ring.dropped_frames) == (2, 7)
+
+    # What was accepted is untouched and the ring takes blocks again once read
+    assert ring.peek(8)[:, 0].tolist() == list(range(6))
+    ring.advance(6)
+    assert ring.push(ramp(6, 8))
+    assert ring.available() == 8
+
+
+def test_recording_keeps_every_block_across_wraps(tmp_path):
+    path = str(tmp_path / 'mix.wav')
+    # A 4-chunk ring of 100 frames each, pushed far past its capacity
+    recorder = Recorder(path, channels=2, sample_rate=1000, buffer_seconds=0.4, chunk_seconds=0.1)
+    recorder.start()
+    for start in range(0, 2000, 50):
+        recorder.push(ramp(start, 50))
+        while recorder.ring.available() > 300:
+            recorder._stop.wait(0.001)
+    stats = recorder.stop()
+
+    assert stats['overruns'] == 0
+    assert stats['seconds'] == pytest.approx(2.0)
+    samples, rate = read_wav(path)
+    assert rate == 1000
+    assert np.round(samples[:, 0] * 32767).astype(int).tolist() == list(range(2000))
+
+
+def test_recorder_rejects_other_formats(tmp_path):
+    with pytest.raises(ValueError):
+        Recorder(str(tmp_path / 'mix.mp3'))
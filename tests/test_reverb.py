@@ -0,0 +1,39 @@
+import numpy as np
+
+from audio_io import write_wav
+from audio_player import AudioPlayer
+from dynamics import MasterDynamics
+from engine_backend import EngineBackend
+from mixer_backend import FakeBackend
+from reverb import ConvolutionReverb
+
+
+def test_reverb_sits_ahead_of_the_dynamics(tmp_path):
+    ir_path = str(tmp_path / 'room.wav')
+    impulse = np.zeros((4096, 2), dtype=np.float32)
+    impulse[0] = impulse[1000] = 0.5
+    write_wav(ir_path, impulse, 44100)
+
+    player = AudioPlayer(EngineBackend('null'))
+    try:
+        assert player.set_reverb(ir_path, wet=0.5)
+        engine = player.backend.engine
+        assert [type(stage) for stage in engine.master_bus] == [ConvolutionReverb, MasterDynamics]
+
+        # Replacing the impulse keeps a single reverb stage
+        assert player.set_reverb(ir_path, wet=0.3)
+        assert [type(stage) for stage in engine.master_bus] == [ConvolutionReverb, MasterDynamics]
+        reverb = engine.master_bus[0]
+        assert reverb.wet == 0.3
+        assert (reverb.block_size, reverb.channels) == (engine.block_size, engine.channels)
+
+        assert player.set_reverb(None)
+        assert [type(stage) for stage in engine.master_bus] == [MasterDynamics]
+    finally:
+        player.cleanup()
+
+
+def test_reverb_needs_a_software_mix(tmp_path, capsys):
+    player = AudioPlayer(FakeBackend())
+    assert not player.set_reverb(str(tmp_path / 'room.wav'))
+    assert 'software-mixed output' in capsys.readouterr().out
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from audio_io import write_wav
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from spectral_profile import ProfileCache
+
+
+def test_auto_balance_survives_mix_changes():
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    for sound in ('a.wav', 'b.wav'):
+        player.play(sound)
+        player.set_volume(sound, 0.9)
+    backend.advance(2.0)
+    player.toggle_auto_balance(True)
+    backend.advance(2.0)
+    balanced = player.playing_sounds['a.wav']['channel'].volume
+
+    # Pausing and resuming recomputes smart mixing; the balance must hold
+    player.pause_sound('b.wav')
+    backend.advance(2.0)
+    player.unpause_sound('b.wav')
+    backend.advance(2.0)
+    assert player.playing_sounds['a.wav']['channel'].volume == pytest.approx(balanced)
+
+    player.set_pan('a.wav', 0.0)
+    player.set_pan('b.wav', 0.3)
+    backend.advance(2.0)
+    assert player.playing_sounds['a.wav']['channel'].volume == pytest.approx(balanced)
+
+
+def test_failed_profile_is_retried_once_the_file_changes(tmp_path):
+    sound_path = str(tmp_path / 'rain.wav')
+    cache = ProfileCache()
+    # Caught mid-copy: not a WAV file yet
+    with open(sound_path, 'wb') as f:
+        f.write(b'RIFF')
+    assert cache.prepare([sound_path]) == 0
+    assert cache.prepare([sound_path]) == 0
+
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, (44100, 2)).astype(np.float32)
+    write_wav(sound_path, samples, 44100)
+    assert cache.prepare([sound_path]) == 1
+    assert cache.get(sound_path)['rms'] > 0
+
+
+def test_missing_file_is_analysed_when_it_appears(tmp_path):
+    sound_path = str(tmp_path / 'sea.wav')
+    cache = ProfileCache()
+    assert cache.prepare_in_background([sound_path]) is None
+
+    write_wav(sound_path, np.zeros((4096, 1), dtype=np.float32), 44100)
+    thread = cache.prepare_in_background([sound_path])
+    assert thread is not None
+    thread.join()
+    assert cache.get(sound_path) is not None
@@ -0,0 +1,89 @@
+import gc
+
+import numpy as np
+
+from audio_io import write_wav
+from audio_player import AudioPlayer
+from engine_backend import EngineBackend
+from mixer_backend import FakeBackend
+from sample_store import SampleStore
+from sound_cache import SoundCache
+
+# FakeBackend sizes a 60 s sound as 16-bit stereo at 44.1 kHz
+SOUND_BYTES = 60 * 44100 * 4
+
+
+def test_least_recently_used_unpinned_entries_go_first():
+    cache = SoundCache(budget_bytes=300)
+    cache.put('a', 'A', 100)
+    cache.put('b', 'B', 100, pinned=True)
+    cache.put('c', 'C', 100)
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D', 100)
+    # c was the least recently used unpinned entry; b is pinned
+    assert list(cache.entries) == ['b', 'a', 'd']
+    assert cache.bytes == 300 and cache.evictions == 1
+
+    cache.set_budget(100)
+    assert list(cache.entries) == ['b']
+    cache.unpin('b')
+    cache.set_budget(0)
+    assert cache.stats()['entries'] == 0 and cache.bytes == 0
+
+
+def test_player_keeps_stopped_sounds_within_the_budget():
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.sound_cache.set_budget(2 * SOUND_BYTES)
+    for name in ('a.wav', 'b.wav', 'c.wav'):
+        player.play(name)
+    # Playing sounds are pinned, even over budget
+    assert player.memory_usage()['total'] == 3 * SOUND_BYTES
+
+    player.stop_sound('a.wav')
+    player.stop_sound('b.wav')
+    assert set(player.memory_usage()['sounds']) == {'b.wav', 'c.wav'}
+
+    # Replaying a cached sound does not decode it again
+    player.play('b.wav')
+    assert backend.loaded.count('b.wav') == 1
+    assert player.cache_stats()['hits'] == 1
+
+    assert player.unload_sound('c.wav')
+    assert 'c.wav' not in player.memory_usage()['sounds']
+
+
+def test_sample_buffers_are_shared_and_released(tmp_path):
+    sound_path = str(tmp_path / 'rain.wav')
+    write_wav(sound_path, np.zeros((1000, 1), dtype=np.float32), 44100)
+    store = SampleStore(44100)
+
+    first = store.load(sound_path)
+    assert store.load(sound_path) is first
+    # Mono assets stay mono, two bytes per frame
+    assert first.shape == (1000, 1) and store.total_bytes() == 2000
+
+    del first
+    gc.collect()
+    assert store.usage() == {}
+
+
+def test_evicting_a_stopped_sound_frees_its_samples(tmp_path):
+    sound_path = str(tmp_path / 'rain.wav')
+    write_wav(sound_path, np.zeros((44100, 2), dtype=np.float32), 44100)
+    player = AudioPlayer(EngineBackend('null'))
+    try:
+        assert player.play(sound_path)
+        store = player.backend.store
+        assert store.total_bytes() == 44100 * 4
+
+        player.stop_sound(sound_path)
+        gc.collect()
+        # Still cached for a quick replay
+        assert store.total_bytes() == 44100 * 4
+
+        player.sound_cache.set_budget(0)
+        gc.collect()
+        assert store.usage() == {}
+    finally:
+        player.cleanup()
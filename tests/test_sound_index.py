@@ -0,0 +1,48 @@
+from sound_index import SoundIndex
+
+
+def make_index() -> SoundIndex:
+    index = SoundIndex()
+    index.add('rain.wav', ['rain.wav', 'Heavy Rain'], tags=['Water', 'sleep'], duration=120.0, loudness_db=-18.0)
+    index.add('thunder.wav', ['thunder.wav', 'Thunder'], tags=['storm'], duration=45.0, loudness_db=-12.0)
+    index.add('sea.wav', ['sea.wav', 'Sea Waves'], tags=['water'], duration=300.0, loudness_db=-24.0)
+    index.add('keyboard.wav', ['keyboard.wav', 'Keyboard'], tags=['focus'], duration=20.0)
+    return index
+
+
+def test_text_and_prefix_terms():
+    index = make_index()
+    assert index.search('rain') == ['rain.wav']
+    assert index.search('AVE') == ['sea.wav']
+    # Short terms match word prefixes, not substrings
+    assert index.search('th') == ['thunder.wav']
+    assert index.search('ea') == []
+    assert index.search('') == ['rain.wav', 'thunder.wav', 'sea.wav', 'keyboard.wav']
+
+
+def test_tags_and_metadata_filters():
+    index = make_index()
+    assert index.search('tag:water') == ['rain.wav', 'sea.wav']
+    assert index.search('tag:water dur>200') == ['sea.wav']
+    assert index.search('dur>30 loud<-15') == ['rain.wav', 'sea.wav']
+    assert index.search('loud>=-12') == ['thunder.wav']
+    # Sounds without loudness never match a loudness filter
+    assert index.search('dur<60') == ['thunder.wav', 'keyboard.wav']
+    assert index.search('dur<60 loud<0') == ['thunder.wav']
+    assert index.search('tag:water wav', limit=1) == ['rain.wav']
+
+
+def test_re_adding_and_removing_update_postings():
+    index = make_index()
+    index.add('rain.wav', ['rain.wav', 'Drizzle'], tags=['sleep'])
+    assert index.search('heavy') == []
+    assert index.search('tag:water') == ['sea.wav']
+    assert index.search('wav') == ['rain.wav', 'thunder.wav', 'sea.wav', 'keyboard.wav']
+
+    index.set_metadata('keyboard.wav', loudness_db=-30.0)
+    assert index.search('loud<-20') == ['sea.wav', 'keyboard.wav']
+
+    assert index.remove('sea.wav')
+    assert not index.remove('sea.wav')
+    assert index.search('tag:water') == []
+    assert len(index) == 3
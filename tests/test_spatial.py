@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from audio_player import AudioPlayer
+from mix_engine import LoopSource, MixEngine
+from mixer_backend import FakeBackend
+from spatial import SPEAKER_LAYOUTS, SpatialPanner
+
+
+@pytest.mark.parametrize('layout', ['stereo', 'quad', '5.1'])
+def test_gains_keep_constant_power(layout):
+    panner = SpatialPanner(layout)
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-1, 1, (200, 2)).astype(np.float32)
+    gains = panner.gain_matrix(positions)
+    power = np.sum(gains[:, panner.panned] ** 2, axis=1)
+    assert power == pytest.approx(np.ones(200), abs=2e-3)
+
+
+def test_positions_reach_their_speakers():
+    stereo = SpatialPanner('stereo')
+    assert stereo.gains(-1.0) == pytest.approx([1.0, 0.0], abs=1e-6)
+    assert stereo.gains(0.0) == pytest.approx([np.sqrt(0.5)] * 2, abs=2e-3)
+
+    quad = SpatialPanner('quad')
+    labels = [label for label, _ in SPEAKER_LAYOUTS['quad']]
+    front_right = quad.gains(1.0, 1.0)
+    assert labels[int(np.argmax(front_right))] == 'FR'
+    rear_left = quad.gains(-1.0, -1.0)
+    assert labels[int(np.argmax(rear_left))] == 'RL'
+    # The centre of the room spreads evenly over every speaker
+    assert quad.gains(0.0, 0.0) == pytest.approx([0.5] * 4, abs=1e-6)
+
+    surround = SpatialPanner('5.1', lfe_send=0.2)
+    assert surround.gains(0.0, 1.0)[surround.labels.index('C')] == pytest.approx(1.0, abs=1e-3)
+    assert surround.gains(0.3, 0.4)[surround.labels.index('LFE')] == pytest.approx(0.2)
+
+
+def test_mix_interpolates_from_the_previous_gains():
+    panner = SpatialPanner('stereo')
+    blocks = np.ones((1, 8), dtype=np.float32)
+    left, right = panner.gain_matrix([[-1.0, 0.0]]), panner.gain_matrix([[1.0, 0.0]])
+    out = panner.mix(blocks, right, previous=left)
+    # Starts where the last block ended and moves toward the new position
+    assert out[0] == pytest.approx([1.0, 0.0])
+    assert np.all(np.diff(out[:, 0]) < 0) and np.all(np.diff(out[:, 1]) > 0)
+
+
+def test_player_pans_with_equal_power_gains():
+    backend = FakeBackend()
+    player = AudioPlayer(backend)
+    player.play('rain.wav')
+    player.set_volume('rain.wav', 1.0)
+    player.set_pan('rain.wav', 0.5)
+    backend.advance(2.0)
+    left, right = player.playing_sounds['rain.wav']['channel'].volume
+    assert left ** 2 + right ** 2 == pytest.approx(1.0, abs=2e-3)
+    assert (left, right) == pytest.approx(player.panner.pan_gains(0.5))
+    assert right > left
+
+
+def test_engine_renders_a_voice_on_its_surround_speaker():
+    engine = MixEngine('5.1', 44100, 512)
+    engine.add_voice('voice', LoopSource(np.full(1024, 0.5, dtype=np.float32)), 1.0, 0.0, 1.0)
+    engine.render_block()
+    block = engine.render_block()
+    levels = np.abs(block).max(axis=0)
+    assert engine.panner.labels[int(np.argmax(levels))] == 'C'
+    assert levels.max() == pytest.approx(0.5, abs=1e-3)
@@ -0,0 +1,78 @@
+import pytest
+
+from audio_player import AudioPlayer
+from mixer_backend import FakeBackend
+from timeline import Timeline, parse_time
+
+
+def test_parse_time():
+    assert parse_time(90) == 90.0
+    assert parse_time('1:30') == 90.0
+    assert parse_time('1:00:05') == 3605.0
+
+
+def test_program_fires_in_order_on_the_virtual_clock():
+    backend = FakeBackend(sound_length=3600.0)
+    player = AudioPlayer(backend)
+    fired = []
+    timeline = Timeline(player, on_event=lambda event: fired.append((backend.now(), event['action'])))
+    # Listed out of order: the heap sorts them by time
+    timeline.load([
+        {'at': '10:00', 'action': 'stop', 'sound': 'rain.wav', 'seconds': 30},
+        {'at': 0, 'action': 'play', 'sound': 'rain.wav', 'volume': 0.6, 'seconds': 5},
+        {'at': 60, 'action': 'play', 'sound': 'sea.wav', 'volume': 0.4},
+        {'at': 120, 'action': 'volume', 'sound': 'rain.wav', 'volume': 0.3, 'seconds': 60},
+    ])
+    timeline.start()
+
+    backend.advance(1.0)
+    assert 'rain.wav' in player.playing_sounds
+    assert 'sea.wav' not in player.playing_sounds
+
+    backend.advance(200.0)
+    assert [action for _, action in fired] == ['play', 'play', 'volume']
+    assert [at for at, _ in fired] == [0.0, 60.0, 120.0]
+    assert player.playing_sounds['rain.wav']['volume_ramp'].value == pytest.approx(0.3)
+    assert player.playing_sounds['sea.wav']['volume_ramp'].value == pytest.approx(0.4)
+
+    # The stop fade ends by unloading the sound
+    backend.advance(600.0)
+    assert [action for _, action in fired][-1] == 'stop'
+    assert 'rain.wav' not in player.playing_sounds
+    assert 'sea.wav' in player.playing_sounds
+    assert timeline.pending == 0
+    assert timeline.lateness == 0.0
+
+
+def test_sleep_timer_drops_later_events():
+    backend = FakeBackend(sound_length=3600.0)
+    player = AudioPlayer(backend)
+    timeline = Timeline(player)
+    timeline.load([{'at': 0, 'action': 'play', 'sound': 'rain.wav'},
+                   {'at': 3000, 'action': 'play', 'sound': 'sea.wav'}])
+    timeline.start()
+    timeline.sleep_timer(600, fade=60)
+
+    backend.advance(700.0)
+    assert player.playing_sounds == {}
+    assert timeline.pending == 0
+    backend.advance(3000.0)
+    assert 'sea.wav' not in player.playing_sounds
+
+
+def test_slider_takes_over_a_stop_fade_without_cutting_the_sound():
+    backend = FakeBackend(sound_length=3600.0)
+    player = AudioPlayer(backend)
+    timeline = Timeline(player)
+    timeline.load([{'at': 0, 'action': 'play', 'sound': 'rain.wav', 'volume': 0.6},
+                   {'at': 10, 'action': 'stop', 'sound': 'rain.wav', 'seconds': 20}])
+    timeline.start()
+    backend.advance(15.0)
+
+    # A slider (or OSC fader) touches the sound mid fade-out
+    player.set_volume('rain.wav', 0.2)
+    backend.advance(60.0)
+    sound_info = player.playing_sounds['rain.wav']
+    assert sound_info['channel'].get_busy()
+    assert sound_info['volume_ramp'].value == pytest.approx(0.2)
+    assert sound_info['channel'].volume[0] > 0
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from audio_io import read_wav, write_wav
+from variations import VariationCache, generate_variation
+
+
+def touch(path: str):
+    with open(path, 'wb') as f:
+        f.write(b'')
+
+
+def test_prune_keeps_variants_of_other_sounds(tmp_path):
+    cache = VariationCache(str(tmp_path))
+    old = [str(tmp_path / f"rain.0123456789abcdef.{i}.wav") for i in range(3)]
+    keep = [str(tmp_path / f"rain.fedcba9876543210.{i}.wav") for i in range(3)]
+    others = [str(tmp_path / f"rain.heavy.0123456789abcdef.{i}.wav") for i in range(3)]
+    for path in old + keep + others:
+        touch(path)
+
+    cache._prune(str(tmp_path / 'rain.wav'), keep)
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in keep + others)
+
+
+def write_loop(path: str, seconds: float = 4.0, rate: int = 8000):
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 0.7 * t))
+    write_wav(path, np.stack([tone, tone * 0.5], axis=1).astype(np.float32), rate)
+
+
+def test_variant_is_as_long_as_its_source():
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-0.5, 0.5, (8000 * 5, 2)).astype(np.float32)
+    variant = generate_variation(samples, 8000, seed=1)
+    assert variant.shape == samples.shape
+
+
+def test_concurrent_runs_and_close_do_not_share_a_pool(tmp_path):
+    sources = []
+    for name in ('rain', 'sea', 'birds', 'grass'):
+        sources.append(str(tmp_path / f"{name}.wav"))
+        write_loop(sources[-1])
+    cache = VariationCache(str(tmp_path / 'cache'), count=2)
+
+    first = cache.generate_in_background(sources[:2])
+    second = cache.generate_in_background(sources[2:])
+    first.join()
+    second.join()
+    for source in sources:
+        paths = cache.paths(source)
+        assert all(os.path.exists(path) for path in paths)
+        samples, _ = read_wav(paths[0])
+        assert samples.shape == read_wav(source)[0].shape
+
+    # Closing while runs are in flight cancels them without errors
+    os.utime(sources[0], (0, 0))
+    os.utime(sources[2], (0, 0))
+    running = [cache.generate_in_background(sources[:1]), cache.generate_in_background(sources[2:3])]
+    cache.close()
+    for thread in running:
+        thread.join()
+    assert cache._executors == set()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from audio_io import write_wav
+from waveform import BASE_BIN, WaveformCache, build_pyramid
+
+
+def test_pyramid_keeps_a_partial_last_bin():
+    samples = np.zeros((BASE_BIN * 3 + 10, 2), dtype=np.int16)
+    samples[-1, 1] = 1000
+    mins, maxs = build_pyramid(samples)[0]
+    assert mins.shape == (4,)
+    assert maxs[-1] == 1000
+
+
+@pytest.mark.parametrize('frames', [0, 1, BASE_BIN - 1])
+def test_assets_shorter_than_one_bin(tmp_path, frames):
+    sound_path = str(tmp_path / 'click.wav')
+    write_wav(sound_path, np.full((frames, 1), 0.5, dtype=np.float32), 44100)
+    cache = WaveformCache(str(tmp_path / 'cache'))
+    waveform = cache.build(sound_path)
+    assert waveform.levels[0][0].shape == ((1,) if frames else (0,))
+
+    # Drawn from the rebuilt cache file as well as from memory
+    reloaded = WaveformCache(str(tmp_path / 'cache')).get(sound_path)
+    mins, maxs = reloaded.columns(40)
+    assert mins.shape == maxs.shape == (40,)
+    assert maxs.max() == pytest.approx(0.5 if frames else 0.0, abs=1e-3)
+    assert len(reloaded.outline(40, 32)) == 160